@@ -0,0 +1,146 @@
+# assets.py
+# ------------------------------------------------------------
+# 해시 이름 정적 파일 (build_assets.py 결과물) 서빙 / URL 헬퍼
+#
+#   PrivatePageMiddleware : 로그인 쿠키가 있는 요청의 HTML 응답 → Cache-Control: private, no-store
+#     (service-worker.js 는 no-store 응답을 캐시하지 않음 → 캐시에는 비로그인 화면만 남음)
+# ------------------------------------------------------------
+import json
+import mimetypes
+import re
+from pathlib import Path
+
+from starlette.exceptions import HTTPException
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from starlette.staticfiles import StaticFiles
+
+STATIC_URL = "/static"
+DIST_URL = "/static/dist"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+PRIVATE_CACHE_CONTROL = "private, no-store"
+
+# 해시 이름 (build_assets.py 가 만드는 name.<hash>.ext) — 이 이름만 immutable
+HASH_LEN = 10
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{%d}\.[^./]+$" % HASH_LEN)
+
+# (Accept-Encoding 토큰, 파일 확장자) — 앞쪽이 우선
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+class AssetManifest:
+    def __init__(self, manifest_file: Path):
+        self.manifest_file = manifest_file
+        self.version = None
+        self.assets: dict[str, str] = {}
+        self.reload()
+
+    def reload(self):
+        try:
+            with open(self.manifest_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            # 빌드 전 (개발 환경) → 원본 경로 그대로 사용
+            data = {}
+        self.version = data.get("version")
+        self.assets = data.get("assets", {})
+
+    def url(self, path: str) -> str:
+        path = path.lstrip("/")
+        if path.startswith("static/"):
+            path = path[len("static/"):]
+
+        hashed = self.assets.get(path)
+        if hashed:
+            return f"{DIST_URL}/{hashed}"
+        return f"{STATIC_URL}/{path}"
+
+    def urls(self) -> list[str]:
+        return [f"{DIST_URL}/{name}" for name in self.assets.values()]
+
+
+def accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(token)
+    return accepted
+
+
+class ImmutableStaticFiles(StaticFiles):
+    # 빌드 결과물 (static/dist):
+    #   - Accept-Encoding 에 따라 .br / .gz 압축본 선택
+    #   - 해시 이름 파일만 Cache-Control: immutable (내용이 바뀌면 이름이 바뀜)
+    #     manifest.json 처럼 이름이 그대로인 파일은 no-cache (배포마다 내용이 바뀜)
+
+    async def get_response(self, path: str, scope):
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+
+        for token, suffix in ENCODINGS:
+            if token not in accepted and "*" not in accepted:
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except HTTPException as exc:
+                if exc.status_code == 404:
+                    continue
+                raise
+            media_type, _ = mimetypes.guess_type(path)
+            if media_type:
+                if media_type.startswith("text/") or media_type.endswith("javascript"):
+                    media_type += "; charset=utf-8"
+                response.headers["content-type"] = media_type
+            response.headers["content-encoding"] = token
+            return self._finalize(path, response)
+
+        response = await super().get_response(path, scope)
+        return self._finalize(path, response)
+
+    @staticmethod
+    def _finalize(path: str, response):
+        hashed = HASHED_NAME_RE.search(path)
+        response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL if hashed else REVALIDATE_CACHE_CONTROL
+        response.headers["vary"] = "Accept-Encoding"
+        return response
+
+
+class PrivatePageMiddleware:
+    # 사용자별 HTML (로그인 상태 / 관리자 링크 / 내 항목) 이 공유 캐시·SW 캐시에 남지 않게
+    #   라우트가 Cache-Control 을 직접 준 응답은 그대로 둠
+    def __init__(self, app, session_cookie: str = "user"):
+        self.app = app
+        self.session_cookie = session_cookie
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cookies = cookie_parser(Headers(scope=scope).get("cookie", ""))
+        if not cookies.get(self.session_cookie):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if headers.get("content-type", "").startswith("text/html") and "cache-control" not in headers:
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"cache-control", PRIVATE_CACHE_CONTROL.encode("latin-1"))
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,357 @@
+# benchmarks/bench_routes.py
+# ------------------------------------------------------------
+# 주요 라우트 부하/지연시간 벤치마크 (in-process ASGI)
+#
+#   - 데이터 규모별로 합성 데이터 시딩
+#       업소 N (행정동 트리 전체에 분산) / 리뷰 M / 동네생활 글 K / 회원 U
+#   - httpx ASGITransport 로 앱을 직접 호출 (네트워크 X)
+#   - 라우트별 처리량(req/s), p50/p95/p99 지연시간(ms) 출력
+#   - benchmarks/baseline.json 과 비교해 회귀 표시
+#
+#   사용법:
+#     python benchmarks/bench_routes.py
+#     python benchmarks/bench_routes.py --sizes 1000,10000,50000 --requests 300
+#     python benchmarks/bench_routes.py --save-baseline
+#     python benchmarks/bench_routes.py --fail-on-regression   # CI 용
+# ------------------------------------------------------------
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+
+# main.py import 전에 임시 DB 로 전환, 저장소 journal 은 끔 (seed 데이터는 메모리에만)
+# 요청 제한도 끔 (한 클라이언트가 같은 라우트를 반복 호출하므로)
+_tmp_dir = tempfile.TemporaryDirectory(prefix="dongnelink-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir.name}/bench.db"
+os.environ["DONGNE_STORE_DIR"] = "off"
+os.environ["DONGNE_RATE_LIMIT"] = "off"
+sys.path.insert(0, str(BASE_DIR))
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from models import User  # noqa: E402
+
+FOOD_CATEGORIES = ["한식", "중식", "일식", "양식", "카페", "분식", "치킨"]
+REPAIR_CATEGORIES = ["에어컨", "세탁기", "냉장고", "TV", "보일러"]
+
+HOURS_PATTERNS = ["09:00-21:00", "11:00~22:00", "17:00~02:00", "24시간", "10:00-15:00, 17:00-21:00"]
+
+BENCH_PASSWORD = "bench-password"
+
+
+# ------------------------------------------------------------
+# 시딩
+# ------------------------------------------------------------
+def all_dongs():
+    tree = main.get_location_tree()
+    return [key for key in tree.dong_ids if key[0] in main.get_sido_list()]
+
+
+def seed_users(count: int) -> list[str]:
+    db = main.SessionLocal()
+    try:
+        pw = main.hash_password(BENCH_PASSWORD)
+        names = [f"user{i}@bench" for i in range(count)]
+        db.bulk_save_objects(
+            [User(username=n, password_hash=pw, login_type="email") for n in names]
+        )
+        db.commit()
+        return names
+    finally:
+        db.close()
+
+
+def reset_stores():
+    main.BUSINESSES.clear()
+    main.REVIEWS.clear()
+    main.NEWS_POSTS.clear()
+    main.POSTS_BY_DONG.clear()
+    main.BUSINESS_BY_ID.clear()
+    main.BUSINESS_INDEX.clear()
+    main.REVIEW_STATS.clear()
+    main._business_id_seq = 1
+
+
+def seed_stores(rng: random.Random, dongs, users, n_businesses, n_reviews, n_posts):
+    reset_stores()
+
+    for _ in range(n_businesses):
+        sido, sigungu, dong = rng.choice(dongs)
+        kind = rng.choice(["food", "repair"])
+        bid = main._business_id_seq
+        b = {
+            "id": bid,
+            "kind": kind,
+            "sido": sido,
+            "sigungu": sigungu,
+            "dong": dong,
+            "category": rng.choice(FOOD_CATEGORIES if kind == "food" else REPAIR_CATEGORIES),
+            "name": f"업소 {bid}",
+            "description": "벤치마크용 업소 설명입니다.",
+            "image_url": None,
+            "owner": rng.choice(users),
+            "approved": rng.random() < 0.9,
+            "paid": rng.random() < 0.2,
+            "premium": rng.random() < 0.02,
+            "created_at": time.time() - rng.randrange(0, 365 * 86400),
+            "opt_delivery": rng.random() < 0.5,
+            "opt_reservation": rng.random() < 0.3,
+            "opt_parking": rng.random() < 0.4,
+            "opt_pet": rng.random() < 0.2,
+            "opt_wifi": rng.random() < 0.6,
+            "opt_group": rng.random() < 0.3,
+        }
+        price = rng.randrange(5, 80) * 1000
+        b["menus"] = [{"name": "대표 메뉴", "price": f"{price:,}원"}]
+        hours = rng.choice(HOURS_PATTERNS)
+        for field in ("hours_mon", "hours_tue", "hours_wed", "hours_thu", "hours_fri", "hours_sat", "hours_sun"):
+            b[field] = hours
+        b["off_day"] = rng.choice([None, "월요일", "일요일"])
+        main.normalize_business(b)
+        main.BUSINESSES.append(b)
+        main.index_business(b)
+        main._business_id_seq += 1
+
+    for _ in range(n_reviews):
+        main.record_review(
+            {
+                "business_id": rng.randint(1, n_businesses),
+                "username": rng.choice(users),
+                "rating": rng.randint(1, 5),
+                "comment": "좋아요",
+            }
+        )
+
+    for i in range(n_posts):
+        sido, sigungu, dong = rng.choice(dongs)
+        main.apply_mutation(
+            "post.add",
+            {
+                "id": i + 1,
+                "title": f"동네 소식 {i + 1}",
+                "content": "벤치마크용 글입니다.",
+                "user": rng.choice(users),
+                "sido": sido,
+                "sigungu": sigungu,
+                "dong": dong,
+                "image_url": None,
+            },
+        )
+
+
+# ------------------------------------------------------------
+# 시나리오 — (이름, 요청 생성 함수)
+# ------------------------------------------------------------
+def build_scenarios(rng: random.Random, dongs, users, n_businesses):
+    admin_headers = {"cookie": f"user={main.ADMIN_USERNAME}; is_admin=1"}
+
+    def loc():
+        sido, sigungu, dong = rng.choice(dongs)
+        return {"sido": sido, "sigungu": sigungu, "dong": dong}
+
+    return [
+        ("GET /food", lambda: ("GET", "/food", {"params": loc()})),
+        ("GET /repair", lambda: ("GET", "/repair", {"params": loc()})),
+        (
+            "GET /food?opt=parking&opt=pet",
+            lambda: ("GET", "/food", {"params": {**loc(), "opt": ["parking", "pet"]}}),
+        ),
+        (
+            "GET /food?limit=20",
+            lambda: ("GET", "/food", {"params": {**loc(), "limit": 20}}),
+        ),
+        (
+            "GET /food?price_max=30000&sort=price_asc",
+            lambda: ("GET", "/food", {"params": {**loc(), "price_max": "30000", "sort": "price_asc"}}),
+        ),
+        (
+            "GET /food?open_at=23:00",
+            lambda: ("GET", "/food", {"params": {**loc(), "open_at": "23:00"}}),
+        ),
+        ("GET /lifestyle", lambda: ("GET", "/lifestyle", {"params": loc()})),
+        (
+            "GET /business/{bid}",
+            lambda: ("GET", f"/business/{rng.randint(1, max(n_businesses, 1))}", {}),
+        ),
+        ("GET /api/locations/sido", lambda: ("GET", "/api/locations/sido", {})),
+        (
+            "GET /api/locations/dong",
+            lambda: ("GET", "/api/locations/dong", {"params": {k: v for k, v in loc().items() if k != "dong"}}),
+        ),
+        (
+            "POST /auth/login",
+            lambda: (
+                "POST",
+                "/auth/login",
+                {"data": {"username": rng.choice(users), "password": BENCH_PASSWORD}},
+            ),
+        ),
+        ("GET /admin", lambda: ("GET", "/admin", {"headers": admin_headers})),
+    ]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+async def run_scenario(client, make_request, n_requests, concurrency):
+    latencies = []
+    errors = 0
+    queue = list(range(n_requests))
+
+    async def worker():
+        nonlocal errors
+        while queue:
+            queue.pop()
+            method, url, kwargs = make_request()
+            t0 = time.perf_counter()
+            res = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            # 로그인 응답 쿠키가 다음 요청에 섞이지 않도록
+            client.cookies.clear()
+            if res.status_code >= 400:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "requests": n_requests,
+        "errors": errors,
+        "rps": round(n_requests / elapsed, 1) if elapsed else 0.0,
+        "p50": round(percentile(latencies, 50), 3),
+        "p95": round(percentile(latencies, 95), 3),
+        "p99": round(percentile(latencies, 99), 3),
+    }
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    results: dict[str, dict[str, dict]] = {}
+
+    async with main.lifespan(main.app):
+        dongs = all_dongs()
+        users = seed_users(args.users)
+
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", follow_redirects=False
+        ) as client:
+            for size in args.sizes:
+                seed_stores(
+                    rng,
+                    dongs,
+                    users,
+                    n_businesses=size,
+                    n_reviews=size * args.reviews_per_business,
+                    n_posts=size * args.posts_per_business,
+                )
+                results[str(size)] = {}
+                for name, make_request in build_scenarios(rng, dongs, users, size):
+                    # 워밍업 (템플릿 컴파일 등)
+                    await run_scenario(client, make_request, min(10, args.requests), 1)
+                    stats = await run_scenario(client, make_request, args.requests, args.concurrency)
+                    results[str(size)][name] = stats
+
+    return results
+
+
+# ------------------------------------------------------------
+# 출력 / 베이스라인 비교
+# ------------------------------------------------------------
+def report(results, baseline, threshold):
+    regressions = []
+    header = f"{'size':>7}  {'route':<32} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'err':>5}  vs baseline(p95)"
+    print(header)
+    print("-" * len(header))
+
+    for size, routes in results.items():
+        for name, s in routes.items():
+            line = (
+                f"{size:>7}  {name:<32} {s['rps']:>9.1f} {s['p50']:>9.2f} "
+                f"{s['p95']:>9.2f} {s['p99']:>9.2f} {s['errors']:>5}"
+            )
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if base and base["p95"] > 0:
+                ratio = s["p95"] / base["p95"]
+                mark = "  ⚠ 회귀" if ratio > threshold else ""
+                line += f"  x{ratio:.2f}{mark}"
+                if ratio > threshold:
+                    regressions.append((size, name, ratio))
+            print(line)
+
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="동네링크 라우트 벤치마크")
+    parser.add_argument("--sizes", default="100,1000,10000", help="업소 수 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=100, help="라우트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--reviews-per-business", type=int, default=3)
+    parser.add_argument("--posts-per-business", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=1.5, help="p95 회귀 판정 배수")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+    args.sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    return args
+
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    regressions = report(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "config": {
+                        "requests": args.requests,
+                        "concurrency": args.concurrency,
+                        "users": args.users,
+                        "reviews_per_business": args.reviews_per_business,
+                        "posts_per_business": args.posts_per_business,
+                        "seed": args.seed,
+                    },
+                    "results": results,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"\n베이스라인 저장 → {args.baseline}")
+
+    if regressions:
+        print(f"\n회귀 {len(regressions)}건 (p95 > x{args.threshold})")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,98 @@
+# build_assets.py
+# ------------------------------------------------------------
+# static/ 정적 파일 빌드 스텝
+#   - 파일 내용 해시로 이름 변경 (style.css → style.1a2b3c4d5e.css)
+#   - 텍스트 파일은 .gz / .br 압축본 미리 생성
+#   - static/dist/manifest.json 에 원본 → 해시 이름 매핑 기록
+#
+#   사용법: python build_assets.py
+# ------------------------------------------------------------
+import gzip
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+from assets import HASH_LEN
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 .gz 만 생성
+    brotli = None
+
+BASE_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BASE_DIR / "static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST_FILE = DIST_DIR / "manifest.json"
+
+# 빌드 대상에서 제외 (업로드 파일 / 고정 URL 이 필요한 SW / 빌드 결과물)
+EXCLUDE_DIRS = {"dist", "uploads", "lifestyle"}
+EXCLUDE_FILES = {"service-worker.js"}
+
+# 압축 효과가 있는 텍스트 계열만 압축
+COMPRESSIBLE = {".css", ".js", ".json", ".svg", ".html", ".txt", ".map", ".webmanifest"}
+
+
+def iter_sources():
+    for path in sorted(STATIC_DIR.rglob("*")):
+        if not path.is_file():
+            continue
+        rel = path.relative_to(STATIC_DIR)
+        if rel.parts[0] in EXCLUDE_DIRS or rel.name in EXCLUDE_FILES:
+            continue
+        if rel.name.startswith("."):
+            continue
+        yield path, rel
+
+
+def hashed_name(rel: Path, digest: str) -> str:
+    # icons/icon-192.png → icons/icon-192.<hash>.png
+    return rel.with_name(f"{rel.stem}.{digest[:HASH_LEN]}{rel.suffix}").as_posix()
+
+
+def write_compressed(src: bytes, dest: Path):
+    # 원본보다 작을 때만 압축본을 남김
+    gz = gzip.compress(src, compresslevel=9, mtime=0)
+    if len(gz) < len(src):
+        dest.with_name(dest.name + ".gz").write_bytes(gz)
+
+    if brotli is not None:
+        br = brotli.compress(src, quality=11)
+        if len(br) < len(src):
+            dest.with_name(dest.name + ".br").write_bytes(br)
+
+
+def build():
+    if DIST_DIR.exists():
+        shutil.rmtree(DIST_DIR)
+    DIST_DIR.mkdir(parents=True)
+
+    assets = {}
+    version = hashlib.sha256()
+
+    for path, rel in iter_sources():
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        name = hashed_name(rel, digest)
+
+        dest = DIST_DIR / name
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(data)
+
+        if rel.suffix.lower() in COMPRESSIBLE:
+            write_compressed(data, dest)
+
+        assets[rel.as_posix()] = name
+        version.update(f"{rel.as_posix()}:{digest}\n".encode())
+
+    manifest = {"version": version.hexdigest()[:HASH_LEN], "assets": assets}
+    with open(MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"정적 파일 빌드 완료 → {len(assets)}개 ({MANIFEST_FILE})")
+    if brotli is None:
+        print("brotli 모듈이 없어 .br 파일은 생성하지 않았습니다.")
+
+
+if __name__ == "__main__":
+    build()
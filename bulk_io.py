@@ -0,0 +1,200 @@
+# bulk_io.py
+# ------------------------------------------------------------
+# 업소 대량 등록(import) / 내보내기(export) — CSV / JSONL
+#
+#   import : 업로드 파일을 한 줄씩 읽어 업소 dict 로 변환 + 검증
+#            (파일 전체를 메모리에 올리지 않음 — 저장/인덱스 반영은 main 에서 배치로)
+#   export : 업소를 CHUNK_ROWS 줄씩 직렬화해서 bytes 로 흘려보냄 (StreamingResponse)
+#
+#   CSV 컬럼은 등록 폼 필드 이름과 같음 (menu_name1, service_price2 ...)
+#   → export 한 파일을 그대로 다시 import 할 수 있음 (id 는 새로 발급)
+#   JSONL 은 menus / services 를 리스트로 그대로 사용
+# ------------------------------------------------------------
+import csv
+import io
+import json
+from typing import Callable, IO, Iterable, Iterator, Optional
+
+FORMATS = ("csv", "jsonl")
+KINDS = ("food", "repair")
+MENU_SLOTS = 3
+
+TEXT_FIELDS = (
+    "phone", "homepage", "blog", "instagram", "address_road", "address_detail", "lat", "lng",
+    "hours_mon", "hours_tue", "hours_wed", "hours_thu", "hours_fri", "hours_sat", "hours_sun",
+    "off_day",
+)
+OPT_FIELDS = (
+    "opt_delivery", "opt_reservation", "opt_parking", "opt_pet", "opt_wifi", "opt_group",
+)
+
+CSV_FIELDS = (
+    ["kind", "sido", "sigungu", "dong", "category", "name", "description", "image_url",
+     "owner", "approved", "paid"]
+    + list(TEXT_FIELDS)
+    + list(OPT_FIELDS)
+    + [f"menu_{f}{i}" for i in range(1, MENU_SLOTS + 1) for f in ("name", "price")]
+    + [f"service_{f}{i}" for i in range(1, MENU_SLOTS + 1) for f in ("name", "desc", "price")]
+)
+EXPORT_CSV_FIELDS = ["id"] + CSV_FIELDS + ["premium", "created_at"]
+
+# JSONL export 에서 뺄 필드 (등록 시 다시 계산되는 파생값 / 내부용)
+DERIVED_FIELDS = ("hours_week", "price_min", "price_max", "rank_score", "_v")
+
+CHUNK_ROWS = 500
+TRUE_WORDS = {"1", "true", "t", "y", "yes", "o", "예", "on"}
+
+
+def detect_format(filename: Optional[str], explicit: Optional[str] = None) -> str:
+    fmt = (explicit or "").strip().lower()
+    if not fmt and filename:
+        fmt = filename.rsplit(".", 1)[-1].lower()
+        if fmt in ("ndjson", "json"):
+            fmt = "jsonl"
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하는 형식은 {', '.join(FORMATS)} 입니다.")
+    return fmt
+
+
+# ------------------------------------------------------------
+# import
+# ------------------------------------------------------------
+def iter_rows(raw: IO[bytes], fmt: str) -> Iterator[tuple[int, Optional[dict], Optional[str]]]:
+    # (줄 번호, row, 오류) — 한 줄씩
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            for row in reader:
+                yield reader.line_num, row, None
+            return
+
+        for line_no, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_no, None, f"JSON 오류: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield line_no, None, "한 줄에 객체({...}) 하나여야 합니다."
+                continue
+            yield line_no, row, None
+    except UnicodeDecodeError:
+        yield 0, None, "UTF-8 파일이 아닙니다."
+    finally:
+        text.detach()
+
+
+def _text(v) -> Optional[str]:
+    if v is None:
+        return None
+    v = str(v).strip()
+    return v or None
+
+
+def _bool(v) -> bool:
+    if isinstance(v, bool):
+        return v
+    return str(v or "").strip().lower() in TRUE_WORDS
+
+
+def _items(row: dict, key: str, fields: tuple[str, ...]) -> list[dict]:
+    # JSONL: row["menus"] 리스트 / CSV: menu_name1, menu_price1 ...
+    prefix = key[:-1]
+    if isinstance(row.get(key), list):
+        source = [x for x in row[key] if isinstance(x, dict)]
+    else:
+        source = [
+            {f: row.get(f"{prefix}_{f}{i}") for f in fields}
+            for i in range(1, MENU_SLOTS + 1)
+        ]
+    items = []
+    for x in source:
+        name = _text(x.get("name"))
+        if name:
+            items.append({f: (name if f == "name" else _text(x.get(f)) or "") for f in fields})
+    return items
+
+
+def business_from_row(
+    row: dict,
+    check_location: Callable[[str, str, str], Optional[str]],
+    default_owner: str,
+) -> dict:
+    kind = _text(row.get("kind"))
+    if kind not in KINDS:
+        raise ValueError(f"kind 는 {', '.join(KINDS)} 중 하나여야 합니다.")
+    for field in ("sido", "sigungu", "dong", "category", "name"):
+        if not _text(row.get(field)):
+            raise ValueError(f"{field} 가 비어 있습니다.")
+
+    sido, sigungu, dong = _text(row["sido"]), _text(row["sigungu"]), _text(row["dong"])
+    problem = check_location(sido, sigungu, dong)
+    if problem:
+        raise ValueError(problem)
+
+    b = {
+        "id": None,
+        "kind": kind,
+        "sido": sido,
+        "sigungu": sigungu,
+        "dong": dong,
+        "category": _text(row["category"]),
+        "name": _text(row["name"]),
+        "description": _text(row.get("description")) or "",
+        "image_url": _text(row.get("image_url")),
+        "owner": _text(row.get("owner")) or default_owner,
+        "approved": _bool(row["approved"]) if _text(row.get("approved")) is not None else True,
+        "paid": _bool(row.get("paid")),
+        "premium": False,
+    }
+    for field in TEXT_FIELDS:
+        b[field] = _text(row.get(field))
+    for field in OPT_FIELDS:
+        b[field] = _bool(row.get(field))
+    b["menus"] = _items(row, "menus", ("name", "price"))
+    b["services"] = _items(row, "services", ("name", "desc", "price"))
+    return b
+
+
+# ------------------------------------------------------------
+# export
+# ------------------------------------------------------------
+def _csv_row(b: dict) -> dict:
+    row = {f: b.get(f) for f in EXPORT_CSV_FIELDS}
+    for key, fields in (("menus", ("name", "price")), ("services", ("name", "desc", "price"))):
+        prefix = key[:-1]
+        for i, item in enumerate((b.get(key) or [])[:MENU_SLOTS], 1):
+            for f in fields:
+                row[f"{prefix}_{f}{i}"] = item.get(f)
+    for field in ("approved", "paid", "premium") + OPT_FIELDS:
+        row[field] = "1" if b.get(field) else "0"
+    return row
+
+
+def export_rows(businesses: Iterable[dict], fmt: str) -> Iterator[bytes]:
+    buf = io.StringIO()
+    n = 0
+
+    if fmt == "csv":
+        buf.write("﻿")     # 엑셀에서 한글이 깨지지 않게 BOM
+        writer = csv.DictWriter(buf, EXPORT_CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        write = lambda b: writer.writerow(_csv_row(b))      # noqa: E731
+    else:
+        def write(b):
+            doc = {k: v for k, v in b.items() if k not in DERIVED_FIELDS}
+            buf.write(json.dumps(doc, ensure_ascii=False, separators=(",", ":")))
+            buf.write("\n")
+
+    for b in businesses:
+        write(b)
+        n += 1
+        if n % CHUNK_ROWS == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
@@ -0,0 +1,396 @@
+# business_index.py
+# ------------------------------------------------------------
+# 업소 목록용 인메모리 인덱스
+#
+#   (kind, sido, sigungu, dong) 마다 LocationShard 하나:
+#     - 업소는 shard 안의 slot 번호를 받음 (등록 순서대로, 재사용 X)
+#     - 조건별 bitset (Python int) : 살아있음 / 승인 / 카테고리 / 편의시설(opt_*)
+#     - "주차 AND 반려동물" 같은 조회 = bitset AND 몇 번 + 켜진 bit 순회
+#     - 영업시간 : 주간 30분 버킷마다 bitset 2개
+#         open_full[버킷] = 버킷 전체 동안 영업 → 바로 포함
+#         open_any[버킷]  = 버킷 일부만 영업 → 해당 업소만 구간 이진탐색
+#     - 가격 : 카테고리별(+전체) (최저가, slot) / (최고가, slot) 정렬 리스트 → bisect 로 범위 조회/정렬
+#     - 추천순 : (-rank_score, slot) 정렬 리스트 → 앞에서부터 N개 (정렬 X)
+#
+#   삭제된 slot 은 비어 있는 채로 남음 (등록 순서 유지)
+#   → 빈 slot 이 많아진 shard 는 compact_shard 로 살아있는 업소만 새 shard 에 다시 담아 교체
+#   대량 등록(put_many)은 정렬 리스트에 일단 붙이기만 하고 shard 마다 마지막에 한 번 정렬
+# ------------------------------------------------------------
+import bisect
+from typing import Callable, Iterable, Iterator, Optional
+
+from hours import WEEK_MINUTES, is_open
+
+# 목록 필터 이름 → 업소 dict 필드
+AMENITIES = {
+    "delivery": "opt_delivery",
+    "reservation": "opt_reservation",
+    "parking": "opt_parking",
+    "pet": "opt_pet",
+    "wifi": "opt_wifi",
+    "group": "opt_group",
+}
+
+AMENITY_LABELS = {
+    "delivery": "배달",
+    "reservation": "예약",
+    "parking": "주차",
+    "pet": "반려동물",
+    "wifi": "와이파이",
+    "group": "단체석",
+}
+
+
+BUCKET_MINUTES = 30
+N_BUCKETS = WEEK_MINUTES // BUCKET_MINUTES
+
+# 상한 없는 가격 ("2만원~") 의 정렬 키
+PRICE_INF = float("inf")
+
+DEFAULT_SORT = "rank"
+SORTS = ("rank", "price_asc", "price_desc")
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    # 켜진 bit 위치를 작은 것부터
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def location_key(b: dict) -> tuple:
+    return (b["kind"], b["sido"], b["sigungu"], b["dong"])
+
+
+class LocationShard:
+    def __init__(self):
+        self.slots: list[Optional[int]] = []     # slot → business id (삭제 시 None)
+        self.slot_of: dict[int, int] = {}        # business id → slot
+        self.live = 0
+        self.approved = 0
+        self.categories: dict[str, int] = {}
+        self.amenities: dict[str, int] = {name: 0 for name in AMENITIES}
+        self.hours: dict[int, list] = {}         # slot → hours_week
+        self.open_any = [0] * N_BUCKETS
+        self.open_full = [0] * N_BUCKETS
+        # category(None = 전체) → [(price_min, slot)] / [(price_max, slot)] 정렬 리스트
+        self.price_by_min: dict[Optional[str], list[tuple]] = {}
+        self.price_by_max: dict[Optional[str], list[tuple]] = {}
+        self.price_of: dict[int, tuple] = {}     # slot → (category, min, max)
+        self.ranked: list[tuple[float, int]] = []    # (-rank_score, slot) 정렬
+        self.score_of: dict[int, float] = {}
+        self.unsorted = False                    # put(bulk=True) 뒤 finish_bulk 전
+        self.version = 0                         # 변경될 때마다 증가
+
+    def __len__(self) -> int:
+        return len(self.slot_of)
+
+    def put(self, b: dict, bulk: bool = False):
+        slot = self.slot_of.get(b["id"])
+        if slot is None:
+            slot = len(self.slots)
+            self.slots.append(b["id"])
+            self.slot_of[b["id"]] = slot
+        else:
+            if self.unsorted:
+                self.finish_bulk()
+            self._clear_slot(slot)
+        insert = self._append_unsorted if bulk else bisect.insort
+
+        mask = 1 << slot
+        self.live |= mask
+        if b.get("approved"):
+            self.approved |= mask
+        self.categories[b["category"]] = self.categories.get(b["category"], 0) | mask
+        for name, field in AMENITIES.items():
+            if b.get(field):
+                self.amenities[name] |= mask
+
+        week = b.get("hours_week")
+        if week:
+            self.hours[slot] = week
+            for start, end in week:
+                for bucket in range(start // BUCKET_MINUTES, (end - 1) // BUCKET_MINUTES + 1):
+                    self.open_any[bucket] |= mask
+                    b_start = bucket * BUCKET_MINUTES
+                    if start <= b_start and b_start + BUCKET_MINUTES <= end:
+                        self.open_full[bucket] |= mask
+
+        if b.get("price_min") is not None:
+            high = b.get("price_max")
+            entry = (b["category"], b["price_min"], PRICE_INF if high is None else high)
+            self.price_of[slot] = entry
+            for key in (None, entry[0]):
+                insert(self.price_by_min.setdefault(key, []), (entry[1], slot))
+                insert(self.price_by_max.setdefault(key, []), (entry[2], slot))
+
+        score = b.get("rank_score") or 0.0
+        self.score_of[slot] = score
+        insert(self.ranked, (-score, slot))
+        self.version += 1
+
+    def _append_unsorted(self, lst: list, item):
+        lst.append(item)
+        self.unsorted = True
+
+    def finish_bulk(self):
+        for lists in (self.price_by_min, self.price_by_max):
+            for lst in lists.values():
+                lst.sort()
+        self.ranked.sort()
+        self.unsorted = False
+
+    def set_score(self, bid: int, score: float):
+        slot = self.slot_of.get(bid)
+        if slot is None or self.score_of.get(slot) == score:
+            return
+        if self.unsorted:
+            self.finish_bulk()
+        self._unrank(slot)
+        self.score_of[slot] = score
+        bisect.insort(self.ranked, (-score, slot))
+        self.version += 1
+
+    def _unrank(self, slot: int):
+        score = self.score_of.pop(slot, None)
+        if score is None:
+            return
+        i = bisect.bisect_left(self.ranked, (-score, slot))
+        if i < len(self.ranked) and self.ranked[i] == (-score, slot):
+            del self.ranked[i]
+
+    def _clear_slot(self, slot: int):
+        bit = 1 << slot
+        keep = ~bit
+        self.live &= keep
+        self.approved &= keep
+        for cat in [c for c, bits in self.categories.items() if bits & bit]:
+            bits = self.categories[cat] & keep
+            if bits:
+                self.categories[cat] = bits
+            else:
+                del self.categories[cat]
+        for name in self.amenities:
+            self.amenities[name] &= keep
+
+        week = self.hours.pop(slot, None)
+        if week:
+            for start, end in week:
+                for bucket in range(start // BUCKET_MINUTES, (end - 1) // BUCKET_MINUTES + 1):
+                    self.open_any[bucket] &= keep
+                    self.open_full[bucket] &= keep
+
+        entry = self.price_of.pop(slot, None)
+        if entry:
+            for key in (None, entry[0]):
+                self._remove_sorted(self.price_by_min, key, (entry[1], slot))
+                self._remove_sorted(self.price_by_max, key, (entry[2], slot))
+
+        self._unrank(slot)
+
+    @staticmethod
+    def _remove_sorted(lists: dict, key, item):
+        lst = lists[key]
+        i = bisect.bisect_left(lst, item)
+        if i < len(lst) and lst[i] == item:
+            del lst[i]
+        if not lst:
+            del lists[key]
+
+    def remove(self, bid: int):
+        slot = self.slot_of.pop(bid, None)
+        if slot is None:
+            return
+        if self.unsorted:
+            self.finish_bulk()
+        self._clear_slot(slot)
+        self.slots[slot] = None
+        self.version += 1
+
+    def select(
+        self,
+        category=None,
+        amenities: Iterable[str] = (),
+        approved_only=True,
+        open_at: Optional[int] = None,
+        price_min: Optional[int] = None,
+        price_max: Optional[int] = None,
+    ) -> int:
+        bits = self.approved if approved_only else self.live
+        if category:
+            bits &= self.categories.get(category, 0)
+        for name in amenities:
+            if not bits:
+                break
+            bits &= self.amenities[name]
+        if price_max is not None and bits:
+            # 최저가가 예산 이하인 업소 = by_min 리스트의 앞부분
+            lst = self.price_by_min.get(category or None, [])
+            bits &= self._slots_bits(lst[:bisect.bisect_right(lst, (price_max, PRICE_INF))])
+        if price_min is not None and bits:
+            # 최고가가 하한 이상인 업소 = by_max 리스트의 뒷부분
+            lst = self.price_by_max.get(category or None, [])
+            bits &= self._slots_bits(lst[bisect.bisect_left(lst, (price_min, -1)):])
+        if open_at is not None and bits:
+            bits = self._open_at(bits, open_at)
+        return bits
+
+    @staticmethod
+    def _slots_bits(entries) -> int:
+        bits = 0
+        for _, slot in entries:
+            bits |= 1 << slot
+        return bits
+
+    def _open_at(self, bits: int, minute: int) -> int:
+        bucket = (minute % WEEK_MINUTES) // BUCKET_MINUTES
+        result = bits & self.open_full[bucket]
+        # 버킷 중간에 열고/닫는 업소만 실제 구간 확인
+        for slot in iter_bits(bits & self.open_any[bucket] & ~result):
+            if is_open(self.hours[slot], minute):
+                result |= 1 << slot
+        return result
+
+    def ids(
+        self, bits: int, sort: Optional[str] = DEFAULT_SORT, category=None, limit: Optional[int] = None
+    ) -> list[int]:
+        slots = self.slots
+        limit = limit or len(self.slot_of)
+
+        if sort == "rank":
+            # 점수 내림차순 리스트를 따라가며 bits 에 있는 것만 — limit 개 모이면 종료
+            ordered = []
+            for _, slot in self.ranked:
+                if bits >> slot & 1:
+                    ordered.append(slots[slot])
+                    if len(ordered) >= limit:
+                        break
+            return ordered
+
+        if sort not in SORTS:
+            return [slots[i] for i in iter_bits(bits)][:limit]
+
+        # 가격순: 가격 정렬 리스트를 따라가며 bits 에 있는 것만, 가격 없는 업소는 뒤로
+        #   낮은 가격순 = 최저가 오름차순 / 높은 가격순 = 최고가 내림차순 (상한 없는 업소가 맨 앞)
+        if sort == "price_desc":
+            lst = reversed(self.price_by_max.get(category or None, []))
+        else:
+            lst = self.price_by_min.get(category or None, [])
+        ordered = []
+        for _, slot in lst:
+            if bits >> slot & 1:
+                ordered.append(slots[slot])
+                bits &= ~(1 << slot)
+                if len(ordered) >= limit:
+                    return ordered
+        ordered.extend(slots[i] for i in iter_bits(bits))
+        return ordered[:limit]
+
+
+class BusinessIndex:
+    def __init__(self):
+        self.shards: dict[tuple, LocationShard] = {}
+        self.located: dict[int, tuple] = {}               # business id → shard key
+        self.category_counts: dict[str, dict[str, int]] = {}   # kind → {category: 업소 수}
+        self._category_of: dict[int, tuple[str, str]] = {}
+
+    def clear(self):
+        self.__init__()
+
+    def shard(self, kind, sido, sigungu, dong) -> Optional[LocationShard]:
+        return self.shards.get((kind, sido, sigungu, dong))
+
+    def put(self, b: dict, bulk: bool = False) -> LocationShard:
+        key = location_key(b)
+        old_key = self.located.get(b["id"])
+        if old_key is not None and old_key != key:
+            self.shards[old_key].remove(b["id"])
+
+        shard = self.shards.get(key)
+        if shard is None:
+            shard = self.shards[key] = LocationShard()
+        shard.put(b, bulk)
+        self.located[b["id"]] = key
+
+        self._count_category(b["id"], (b["kind"], b["category"]))
+        return shard
+
+    def put_many(self, bs: Iterable[dict]) -> int:
+        # 대량 반영 — 정렬은 shard 마다 마지막에 한 번
+        touched = {}
+        for b in bs:
+            shard = self.put(b, bulk=True)
+            touched[id(shard)] = shard
+        for shard in touched.values():
+            if shard.unsorted:
+                shard.finish_bulk()
+        return len(touched)
+
+    def remove(self, bid: int):
+        key = self.located.pop(bid, None)
+        if key is None:
+            return
+        self.shards[key].remove(bid)
+        self._count_category(bid, None)
+
+    # --------------------------------------------------------
+    # 정리 (빈 slot 회수) — 호출하는 쪽에서 쓰기와 겹치지 않게 lock
+    # --------------------------------------------------------
+    def sparse_shards(self, min_dead: int = 64, min_ratio: float = 0.25) -> list[tuple]:
+        found = []
+        for key, shard in self.shards.items():
+            dead = len(shard.slots) - len(shard)
+            if not len(shard) or (dead >= min_dead and dead >= len(shard.slots) * min_ratio):
+                found.append(key)
+        return found
+
+    def compact_shard(self, key: tuple, get: Callable[[int], dict]) -> int:
+        # 살아있는 업소를 slot 순서대로 새 shard 에 담고 통째로 교체 (읽기는 옛 shard 를 끝까지 씀)
+        old = self.shards.get(key)
+        if old is None:
+            return 0
+        if not len(old):
+            del self.shards[key]
+            return len(old.slots)
+        new = LocationShard()
+        for bid in old.slots:
+            if bid is not None:
+                new.put(get(bid), bulk=True)
+        if new.unsorted:
+            new.finish_bulk()
+        new.version = old.version + 1
+        self.shards[key] = new
+        return len(old.slots) - len(new.slots)
+
+    def _count_category(self, bid: int, kind_category: Optional[tuple[str, str]]):
+        old = self._category_of.pop(bid, None)
+        if old is not None:
+            counts = self.category_counts[old[0]]
+            counts[old[1]] -= 1
+            if not counts[old[1]]:
+                del counts[old[1]]
+        if kind_category is not None:
+            kind, category = kind_category
+            counts = self.category_counts.setdefault(kind, {})
+            counts[category] = counts.get(category, 0) + 1
+            self._category_of[bid] = kind_category
+
+    def categories(self, kind: str) -> list[str]:
+        return sorted(self.category_counts.get(kind, {}))
+
+    def query(
+        self, kind, sido, sigungu, dong,
+        category=None, amenities=(), approved_only=True, open_at=None,
+        price_min=None, price_max=None, sort=DEFAULT_SORT, limit=None,
+    ) -> list[int]:
+        shard = self.shard(kind, sido, sigungu, dong)
+        if shard is None:
+            return []
+        bits = shard.select(category, amenities, approved_only, open_at, price_min, price_max)
+        return shard.ids(bits, sort, category, limit)
+
+    def set_score(self, bid: int, score: float):
+        key = self.located.get(bid)
+        if key is not None:
+            self.shards[key].set_score(bid, score)
@@ -0,0 +1,323 @@
+# counters.py
+# ------------------------------------------------------------
+# 조회수 (write-behind) + 동네별 인기 목록
+#
+#   조회수
+#     - 메모리 카운터를 N개 shard 로 나눔 (shard 마다 lock → 요청 스레드끼리 덜 부딪힘)
+#     - 조회 1건 = shard dict 갱신뿐, DB 쓰기 없음
+#     - 백그라운드 스레드가 flush_interval 마다 밀린 증가분을 한 트랜잭션으로 DB 반영
+#       (실패하면 증가분을 되돌려 놓고 다음 주기에 다시)
+#     - DB 반영은 행마다 upsert 한 문장 (count = count + 증가분) — 값을 읽어 와서 더하지 않음
+#       → worker 가 여럿이어도 증가분이 사라지거나 새 행 INSERT 가 부딪히지 않음
+#       (SQLite / PostgreSQL 의 INSERT ... ON CONFLICT DO UPDATE)
+#     - 화면 표시값 = 기동 시 DB 값 + 이 worker 의 이후 증가분
+#       (다른 worker 의 증가분은 재시작 전까지 안 보임 — 조회수 표시용으로는 충분)
+#
+#   인기 점수 (시간 감쇠)
+#     - 조회 1건의 가중치 = exp((t - ANCHOR) / tau) — "고정 기준점" 방식이라
+#       이미 쌓인 점수를 주기적으로 깎을 필요 없음 (최근 조회일수록 큰 가중치)
+#     - 값이 너무 커지지 않게 log 로 저장: score = logaddexp(score, (t - ANCHOR) / tau)
+#       DB 에서도 같은 식으로 합침 (SQL 함수 logaddexp — SQLite 는 연결마다 Python 함수 등록)
+#     - 동네(topic)마다 상위 K 개를 정렬된 작은 리스트로 유지
+#       점수는 조회로만 오르므로 K 밖의 항목은 "K 번째보다 커질 때"만 들어옴
+#       → 인기 목록 조회 = 리스트 그대로 반환 O(K)
+# ------------------------------------------------------------
+import logging
+import math
+import sqlite3
+import threading
+import time
+from typing import Callable, Hashable, Iterable, Optional
+
+from sqlalchemy import case, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import Float
+
+from metrics import COUNTER_FLUSH, COUNTER_VIEWS
+from models import ViewCount
+
+logger = logging.getLogger("dongnelink.counters")
+
+ANCHOR = 1_700_000_000          # 점수 기준 시각 (고정)
+DEFAULT_TAU = 24 * 3600         # 하루 지난 조회는 가중치 1/e
+
+Key = tuple[str, int]           # ("business" | "post", id)
+
+# upsert 를 지원하는 DB → dialect 별 insert
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+UPSERT_BATCH = 500
+
+
+def logaddexp(a: float, b: float) -> float:
+    if a == -math.inf:
+        return b
+    if b == -math.inf:
+        return a
+    hi, lo = (a, b) if a >= b else (b, a)
+    return hi + math.log1p(math.exp(lo - hi))
+
+
+# ------------------------------------------------------------
+# SQL 함수 logaddexp(a, b) — flush 의 인기 점수 합치기 (NULL 은 -inf 로)
+# ------------------------------------------------------------
+class sql_logaddexp(FunctionElement):
+    type = Float()
+    name = "logaddexp"
+    inherit_cache = True
+
+
+@compiles(sql_logaddexp)
+def _compile_logaddexp(element, compiler, **kw):
+    return "logaddexp(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(sql_logaddexp, "postgresql")
+def _compile_logaddexp_pg(element, compiler, **kw):
+    a, b = (compiler.process(c, **kw) for c in element.clauses)
+    return (
+        f"CASE WHEN {a} IS NULL THEN {b} WHEN {b} IS NULL THEN {a} "
+        f"ELSE GREATEST({a}, {b}) + LN(1 + EXP(-ABS({a} - {b}))) END"
+    )
+
+
+def _sqlite_logaddexp(a, b):
+    return logaddexp(-math.inf if a is None else a, -math.inf if b is None else b)
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_functions(dbapi_conn, connection_record):
+    if isinstance(dbapi_conn, sqlite3.Connection):
+        dbapi_conn.create_function("logaddexp", 2, _sqlite_logaddexp, deterministic=True)
+
+
+class _Shard:
+    __slots__ = ("lock", "totals", "pending")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals: dict[Key, int] = {}
+        self.pending: dict[Key, int] = {}
+
+
+class TopK:
+    # 동네별 인기 상위 K — scores 는 topic 안의 모든 항목, top 은 (점수 내림차순) 상위 K
+    __slots__ = ("k", "scores", "top")
+
+    def __init__(self, k: int):
+        self.k = k
+        self.scores: dict[Hashable, float] = {}
+        self.top: list[tuple[float, Hashable]] = []
+
+    def update(self, item, score: float):
+        self.scores[item] = score
+        top = self.top
+        for i, (_, it) in enumerate(top):
+            if it == item:
+                del top[i]
+                break
+        else:
+            if len(top) >= self.k and score <= top[-1][0]:
+                return
+        # K 가 작으므로 삽입 위치는 선형 탐색
+        i = 0
+        while i < len(top) and top[i][0] >= score:
+            i += 1
+        top.insert(i, (score, item))
+        del top[self.k:]
+
+    def remove(self, item):
+        if self.scores.pop(item, None) is None:
+            return
+        if any(it == item for _, it in self.top):
+            # 빈자리 채우기 — 드문 경우라 전체에서 다시 뽑음
+            self.top = sorted(((s, it) for it, s in self.scores.items()), reverse=True)[:self.k]
+
+    def items(self, n: Optional[int] = None) -> list:
+        return [it for _, it in self.top[:n]]
+
+
+class ViewCounters:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        shards: int = 16,
+        flush_interval_s: float = 10.0,
+        top_k: int = 10,
+        tau_s: float = DEFAULT_TAU,
+    ):
+        self.session_factory = session_factory
+        self.shards = [_Shard() for _ in range(shards)]
+        self.flush_interval = flush_interval_s
+        self.tau = tau_s
+        self.top_k = top_k
+
+        # 인기 점수 (topic 별) — 조회 경로에서 짧게 잡는 lock 하나
+        self._trend_lock = threading.Lock()
+        self.trending: dict[Hashable, TopK] = {}
+        self.trend: dict[Key, float] = {}
+        self.topic_of: dict[Key, Hashable] = {}
+        self._trend_pending: dict[Key, float] = {}    # flush 이후 이 worker 가 더한 몫 (log)
+
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _shard(self, key: Key) -> _Shard:
+        return self.shards[hash(key) % len(self.shards)]
+
+    # --------------------------------------------------------
+    # 조회 경로
+    # --------------------------------------------------------
+    def view(self, kind: str, item_id: int, topic: Optional[Hashable] = None, now: Optional[float] = None) -> int:
+        key = (kind, item_id)
+        shard = self._shard(key)
+        with shard.lock:
+            total = shard.totals.get(key, 0) + 1
+            shard.totals[key] = total
+            shard.pending[key] = shard.pending.get(key, 0) + 1
+        COUNTER_VIEWS.inc(kind)
+
+        if topic is not None:
+            x = ((now or time.time()) - ANCHOR) / self.tau
+            with self._trend_lock:
+                score = logaddexp(self.trend.get(key, -math.inf), x)
+                self._set_trend(key, topic, score)
+                self._trend_pending[key] = logaddexp(self._trend_pending.get(key, -math.inf), x)
+        return total
+
+    def _set_trend(self, key: Key, topic: Hashable, score: float):
+        self.trend[key] = score
+        old = self.topic_of.get(key)
+        if old is not None and old != topic:
+            self.trending[old].remove(key[1])       # 동네를 옮긴 업소
+        self.topic_of[key] = topic
+        top = self.trending.get(topic)
+        if top is None:
+            top = self.trending[topic] = TopK(self.top_k)
+        top.update(key[1], score)
+
+    def count(self, kind: str, item_id: int) -> int:
+        key = (kind, item_id)
+        return self._shard(key).totals.get(key, 0)
+
+    def counts(self, kind: str, ids: Iterable[int]) -> dict[int, int]:
+        return {i: self.count(kind, i) for i in ids}
+
+    def top(self, topic: Hashable, n: Optional[int] = None) -> list:
+        top = self.trending.get(topic)
+        return top.items(n) if top else []
+
+    def forget(self, kind: str, item_id: int):
+        # 삭제된 항목 — 인기 목록에서만 뺌 (DB 의 누적 조회수는 그대로)
+        key = (kind, item_id)
+        with self._trend_lock:
+            self.trend.pop(key, None)
+            self._trend_pending.pop(key, None)
+            topic = self.topic_of.pop(key, None)
+            if topic is not None:
+                self.trending[topic].remove(item_id)
+
+    # --------------------------------------------------------
+    # 기동 / flush
+    # --------------------------------------------------------
+    def load(self, topic_of: Callable[[str, int], Optional[Hashable]]):
+        # DB 누적값 로드 + 인기 점수 복원 (topic_of 가 None 이면 삭제된 항목)
+        with self.session_factory() as db:
+            dialect = db.get_bind().dialect.name
+            if dialect not in UPSERT_INSERTS:
+                raise RuntimeError(f"조회수 flush 는 {', '.join(UPSERT_INSERTS)} 만 지원합니다 (현재 {dialect})")
+            rows = db.query(ViewCount.kind, ViewCount.item_id, ViewCount.count, ViewCount.trend).all()
+        for kind, item_id, count, trend in rows:
+            key = (kind, item_id)
+            shard = self._shard(key)
+            with shard.lock:
+                shard.totals[key] = count + shard.pending.get(key, 0)
+            if trend is None:
+                continue
+            topic = topic_of(kind, item_id)
+            if topic is not None:
+                with self._trend_lock:
+                    score = logaddexp(self.trend.get(key, -math.inf), trend)
+                    self._set_trend(key, topic, score)
+        return len(rows)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dongnelink-counters", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("조회수 flush 실패")
+
+    def _drain(self) -> tuple[dict[Key, int], dict[Key, float]]:
+        deltas: dict[Key, int] = {}
+        for shard in self.shards:
+            with shard.lock:
+                pending, shard.pending = shard.pending, {}
+            deltas.update(pending)
+        with self._trend_lock:
+            trends, self._trend_pending = self._trend_pending, {}
+        return deltas, trends
+
+    def _restore(self, deltas: dict[Key, int], trends: dict[Key, float]):
+        for key, n in deltas.items():
+            shard = self._shard(key)
+            with shard.lock:
+                shard.pending[key] = shard.pending.get(key, 0) + n
+        with self._trend_lock:
+            for key, x in trends.items():
+                self._trend_pending[key] = logaddexp(self._trend_pending.get(key, -math.inf), x)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            deltas, trends = self._drain()
+            keys = set(deltas) | set(trends)
+            if not keys:
+                return 0
+            t0 = time.perf_counter()
+            try:
+                self._write(keys, deltas, trends)
+            except Exception:
+                self._restore(deltas, trends)
+                raise
+            COUNTER_FLUSH.observe(time.perf_counter() - t0)
+            return len(keys)
+
+    def _write(self, keys: set, deltas: dict[Key, int], trends: dict[Key, float]):
+        # 한 트랜잭션: 행마다 upsert — 더하기는 DB 안에서 (여러 worker 가 같은 행을 써도 누적)
+        #   count = count + 증가분 / trend = logaddexp(trend, 이 worker 가 더한 몫)
+        rows = [
+            {"kind": key[0], "item_id": key[1], "count": deltas.get(key, 0), "trend": trends.get(key)}
+            for key in keys
+        ]
+        with self.session_factory() as db:
+            stmt = UPSERT_INSERTS[db.get_bind().dialect.name](ViewCount)
+            new = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ViewCount.kind, ViewCount.item_id],
+                set_={
+                    "count": ViewCount.count + new.count,
+                    "trend": case(
+                        (new.trend.is_(None), ViewCount.trend),
+                        else_=sql_logaddexp(ViewCount.trend, new.trend),
+                    ),
+                },
+            )
+            for i in range(0, len(rows), UPSERT_BATCH):
+                db.execute(stmt, rows[i:i + UPSERT_BATCH])
+            db.commit()
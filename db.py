@@ -1,23 +1,111 @@
 # db.py
+# ------------------------------------------------------------
+# DB 연결 — 쓰기(primary) / 읽기(replica) 엔진을 따로
+#
+#   DATABASE_URL      : 쓰기 엔진 (가입/로그인/조회수 flush ...)
+#   READ_DATABASE_URL : 읽기 엔진 (관리자 목록 등) — 없으면 같은 DB 에 커넥션 풀만 따로
+#                       → 무거운 읽기가 쓰기와 같은 풀을 두고 기다리지 않음
+#
+#   read-your-writes : 쓰기를 한 요청의 응답에 짧은 쿠키(READ_STICKY_S 초)를 붙이고,
+#                      쿠키가 살아 있는 동안 그 브라우저의 읽기는 쓰기 엔진으로
+#                      (replica 가 아직 못 따라온 자기 변경이 안 보이는 일 방지)
+# ------------------------------------------------------------
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 # 기본 DB → SQLite 사용
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
     "sqlite:///./dongne_saenghwal.db"   # 기본 SQLite 파일
 )
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL") or DATABASE_URL
+READ_STICKY_S = float(os.getenv("READ_STICKY_S", "5"))
+STICKY_COOKIE = "db_rw"
 
-# SQLite 전용 옵션 (Thread 문제 방지)
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args=connect_args,
-    pool_pre_ping=True,
-)
+def _create_engine(url: str):
+    # SQLite 전용 옵션 (Thread 문제 방지)
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    return create_engine(
+        url,
+        connect_args=connect_args,
+        pool_pre_ping=True,
+    )
+
+
+engine = _create_engine(DATABASE_URL)
+read_engine = _create_engine(READ_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
+
+
+# ------------------------------------------------------------
+# read-your-writes
+# ------------------------------------------------------------
+# 요청마다 dict 하나 — threadpool 스레드는 context 복사본을 쓰지만 같은 dict 를 가리킴
+_request_state: ContextVar[Optional[dict]] = ContextVar("dongnelink_db_request", default=None)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_write(session, flush_context):
+    state = _request_state.get()
+    if state is not None:
+        state["wrote"] = True
+
+
+def wrote_in_request() -> bool:
+    state = _request_state.get()
+    return bool(state and state.get("wrote"))
+
+
+def read_session(sticky_until: Optional[str]) -> Session:
+    # sticky_until : 쿠키 값 (쓰기 후 만료 시각)
+    if wrote_in_request():
+        return SessionLocal()
+    try:
+        if sticky_until and float(sticky_until) > time.time():
+            return SessionLocal()
+    except ValueError:
+        pass
+    return ReadSessionLocal()
+
+
+class ReadYourWritesMiddleware:
+    # 쓰기 엔진에서 flush 가 있었던 요청 → 응답에 sticky 쿠키
+    def __init__(self, app, sticky_s: float = READ_STICKY_S):
+        self.app = app
+        self.sticky_s = sticky_s
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.sticky_s <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        state: dict = {}
+        token = _request_state.set(state)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and state.get("wrote"):
+                until = time.time() + self.sticky_s
+                cookie = (
+                    f"{STICKY_COOKIE}={until:.1f}; Max-Age={int(self.sticky_s) or 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_state.reset(token)
@@ -0,0 +1,187 @@
+# feed.py
+# ------------------------------------------------------------
+# 동네생활 실시간 피드 (Server-Sent Events)
+#
+#   (sido, sigungu, dong) 마다 구독자 집합 하나 — 새 글/리뷰를 그 동네 구독자에게만
+#
+#   - 구독자 1명 = 크기 제한 asyncio.Queue 하나 + 대기 중인 코루틴 하나
+#       (스레드/소켓 poll 없음 → 조용한 구독자는 거의 비용이 없음)
+#   - 이벤트는 SSE 바이트로 한 번만 직렬화해서 모든 구독자 큐에 같은 객체로
+#   - 큐가 가득 찬(느린) 구독자는 끊음 → 브라우저 EventSource 가 재접속하면서
+#     Last-Event-ID 이후를 동네별 최근 이벤트 버퍼에서 다시 받음
+#     (버퍼에 없을 만큼 늦었거나 다른 프로세스의 id 면 "reset" → 페이지 새로고침)
+#   - 이벤트 id = "<프로세스 epoch>-<번호>"
+#   - publish 는 어느 스레드에서 불러도 됨 (threadpool 의 sync 라우트, bus 스레드)
+#   - 스트림이 끝나는 경우 : close() 가 넣는 종료 신호(_CLOSE) / heartbeat 마다 확인하는
+#     연결 끊김 / 최대 유지 시간(max_age_s) — 끝나면 브라우저가 Last-Event-ID 로 재접속
+#   - uvicorn 은 열린 연결이 다 끝나야 lifespan 종료로 넘어감 → 종료가 오래 걸리지 않게
+#     스트림은 max_age_s 마다 끊기고, 그보다 빨리 내리려면 --timeout-graceful-shutdown 사용
+#     (시간이 지나 uvicorn 이 남은 스트림을 cancel 하면 lifespan 종료의 close() 가 정리)
+# ------------------------------------------------------------
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from metrics import FEED_DROPPED, FEED_EVENTS, FEED_SUBSCRIBERS
+
+Topic = tuple[str, str, str]
+
+_CLOSE = object()      # 구독 종료 신호
+
+
+def format_event(event_id: str, kind: str, data: dict) -> bytes:
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {kind}\ndata: {body}\n\n".encode("utf-8")
+
+
+class Subscriber:
+    __slots__ = ("topic", "queue", "dropped")
+
+    def __init__(self, topic: Topic, queue_size: int):
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.dropped = False
+
+
+class FeedHub:
+    def __init__(
+        self, queue_size: int = 64, backlog: int = 100, heartbeat_s: float = 20.0, max_age_s: float = 300.0
+    ):
+        self.queue_size = queue_size
+        self.backlog = backlog
+        self.heartbeat = heartbeat_s
+        self.max_age = max_age_s
+        self.topics: dict[Topic, set[Subscriber]] = {}
+        self.recent: dict[Topic, deque] = {}      # topic → (번호, bytes) 최근 N개
+        self.evicted: dict[Topic, int] = {}       # topic → 버퍼에서 밀려난 마지막 번호
+        self.epoch = f"{int(time.time()):x}{os.getpid():x}"
+        self.last_id = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    # --------------------------------------------------------
+    # 발행 (아무 스레드)
+    # --------------------------------------------------------
+    def publish(self, topic: Topic, kind: str, data: dict):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return      # 기동 전 (journal replay 등) — 보낼 곳 없음
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fanout(topic, kind, data)
+        else:
+            loop.call_soon_threadsafe(self._fanout, topic, kind, data)
+
+    def _fanout(self, topic: Topic, kind: str, data: dict):
+        # 이벤트 루프 스레드에서만 실행 → id 발급/버퍼/구독자 집합에 lock 불필요
+        self.last_id += 1
+        payload = format_event(f"{self.epoch}-{self.last_id}", kind, data)
+        recent = self.recent.get(topic)
+        if recent is None:
+            recent = self.recent[topic] = deque(maxlen=self.backlog)
+        elif len(recent) == recent.maxlen:
+            self.evicted[topic] = recent[0][0]
+        recent.append((self.last_id, payload))
+        FEED_EVENTS.inc(kind)
+
+        subscribers = self.topics.get(topic)
+        if not subscribers:
+            return
+        for sub in list(subscribers):
+            try:
+                sub.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                self._drop(sub)
+
+    def _drop(self, sub: Subscriber):
+        sub.dropped = True
+        self._remove(sub)
+        FEED_DROPPED.inc()
+
+    # --------------------------------------------------------
+    # 구독 (이벤트 루프)
+    # --------------------------------------------------------
+    def subscribe(self, topic: Topic) -> Subscriber:
+        sub = Subscriber(topic, self.queue_size)
+        self.topics.setdefault(topic, set()).add(sub)
+        FEED_SUBSCRIBERS.inc()
+        return sub
+
+    def _remove(self, sub: Subscriber):
+        subscribers = self.topics.get(sub.topic)
+        if subscribers and sub in subscribers:
+            subscribers.discard(sub)
+            FEED_SUBSCRIBERS.dec()
+            if not subscribers:
+                del self.topics[sub.topic]
+
+    def missed(self, topic: Topic, last_event_id: Optional[str]) -> Optional[list[bytes]]:
+        # 재접속 시 놓친 이벤트 — 알 수 없으면 None (전체 새로고침 필요)
+        if not last_event_id:
+            return []
+        epoch, _, n = last_event_id.partition("-")
+        if epoch != self.epoch or not n.isdigit():
+            return None     # 다른 프로세스(재시작/다른 worker)가 준 id
+        last = int(n)
+        if last < self.evicted.get(topic, 0):
+            return None
+        return [payload for i, payload in self.recent.get(topic, ()) if i > last]
+
+    async def stream(
+        self,
+        topic: Topic,
+        last_event_id: Optional[str] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[bytes]:
+        # 구독 등록과 놓친 이벤트 계산 사이에 await 가 없어야 중복/누락이 없음
+        sub = self.subscribe(topic)
+        missed = self.missed(topic, last_event_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_age
+        try:
+            yield b"retry: 3000\n\n"
+            if missed is None:
+                yield format_event(f"{self.epoch}-{self.last_id}", "reset", {})
+            else:
+                for payload in missed:
+                    yield payload
+
+            while True:
+                left = deadline - loop.time()
+                if left <= 0:
+                    return      # 최대 유지 시간 — 재접속하면 놓친 것부터 다시 받음
+                try:
+                    payload = await asyncio.wait_for(sub.queue.get(), min(self.heartbeat, left))
+                except asyncio.TimeoutError:
+                    if sub.dropped or loop.time() >= deadline:
+                        return
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    yield b": ping\n\n"     # 프록시 idle timeout 방지
+                    continue
+                if payload is _CLOSE:
+                    return
+                yield payload
+                if sub.dropped and sub.queue.empty():
+                    return      # 밀린 것까지 보내고 끊음 → 클라이언트가 Last-Event-ID 로 재접속
+        finally:
+            self._remove(sub)
+
+    def close(self):
+        # 종료 시 열린 스트림 모두 끝내기 (이벤트 루프에서 호출)
+        for subscribers in list(self.topics.values()):
+            for sub in list(subscribers):
+                self._remove(sub)
+                try:
+                    sub.queue.put_nowait(_CLOSE)
+                except asyncio.QueueFull:
+                    sub.dropped = True
+        self._loop = None
@@ -1,7 +1,36 @@
+# generate_locations_capital.py
+# ------------------------------------------------------------
+# 행정동 데이터 컴파일러 (빌드 스텝)
+#   입력 : 전국 행정동 목록 (CSV / flat JSON / 중첩 JSON) 또는 아래 내장 목록
+#   출력 : data/locations.snapshot.json (검증 + 중복 제거 + 정렬 + 정수 id + 버전 해시)
+#          입력이 JSON 파일 하나면 그 파일의 해시도 기록 → 기동 시 원본이 바뀌었는지 확인
+#
+#   사용법:
+#     python generate_locations_capital.py                      # data/locations_capital.json
+#     python generate_locations_capital.py -i 행정동코드.csv --encoding cp949
+#     python generate_locations_capital.py -i 전국.csv --sido 서울특별시 --sido 경기도
+#     python generate_locations_capital.py --builtin
+# ------------------------------------------------------------
+import argparse
+import csv
 import json
+import sys
+from pathlib import Path
 
-OUTPUT_FILE = "locations_full.json"
+from locations import LocationError, compile_snapshot, normalize_row, source_info, write_snapshot
 
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_INPUT = BASE_DIR / "data" / "locations_capital.json"
+OUTPUT_FILE = BASE_DIR / "data" / "locations.snapshot.json"
+
+# CSV 헤더 후보 (행정표준코드 / 직접 작성 파일)
+CSV_COLUMNS = {
+    "sido": ("시도명", "sido", "시도"),
+    "sigungu": ("시군구명", "sigungu", "시군구"),
+    "dong": ("읍면동명", "행정동명", "dong", "읍면동"),
+}
+
+# 내장 목록 (--builtin)
 locations = {
     "서울특별시": {
         "강남구": ["개포동", "논현동", "대치동", "도곡동", "삼성동", "세곡동", "신사동",
@@ -48,10 +77,121 @@ locations = {
     }
 }
 
-def save_json():
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(locations, f, ensure_ascii=False, indent=2)
-    print(f"행정동 JSON 생성 완료 → {OUTPUT_FILE}")
+
+def iter_builtin():
+    for sido, sigungus in locations.items():
+        for sigungu, dongs in sigungus.items():
+            for dong in dongs:
+                yield sido, sigungu, dong
+
+
+def iter_json(path: Path, encoding: str):
+    with open(path, encoding=encoding) as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        # 중첩 형식 {sido: {sigungu: [dong, ...]}}
+        for sido, sigungus in data.items():
+            for sigungu, dongs in sigungus.items():
+                for dong in dongs:
+                    yield sido, sigungu, dong
+    else:
+        # flat 형식 [{sido, sigungu, dong}, ...]
+        for r in data:
+            yield r.get("sido"), r.get("sigungu"), r.get("dong")
+
+
+def iter_csv(path: Path, encoding: str):
+    with open(path, encoding=encoding, newline="") as f:
+        reader = csv.DictReader(f)
+        header = reader.fieldnames or []
+
+        columns = {}
+        for key, candidates in CSV_COLUMNS.items():
+            found = next((c for c in candidates if c in header), None)
+            if not found:
+                raise SystemExit(f"{path}: '{key}' 컬럼을 찾을 수 없습니다. (헤더: {header})")
+            columns[key] = found
+
+        for r in reader:
+            yield r[columns["sido"]], r[columns["sigungu"]], r[columns["dong"]]
+
+
+def iter_source(path: Path, encoding: str):
+    if path.suffix.lower() == ".csv":
+        return iter_csv(path, encoding)
+    return iter_json(path, encoding)
+
+
+def collect(sources, sido_filter, skip_invalid):
+    rows = []
+    errors = []
+    skipped = 0
+
+    for raw in sources:
+        sido, sigungu, dong = (v.strip() if isinstance(v, str) else v for v in raw)
+
+        # 시/도, 시/군/구 단위 행 (동 없음) → 건너뜀
+        if not dong:
+            skipped += 1
+            continue
+        # 세종특별자치시처럼 시/군/구가 없는 경우
+        if not sigungu:
+            sigungu = sido
+
+        try:
+            row = normalize_row(sido, sigungu, dong)
+        except LocationError as e:
+            errors.append(str(e))
+            continue
+
+        if sido_filter and row[0] not in sido_filter:
+            continue
+        rows.append(row)
+
+    if errors:
+        for e in errors[:20]:
+            print(f"  ✗ {e}", file=sys.stderr)
+        if len(errors) > 20:
+            print(f"  ... 외 {len(errors) - 20}건", file=sys.stderr)
+        if not skip_invalid:
+            raise SystemExit(f"검증 실패 {len(errors)}건 (--skip-invalid 로 무시 가능)")
+
+    return rows, skipped, len(errors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="행정동 스냅샷 컴파일러")
+    parser.add_argument("-i", "--input", action="append", type=Path, help="입력 파일 (CSV/JSON, 여러 개 가능)")
+    parser.add_argument("-o", "--output", type=Path, default=OUTPUT_FILE)
+    parser.add_argument("--encoding", default="utf-8", help="입력 인코딩 (공공데이터 CSV 는 보통 cp949)")
+    parser.add_argument("--sido", action="append", help="포함할 시/도 (기본: 전체)")
+    parser.add_argument("--builtin", action="store_true", help="내장 목록 사용")
+    parser.add_argument("--skip-invalid", action="store_true", help="검증 실패 행을 건너뜀")
+    args = parser.parse_args(argv)
+
+    if args.builtin:
+        sources = iter_builtin()
+    else:
+        inputs = args.input or [DEFAULT_INPUT]
+        sources = (row for path in inputs for row in iter_source(path, args.encoding))
+
+    rows, skipped, invalid = collect(sources, set(args.sido or ()), args.skip_invalid)
+    if not rows:
+        raise SystemExit("컴파일할 행정동이 없습니다.")
+
+    snapshot = compile_snapshot(rows)
+    if not args.builtin and len(inputs) == 1 and inputs[0].suffix.lower() == ".json":
+        snapshot["source"] = source_info(inputs[0])
+    write_snapshot(snapshot, args.output)
+
+    print(
+        f"행정동 스냅샷 생성 완료 → {args.output} "
+        f"(version {snapshot['version']}: 시/도 {len(snapshot['sido'])}, "
+        f"시/군/구 {len(snapshot['sigungu'])}, 동 {len(snapshot['dong'])}, "
+        f"중복 {len(rows) - len(snapshot['dong'])}, 건너뜀 {skipped}, 오류 {invalid})"
+    )
+
 
 if __name__ == "__main__":
-    save_json()
+    main()
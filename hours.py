@@ -0,0 +1,210 @@
+# hours.py
+# ------------------------------------------------------------
+# 영업시간 문자열 → 주간 분(minute) 구간
+#
+#   hours_mon ~ hours_sun / off_day 는 자유 입력 문자열이라
+#   등록/수정 시점에 한 번만 파싱해 b["hours_week"] 에 저장함
+#
+#   hours_week : [[start, end], ...]  (월요일 00:00 = 0, 일주일 = 10080분)
+#                정렬 + 병합된 반열린 구간 [start, end)
+#   None       : 영업시간 정보 없음 / 해석 불가 → "영업중" 필터에 걸리지 않음
+# ------------------------------------------------------------
+import bisect
+import re
+from datetime import datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+KST = ZoneInfo("Asia/Seoul")
+
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+DAY_FIELDS = ("hours_mon", "hours_tue", "hours_wed", "hours_thu", "hours_fri", "hours_sat", "hours_sun")
+DAY_NAMES = "월화수목금토일"
+
+CLOSED_WORDS = ("휴무", "휴일", "쉼", "쉽니다", "closed", "정기휴무")
+NO_OFF_WORDS = ("연중무휴", "무휴", "없음")
+
+# 09:00 / 9:00 / 9시 / 9시30분 / 오후 9시 / 새벽 2시 / 익일 02:00 / 21시
+_TIME = (
+    r"(?:(?:익일|다음\s*날)\s*)?(?:(오전|오후|새벽|아침|낮|저녁|밤)\s*)?"
+    r"(\d{1,2})\s*(?::\s*(\d{2})|시\s*(?:(\d{1,2})\s*분?|(반))?)"
+)
+_RANGE_RE = re.compile(_TIME + r"\s*(?:-|~|–|부터)\s*" + _TIME)
+# 24시간 / 24시 / 24h / 종일 — 범위("9시~24시")가 없을 때만, 숫자 중간이 아닌 곳에서
+_ALL_DAY_RE = re.compile(r"(?<![\d:])24\s*(?:시간?|h)|종일")
+AM_WORDS = ("오전", "새벽", "아침")     # 12시 = 0시
+PM_WORDS = ("오후", "낮", "저녁")       # 1~11시 = 13~23시
+# 월 / 월요일 / 월,화 / 토일 — "요일" 까지 한 토큰으로 먹어서 "요일" 의 "일" 이 일요일로 잡히지 않게
+_OFF_DAY_RE = re.compile(r"([월화수목금토일])(요일)?")
+
+
+def _to_minutes(ampm, hour, minute, minute_ko, half) -> Optional[int]:
+    h = int(hour)
+    if minute is not None:
+        m = int(minute)
+    elif minute_ko is not None:
+        m = int(minute_ko)
+    else:
+        m = 30 if half else 0
+    if ampm in PM_WORDS and h < 12:
+        h += 12
+    elif ampm in AM_WORDS and h == 12:
+        h = 0
+    elif ampm == "밤":
+        # 밤 9시 = 21시 / 밤 12시 = 0시 / 밤 1~5시 = 새벽
+        if 6 <= h < 12:
+            h += 12
+        elif h == 12:
+            h = 0
+    if h > 24 or m > 59 or (h == 24 and m):
+        return None
+    return h * 60 + m
+
+
+def parse_day_hours(text: Optional[str]) -> Optional[list[tuple[int, int]]]:
+    # 하루 영업시간 → 그날 0시 기준 분 구간 (자정 넘기면 end > 1440)
+    if text is None:
+        return None
+    t = text.strip().lower()
+    if not t:
+        return None
+    if any(w in t for w in CLOSED_WORDS):
+        return []
+
+    ranges = []
+    for m in _RANGE_RE.finditer(t):
+        g = m.groups()
+        start = _to_minutes(*g[:5])
+        end = _to_minutes(*g[5:])
+        if start is None or end is None:
+            continue
+        if end <= start:
+            end += DAY_MINUTES      # 자정 넘김 (예: 18:00~02:00)
+        ranges.append((start, end))
+
+    if not ranges and _ALL_DAY_RE.search(t):
+        return [(0, DAY_MINUTES)]
+    return ranges or None
+
+
+def parse_off_days(text: Optional[str]) -> set[int]:
+    if not text:
+        return set()
+    t = text.strip()
+    if any(w in t for w in NO_OFF_WORDS):
+        return set()
+    if "주말" in t:
+        return {5, 6}
+    days = set()
+    for m in _OFF_DAY_RE.finditer(t):
+        # "요일" 없는 한 글자는 단독이거나 요일 나열("토,일" "토일")일 때만
+        #   (휴일/매일/매월/15일/3월 의 일·월은 요일이 아님)
+        if not m.group(2):
+            prev = t[m.start() - 1] if m.start() else ""
+            if prev.isdigit() or ("가" <= prev <= "힣" and prev not in DAY_NAMES):
+                continue
+        days.add(DAY_NAMES.index(m.group(1)))
+    return days
+
+
+def _merge(intervals):
+    merged = []
+    for s, e in sorted(intervals):
+        if merged and s <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], e)
+        else:
+            merged.append([s, e])
+    return merged
+
+
+def compile_week(b: dict) -> Optional[list[list[int]]]:
+    off = parse_off_days(b.get("off_day"))
+    intervals = []
+    known = False
+
+    for day, field in enumerate(DAY_FIELDS):
+        ranges = parse_day_hours(b.get(field))
+        if ranges is None:
+            continue
+        known = True
+        if day in off:
+            continue
+        base = day * DAY_MINUTES
+        for s, e in ranges:
+            s, e = base + s, base + e
+            if e > WEEK_MINUTES:
+                # 일요일 밤 → 월요일 새벽
+                intervals.append((s, WEEK_MINUTES))
+                intervals.append((0, e - WEEK_MINUTES))
+            else:
+                intervals.append((s, e))
+
+    if not known:
+        return None
+    return _merge(intervals)
+
+
+def is_open(week: Optional[list], minute: int) -> bool:
+    if not week:
+        return False
+    i = bisect.bisect_right(week, [minute, WEEK_MINUTES + 1]) - 1
+    return i >= 0 and week[i][0] <= minute < week[i][1]
+
+
+def minute_of_week(dt: datetime) -> int:
+    return dt.weekday() * DAY_MINUTES + dt.hour * 60 + dt.minute
+
+
+def now_minute() -> int:
+    return minute_of_week(datetime.now(KST))
+
+
+def parse_clock(text: str, day: Optional[int] = None) -> Optional[int]:
+    # "23:00" (+ 요일 0=월 ... 6=일, 기본 오늘) → 주간 분
+    m = re.fullmatch(r"\s*(\d{1,2}):(\d{2})\s*", text or "")
+    if not m:
+        return None
+    h, mm = int(m.group(1)), int(m.group(2))
+    if h > 23 or mm > 59:
+        return None
+    if day is None:
+        day = datetime.now(KST).weekday()
+    return day * DAY_MINUTES + h * 60 + mm
+
+
+if __name__ == "__main__":
+    # python hours.py — 영업시간 / 휴무일 해석 확인
+    for text, expected in [
+        ("09:00~21:00", [(540, 1260)]),
+        ("오전 9시~24시", [(540, 1440)]),
+        ("9시~24시", [(540, 1440)]),
+        ("24시간", [(0, 1440)]),
+        ("24시 영업", [(0, 1440)]),
+        ("오후 6시 ~ 새벽 2시", [(1080, 1560)]),
+        ("저녁 6시~익일 02:00", [(1080, 1560)]),
+        ("오후 5시~밤 12시", [(1020, 1440)]),
+        ("밤 9시~새벽 3시", [(1260, 1620)]),
+        ("정기휴무", []),
+        ("문의", None),
+    ]:
+        got = parse_day_hours(text)
+        assert got == expected, (text, got, expected)
+
+    for text, expected in [
+        ("월요일", {0}),
+        ("매주 화요일 휴무", {1}),
+        ("일요일", {6}),
+        ("토,일", {5, 6}),
+        ("토일 휴무", {5, 6}),
+        ("월 화", {0, 1}),
+        ("주말", {5, 6}),
+        ("공휴일", set()),
+        ("매월 15일", set()),
+        ("매일", set()),
+        ("연중무휴", set()),
+    ]:
+        got = parse_off_days(text)
+        assert got == expected, (text, got, expected)
+    print("ok")
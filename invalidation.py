@@ -0,0 +1,193 @@
+# invalidation.py
+# ------------------------------------------------------------
+# worker 간 변경 전파 (invalidation bus)
+#
+#   uvicorn --workers N 이면 worker 마다 인메모리 저장소/인덱스/캐시가 따로 있음
+#   → 한 worker 가 처리한 변경(mutate)을 버전 붙은 이벤트로 다른 worker 에 방송
+#   → 받은 쪽은 같은 apply_mutation 으로 자기 구조만 증분 갱신 (TTL 없음)
+#
+#   backend (DONGNE_BUS)
+#     - local  : 단일 프로세스 — 방송할 곳이 없음 (기본)
+#     - sqlite : 같은 호스트의 worker 들이 SQLite 파일 하나를 공유
+#                publish = INSERT (version = AUTOINCREMENT → 전체 순서)
+#                구독    = 백그라운드 스레드가 poll_interval 마다 version > 마지막 조회
+#                외부 서비스 없이 동작, WAL 모드라 읽기/쓰기가 서로 막지 않음
+#
+#   업소 id / 글 id 도 worker 끼리 겹치지 않게 bus 에서 발급 (next_id)
+# ------------------------------------------------------------
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Optional
+
+from metrics import BUS_EVENTS, BUS_LAG
+
+logger = logging.getLogger("dongnelink.bus")
+
+# (op, data, version) → None
+Handler = Callable[[str, dict, int], None]
+# version → None : 이 worker 가 publish 한 이벤트가 poll 순서에 도달함 (반영은 publish 때 이미 함)
+OwnHandler = Callable[[int], None]
+
+
+class LocalBus:
+    name = "local"
+
+    def __init__(self):
+        self.version = 0
+
+    def start(self, handler: Handler, since: int = 0, on_own: Optional[OwnHandler] = None):
+        self.version = since
+
+    def publish(self, op: str, data: dict) -> Optional[int]:
+        return None
+
+    def next_id(self, name: str, floor: int, count: int = 1) -> Optional[int]:
+        return None
+
+    def close(self):
+        pass
+
+
+class SQLiteBus:
+    name = "sqlite"
+
+    def __init__(self, path: Path, poll_interval_ms: float = 100.0, retention_s: float = 24 * 3600):
+        self.path = Path(path)
+        self.poll_interval = poll_interval_ms / 1000
+        self.retention = retention_s
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.version = 0                      # 마지막으로 반영한 이벤트 version
+        self._write_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._handler: Optional[Handler] = None
+        self._on_own: Optional[OwnHandler] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_prune = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start(self, handler: Handler, since: int = 0, on_own: Optional[OwnHandler] = None):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = self._connect()
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                version INTEGER PRIMARY KEY AUTOINCREMENT,
+                origin  TEXT NOT NULL,
+                op      TEXT NOT NULL,
+                data    TEXT NOT NULL,
+                created REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sequences (
+                name  TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+        self._handler = handler
+        self._on_own = on_own
+        self.version = since
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dongnelink-bus", daemon=True)
+        self._thread.start()
+
+    def publish(self, op: str, data: dict) -> Optional[int]:
+        if self._conn is None:
+            return None
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        with self._write_lock:
+            cur = self._conn.execute(
+                "INSERT INTO events (origin, op, data, created) VALUES (?, ?, ?, ?)",
+                (self.origin, op, body, time.time()),
+            )
+        BUS_EVENTS.inc("out", op)
+        return cur.lastrowid
+
+    def next_id(self, name: str, floor: int, count: int = 1) -> Optional[int]:
+        # 모든 worker 가 공유하는 번호표 — floor 는 이 worker 가 아는 다음 번호
+        # count > 1 이면 연속된 count 개를 한 번에 예약하고 첫 번호를 돌려줌 (대량 등록)
+        if self._conn is None:
+            return None
+        with self._write_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO sequences (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = MAX(value + ?, excluded.value)",
+                    (name, floor + count - 1, count),
+                )
+                (value,) = self._conn.execute(
+                    "SELECT value FROM sequences WHERE name = ?", (name,)
+                ).fetchone()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return value - count + 1
+
+    def _run(self):
+        conn = self._connect()      # 읽기 전용 연결 (스레드 전용)
+        try:
+            while not self._stop.wait(self.poll_interval):
+                try:
+                    self.poll(conn)
+                    self._prune()
+                except Exception:
+                    logger.exception("bus 이벤트 처리 실패")
+        finally:
+            conn.close()
+
+    def poll(self, conn: sqlite3.Connection) -> int:
+        rows = conn.execute(
+            "SELECT version, origin, op, data, created FROM events "
+            "WHERE version > ? ORDER BY version LIMIT 1000",
+            (self.version,),
+        ).fetchall()
+        now = time.time()
+        for version, origin, op, data, created in rows:
+            if origin != self.origin:
+                self._handler(op, json.loads(data), version)
+                BUS_EVENTS.inc("in", op)
+                BUS_LAG.observe(max(now - created, 0.0))
+            elif self._on_own is not None:
+                self._on_own(version)
+            self.version = version
+        return len(rows)
+
+    def _prune(self):
+        # 오래된 이벤트 정리 — 재기동 catch-up 은 retention 안에서만 가능
+        now = time.monotonic()
+        if now - self._last_prune < 60:
+            return
+        self._last_prune = now
+        with self._write_lock:
+            self._conn.execute("DELETE FROM events WHERE created < ?", (time.time() - self.retention,))
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def create_bus(kind: str, path: Path, poll_interval_ms: float = 100.0):
+    if kind == "local":
+        return LocalBus()
+    if kind == "sqlite":
+        return SQLiteBus(path, poll_interval_ms=poll_interval_ms)
+    raise ValueError(f"알 수 없는 DONGNE_BUS: {kind}")
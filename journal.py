@@ -0,0 +1,293 @@
+# journal.py
+# ------------------------------------------------------------
+# 인메모리 저장소(BUSINESSES / REVIEWS / NEWS_POSTS) 영속화
+#
+#   - 변경 1건 = journal 한 줄 (JSONL, {"seq", "op", "data"})
+#       append 는 파일에 바로 write (프로세스가 죽어도 OS 캐시에 남음)
+#       fsync 는 백그라운드 스레드가 fsync_interval 마다 모아서 한 번
+#       (fsync_interval_ms=0 이면 매 기록마다 fsync)
+#   - snapshot : 전체 상태 + 마지막 seq 를 한 파일로 (tmp → fsync → rename)
+#       기록 N건 또는 N초마다, 그리고 정상 종료 시
+#       snapshot 이 끝나면 그 이전 journal 세그먼트는 삭제
+#   - 기동 : snapshot 로드 → 그 이후 seq 만 replay
+#       → 기동 시간은 전체 이력이 아니라 snapshot 크기 + 마지막 구간에 비례
+#
+#   읽기는 계속 메모리에서만 — 디스크는 쓰기 경로에만 있음
+#   상태 변경과 append 는 같은 lock 안에서 (snapshot 과 순서가 섞이지 않게)
+#   lock 순서는 항상 lock → _io_lock (append 의 fsync 도, snapshot 의 세그먼트 교체도)
+#   snapshot 은 lock 안에서 상태 복사본만 받고 직렬화/쓰기는 lock 밖에서
+#     → state_fn 은 이후 변경과 섞이지 않는 복사본을 돌려줘야 함
+#
+#   worker 가 여럿이면 디렉터리 lock(flock)을 잡은 worker 하나만 기록
+#   (bus 로 받은 다른 worker 의 변경도 함께 기록 → journal 은 항상 전체 이력)
+#   나머지 worker 는 기동 시 읽기만 하고, 이후 변경은 bus 로 받음
+#   (bus 가 local 이면 받을 방법이 없으므로 main.open_store 에서 기동 실패)
+# ------------------------------------------------------------
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from metrics import JOURNAL_APPENDS, JOURNAL_FSYNC, SNAPSHOT_WRITE
+
+try:
+    import fcntl
+except ImportError:     # Windows — 디렉터리 lock 없이 단일 프로세스 전제
+    fcntl = None
+
+logger = logging.getLogger("dongnelink.journal")
+
+SNAPSHOT_FILE = "snapshot.json"
+LOCK_FILE = "journal.lock"
+SEGMENT_PREFIX = "journal-"
+SEGMENT_SUFFIX = ".jsonl"
+FORMAT = 1
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _fsync_dir(path: Path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    def __init__(
+        self,
+        directory: Optional[Path],
+        fsync_interval_ms: float = 20.0,
+        snapshot_every: int = 10000,
+        snapshot_interval_s: float = 600.0,
+    ):
+        self.dir = Path(directory) if directory else None    # None = 영속화 끔
+        self.fsync_interval = fsync_interval_ms / 1000
+        self.snapshot_every = snapshot_every
+        self.snapshot_interval = snapshot_interval_s
+
+        # 상태 변경 + append 를 묶는 lock (호출하는 쪽에서 with journal.lock:)
+        self.lock = threading.RLock()
+        self._io_lock = threading.Lock()       # fsync / 세그먼트 교체
+        self.seq = 0
+        self.snapshot_seq = 0
+        self._file = None
+        self._lock_file = None
+        self._dirty = False
+        self._last_snapshot = time.monotonic()
+        self._state_fn: Optional[Callable[[], dict]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.dir is not None
+
+    # --------------------------------------------------------
+    # 기동 / 종료
+    # --------------------------------------------------------
+    def open(
+        self,
+        state_fn: Callable[[], dict],
+        load_fn: Callable[[dict], None],
+        apply_fn: Callable[[str, dict, Optional[int]], None],
+    ) -> dict:
+        self._state_fn = state_fn
+        stats = {"snapshot_seq": 0, "replayed": 0, "owner": False}
+        if not self.enabled:
+            return stats
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        owner = stats["owner"] = self._acquire_dir()
+        with self.lock:
+            snap = self.dir / SNAPSHOT_FILE
+            if snap.exists():
+                with open(snap, "rb") as f:
+                    doc = json.load(f)
+                if doc.get("format") != FORMAT:
+                    raise RuntimeError(f"지원하지 않는 snapshot 형식: {doc.get('format')}")
+                load_fn(doc["state"])
+                self.seq = self.snapshot_seq = doc["seq"]
+                stats["snapshot_seq"] = self.seq
+
+            segments = self._segments()
+            for i, (_, path) in enumerate(segments):
+                last = owner and i == len(segments) - 1
+                for seq, op, data, version in self._read_segment(path, truncate_torn=last):
+                    if seq <= self.seq:
+                        continue
+                    apply_fn(op, data, version)
+                    self.seq = seq
+                    stats["replayed"] += 1
+
+            if not owner:
+                logger.warning("%s: 다른 worker 가 기록 중 — 이 worker 는 읽기만 함", self.dir)
+                return stats
+            self._file = self._new_segment()
+
+        self._last_snapshot = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dongnelink-journal", daemon=True)
+        self._thread.start()
+        return stats
+
+    def close(self, snapshot: bool = True):
+        if not self.enabled or self._file is None:
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if snapshot and self.seq != self.snapshot_seq:
+            self.snapshot()
+        self._sync()
+        with self._io_lock:
+            self._file.close()
+            self._file = None
+        if self._lock_file is not None:
+            self._lock_file.close()     # flock 해제
+            self._lock_file = None
+
+    def _acquire_dir(self) -> bool:
+        if fcntl is None:
+            return True
+        f = open(self.dir / LOCK_FILE, "a")
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._lock_file = f
+        return True
+
+    # --------------------------------------------------------
+    # 기록
+    # --------------------------------------------------------
+    def append(self, op: str, data: dict, version: Optional[int] = None):
+        # version : bus 이벤트 version (local bus 면 None)
+        if self._file is None:
+            return
+        entry = {"seq": 0, "op": op, "data": data}
+        if version is not None:
+            entry["v"] = version
+        with self.lock:
+            self.seq += 1
+            entry["seq"] = self.seq
+            self._file.write(_dumps(entry) + b"\n")
+            self._dirty = True
+        JOURNAL_APPENDS.inc(op)
+        if self.fsync_interval <= 0:
+            self._sync()
+
+    def _sync(self):
+        with self._io_lock:
+            if not self._dirty or self._file is None:
+                return
+            self._dirty = False
+            t0 = time.perf_counter()
+            os.fsync(self._file.fileno())
+            JOURNAL_FSYNC.observe(time.perf_counter() - t0)
+
+    def _run(self):
+        while not self._stop.wait(self.fsync_interval or 0.05):
+            try:
+                self._sync()
+                if self._snapshot_due():
+                    self.snapshot()
+            except Exception:
+                logger.exception("journal 백그라운드 작업 실패")
+
+    def _snapshot_due(self) -> bool:
+        pending = self.seq - self.snapshot_seq
+        if not pending:
+            return False
+        return (
+            pending >= self.snapshot_every
+            or time.monotonic() - self._last_snapshot >= self.snapshot_interval
+        )
+
+    # --------------------------------------------------------
+    # snapshot
+    # --------------------------------------------------------
+    def snapshot(self):
+        if self._file is None or self._state_fn is None:    # 꺼짐 / 읽기 전용 worker
+            return
+        t0 = time.perf_counter()
+        with self.lock:
+            # 상태 복사 + 새 세그먼트로 교체를 한 번에 — 이후 기록은 새 세그먼트로
+            seq = self.seq
+            state = self._state_fn()
+            with self._io_lock:
+                old, self._file = self._file, self._new_segment()
+                self._dirty = False
+        if old is not None:
+            os.fsync(old.fileno())
+            old.close()
+        body = _dumps({"format": FORMAT, "seq": seq, "state": state})
+
+        snap = self.dir / SNAPSHOT_FILE
+        tmp = snap.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, snap)
+        _fsync_dir(self.dir)
+
+        # snapshot 에 포함된 세그먼트 정리 (현재 세그먼트는 seq+1 부터 시작)
+        for start, path in self._segments():
+            if start <= seq:
+                path.unlink(missing_ok=True)
+
+        self.snapshot_seq = seq
+        self._last_snapshot = time.monotonic()
+        elapsed = time.perf_counter() - t0
+        SNAPSHOT_WRITE.observe(elapsed)
+        logger.info("snapshot: seq=%d, %d bytes, %.1fms", seq, len(body), elapsed * 1000)
+
+    # --------------------------------------------------------
+    # 세그먼트 파일
+    # --------------------------------------------------------
+    def _new_segment(self):
+        path = self.dir / f"{SEGMENT_PREFIX}{self.seq + 1:012d}{SEGMENT_SUFFIX}"
+        f = open(path, "ab", buffering=0)
+        _fsync_dir(self.dir)
+        return f
+
+    def _segments(self) -> list[tuple[int, Path]]:
+        found = []
+        for path in self.dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+            start = path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+            if start.isdigit():
+                found.append((int(start), path))
+        return sorted(found)
+
+    @staticmethod
+    def _read_segment(path: Path, truncate_torn: bool):
+        good = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    entry = json.loads(line)
+                except ValueError:
+                    # 기록 도중 종료된 마지막 줄 — 그 앞까지만 유효
+                    logger.warning("%s: offset %d 이후 손상된 기록 무시", path.name, good)
+                    break
+                good += len(line)
+                yield entry["seq"], entry["op"], entry["data"], entry.get("v")
+        if truncate_torn and good != path.stat().st_size:
+            with open(path, "r+b") as f:
+                f.truncate(good)
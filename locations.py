@@ -0,0 +1,175 @@
+# locations.py
+# ------------------------------------------------------------
+# 행정동 스냅샷 (generate_locations_capital.py 가 컴파일)
+#
+#   data/locations.snapshot.json
+#   {
+#     "format": 1,
+#     "version": "<내용 해시>",
+#     "sido":    ["경기도", ...],                 # sido_id = 인덱스
+#     "sigungu": [[sido_id, "강남구"], ...],      # sigungu_id = 인덱스
+#     "dong":    [[sigungu_id, "개포동"], ...],    # dong_id = 인덱스
+#     "source":  {"file": "locations_capital.json", "sha256": "<원본 해시>"}   # 선택
+#   }
+#
+#   모든 목록은 정렬 + 중복 제거된 상태로 저장되므로
+#   기동 시에는 JSON 한 번 읽고 트리만 조립함 (정렬/검증 X)
+#   원본(data/locations_capital.json)만 고치고 컴파일을 잊은 경우 → "source" 해시가 달라짐
+#   → 경고를 남기고 원본에서 바로 컴파일해서 씀 (CSV 등 다른 입력으로 만든 스냅샷은 비교 X)
+# ------------------------------------------------------------
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("dongnelink.locations")
+
+SNAPSHOT_FORMAT = 1
+
+SIDO_SUFFIXES = ("특별시", "광역시", "특별자치시", "특별자치도", "도")
+DONG_SUFFIXES = ("동", "가", "읍", "면", "리", "로")
+
+
+class LocationError(ValueError):
+    pass
+
+
+# ------------------------------------------------------------
+# 컴파일 (빌드 스텝)
+# ------------------------------------------------------------
+def normalize_row(sido, sigungu, dong) -> tuple[str, str, str]:
+    sido = " ".join((sido or "").split())
+    sigungu = " ".join((sigungu or "").split())
+    dong = " ".join((dong or "").split())
+
+    if not sido or not sigungu or not dong:
+        raise LocationError(f"빈 값: {sido!r} / {sigungu!r} / {dong!r}")
+    if not sido.endswith(SIDO_SUFFIXES):
+        raise LocationError(f"잘못된 시/도 이름: {sido!r}")
+    if not dong.endswith(DONG_SUFFIXES) and not dong[-1].isdigit():
+        raise LocationError(f"잘못된 동 이름: {sido} {sigungu} {dong!r}")
+    return sido, sigungu, dong
+
+
+def compile_snapshot(rows) -> dict:
+    # rows: (sido, sigungu, dong) 튜플 iterable (normalize_row 통과한 값)
+    unique = sorted(set(rows))
+
+    sido_names = sorted({r[0] for r in unique})
+    sido_ids = {name: i for i, name in enumerate(sido_names)}
+
+    sigungu_keys = sorted({(r[0], r[1]) for r in unique}, key=lambda k: (sido_ids[k[0]], k[1]))
+    sigungu_ids = {key: i for i, key in enumerate(sigungu_keys)}
+
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "version": None,
+        "sido": sido_names,
+        "sigungu": [[sido_ids[s], g] for s, g in sigungu_keys],
+        "dong": [[sigungu_ids[(s, g)], d] for s, g, d in unique],
+    }
+
+    body = json.dumps(
+        [snapshot["sido"], snapshot["sigungu"], snapshot["dong"]],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    snapshot["version"] = hashlib.sha256(body.encode()).hexdigest()[:12]
+    return snapshot
+
+
+def source_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+
+
+def source_info(path: Path) -> dict:
+    return {"file": path.name, "sha256": source_digest(path)}
+
+
+def write_snapshot(snapshot: dict, path: Path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        f.write("\n")
+
+
+# ------------------------------------------------------------
+# 런타임 트리
+# ------------------------------------------------------------
+class LocationTree:
+    def __init__(self, snapshot: dict):
+        if snapshot.get("format") != SNAPSHOT_FORMAT:
+            raise LocationError(f"지원하지 않는 스냅샷 형식: {snapshot.get('format')}")
+
+        self.version: str = snapshot["version"]
+        self.sido: list[str] = snapshot["sido"]
+
+        sigungu = snapshot["sigungu"]
+        tree: dict[str, dict[str, list[str]]] = {s: {} for s in self.sido}
+        for sido_id, name in sigungu:
+            tree[self.sido[sido_id]][name] = []
+
+        # (sido, sigungu, dong) → dong_id
+        self.dong_ids: dict[tuple[str, str, str], int] = {}
+        for dong_id, (sigungu_id, name) in enumerate(snapshot["dong"]):
+            sido_id, sigungu_name = sigungu[sigungu_id]
+            sido_name = self.sido[sido_id]
+            tree[sido_name][sigungu_name].append(name)
+            self.dong_ids[(sido_name, sigungu_name, name)] = dong_id
+
+        # 읽기 전용 (동 목록은 이미 정렬된 상태)
+        self.tree: dict[str, dict[str, tuple[str, ...]]] = {
+            s: {g: tuple(dongs) for g, dongs in gs.items()} for s, gs in tree.items()
+        }
+
+    def __contains__(self, sido: str) -> bool:
+        return sido in self.tree
+
+    def sigungu_list(self, sido: str) -> list[str]:
+        return list(self.tree.get(sido, {}))
+
+    def dong_list(self, sido: str, sigungu: str) -> list[str]:
+        return list(self.tree.get(sido, {}).get(sigungu, ()))
+
+    def dong_id(self, sido: str, sigungu: str, dong: str):
+        return self.dong_ids.get((sido, sigungu, dong))
+
+    def __len__(self) -> int:
+        return len(self.dong_ids)
+
+
+def rows_from_flat_json(path: Path):
+    with open(path, encoding="utf-8") as f:
+        for r in json.load(f):
+            yield normalize_row(r["sido"], r["sigungu"], r["dong"])
+
+
+def stale_source(snapshot: dict, source: Path) -> Optional[str]:
+    # 스냅샷을 만든 원본이 source 인데 내용이 바뀌었으면 지금 원본의 해시
+    recorded = snapshot.get("source")
+    if not recorded or recorded.get("file") != source.name:
+        return None
+    try:
+        digest = source_digest(source)
+    except FileNotFoundError:
+        return None
+    return digest if digest != recorded.get("sha256") else None
+
+
+def load_location_tree(snapshot_path: Path, fallback_source: Path) -> LocationTree:
+    try:
+        with open(snapshot_path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        # 스냅샷이 없으면 (빌드 전) 원본에서 바로 컴파일
+        return LocationTree(compile_snapshot(rows_from_flat_json(fallback_source)))
+
+    digest = stale_source(snapshot, fallback_source)
+    if digest:
+        logger.warning(
+            "%s 이 스냅샷(%s)을 만든 뒤 바뀌었습니다 (%s → %s) — 원본에서 다시 컴파일해서 사용합니다. "
+            "python generate_locations_capital.py 로 스냅샷을 갱신하세요.",
+            fallback_source.name, snapshot_path.name, snapshot["source"].get("sha256"), digest,
+        )
+        return LocationTree(compile_snapshot(rows_from_flat_json(fallback_source)))
+    return LocationTree(snapshot)
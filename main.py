@@ -2,32 +2,62 @@
 #   동네링크(DongneLink) — MAIN.PY (회원 DB + 동네생활 글쓰기/이미지)
 # ================================================================
 
+import asyncio
 import hashlib
 import json
+import logging
 import os
+import time
 import uuid
 import shutil
+from contextlib import asynccontextmanager
 from pathlib import Path
-from collections import defaultdict
 from typing import Optional
 
 from fastapi import (
     FastAPI, Request, Form, Depends, HTTPException,
-    UploadFile, File
+    UploadFile, File, Query, Header
 )
-from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse
+from fastapi.responses import (
+    HTMLResponse, RedirectResponse, FileResponse, JSONResponse, PlainTextResponse,
+    Response, StreamingResponse,
+)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 
 import httpx
 
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from db import SessionLocal, engine, Base
+from db import (
+    DATABASE_URL, READ_DATABASE_URL, STICKY_COOKIE, Base, ReadYourWritesMiddleware, SessionLocal,
+    engine, read_engine, read_session,
+)
 from models import User, Provider
+from assets import AssetManifest, ImmutableStaticFiles, PrivatePageMiddleware
+from media import MediaFiles
+import bulk_io
+from counters import ViewCounters
+from feed import FeedHub
+from business_index import AMENITIES, AMENITY_LABELS, DEFAULT_SORT, SORTS, BusinessIndex
+from hours import compile_week, now_minute, parse_clock
+from invalidation import create_bus
+from journal import Journal
+from pricing import price_range
+from ratelimit import Policy, RateLimitMiddleware
+from scheduler import Scheduler
+from shards import Peers, ShardConfig, ShardUnavailable
+import schemas
+from ranking import ranking_score
+from locations import LocationTree, load_location_tree
+from metrics import (
+    METRICS_CONTENT_TYPE, REGISTRY, UPLOAD_GC_BYTES, MetricsMiddleware, SlowRequestProfiler,
+    TimedJinja2Templates, instrument_engine, scrape_authorized, timed,
+)
 
-# 🔥 DB 테이블 생성
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger("dongnelink")
 
 # ------------------------------------------------------------
 # 경로 설정
@@ -40,15 +70,127 @@ DATA_DIR = BASE_DIR / "data"
 UPLOAD_DIR = STATIC_DIR / "uploads"
 LIFESTYLE_UPLOAD_DIR = STATIC_DIR / "lifestyle"
 
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(LIFESTYLE_UPLOAD_DIR, exist_ok=True)
+
+# ------------------------------------------------------------
+# 기동 (lifespan) — import 시점에는 무거운 작업을 하지 않음
+# ------------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    timings: dict[str, float] = {}
+
+    def step(name, fn):
+        t0 = time.perf_counter()
+        fn()
+        timings[name] = (time.perf_counter() - t0) * 1000
+
+    # 🔥 DB 테이블 생성
+    step("db_schema", create_schema)
+    step("upload_dirs", ensure_upload_dirs)
+    step("locations", get_sido_list)
+    step("store", open_store)
+    step("view_counters", open_view_counters)
+
+    app.state.startup_timings = timings
+    logger.info(
+        "startup: %s (total %.1fms)",
+        ", ".join(f"{k}={v:.1f}ms" for k, v in timings.items()),
+        sum(timings.values()),
+    )
+    if not KAKAO_CLIENT_ID:
+        logger.warning("KAKAO_CLIENT_ID 가 설정되지 않았습니다.")
+
+    # replay 가 끝난 뒤부터 실시간 피드 발행
+    FEED.bind(asyncio.get_running_loop())
+    if JOBS_ENABLED:
+        SCHEDULER.start()
+
+    yield
+
+    # 정상 종료 — 열린 SSE 스트림을 먼저 끝내고, 마지막 snapshot 을 남김
+    FEED.close()
+    await SCHEDULER.close()
+    PEERS.close()
+    COUNTERS.close()
+    BUS.close()
+    STORE.close(snapshot=True)
+
+
+def create_schema():
+    Base.metadata.create_all(bind=engine)
+    # 로컬 SQLite 파일을 replica 대용으로 쓸 때만 — 실제 replica 는 primary 에서 복제됨
+    if READ_DATABASE_URL != DATABASE_URL and READ_DATABASE_URL.startswith("sqlite"):
+        Base.metadata.create_all(bind=read_engine)
+
+
+def ensure_upload_dirs():
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    os.makedirs(LIFESTYLE_UPLOAD_DIR, exist_ok=True)
+
 
 # ------------------------------------------------------------
 # FastAPI 설정
 # ------------------------------------------------------------
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+# 요청 제한 — 쓰기/인증 라우트만 (DONGNE_RATE_LIMIT=off 면 끔)
+#   분당 횟수/burst 는 IP 별, 로그인했으면 사용자별로도 / concurrency 는 정책 전체의 동시 처리 수
+RATE_POLICIES = {
+    "auth": Policy("auth", per_minute=20, burst=10, concurrency=8),
+    "write": Policy("write", per_minute=30, burst=10, concurrency=8),
+}
+RATE_LIMITED_ROUTES = {
+    ("POST", "/auth/login"): "auth",
+    ("POST", "/auth/register"): "auth",
+    ("GET", "/auth/kakao/callback"): "auth",
+    ("POST", "/lifestyle/new"): "write",
+    ("POST", "/business/new"): "write",
+    ("POST", "/business/{bid}/review"): "write",
+}
+if os.getenv("DONGNE_RATE_LIMIT", "on").lower() != "off":
+    app.add_middleware(
+        RateLimitMiddleware,
+        routes=RATE_LIMITED_ROUTES,
+        policies=RATE_POLICIES,
+        max_keys=int(os.getenv("DONGNE_RATE_LIMIT_KEYS", "100000")),
+        # 프록시 뒤라면 그 프록시 수 (X-Forwarded-For 에서 프록시가 붙인 값을 클라이언트 IP 로)
+        trusted_hops=int(os.getenv("DONGNE_TRUST_FORWARDED", "0") or 0),
+    )
+
+# 요청 계측 — DONGNE_PROFILE_SLOW_MS 를 주면 느린 요청 스택 샘플링
+_profile_slow_ms = os.getenv("DONGNE_PROFILE_SLOW_MS")
+app.add_middleware(
+    MetricsMiddleware,
+    profiler=SlowRequestProfiler(
+        float(_profile_slow_ms),
+        interval_ms=float(os.getenv("DONGNE_PROFILE_INTERVAL_MS", "5")),
+    ) if _profile_slow_ms else None,
+)
+instrument_engine(engine)
+instrument_engine(read_engine)
 
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+# 쓰기가 있었던 요청 → 잠시 같은 브라우저의 읽기도 쓰기 DB 로 (get_read_db)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# 로그인한 사용자의 HTML 은 캐시 금지 (SW 의 stale-while-revalidate 가 다른 사용자 화면을 보여주지 않게)
+app.add_middleware(PrivatePageMiddleware, session_cookie="user")
+
+# 정적 파일 — 해시 이름 빌드 결과물 (python build_assets.py)
+DIST_DIR = STATIC_DIR / "dist"
+ASSETS = AssetManifest(DIST_DIR / "manifest.json")
+
+templates = TimedJinja2Templates(directory=str(BASE_DIR / "templates"))
+templates.env.globals["static_url"] = ASSETS.url
+templates.env.globals["asset_version"] = ASSETS.version or "dev"
+
+app.mount(
+    "/static/dist",
+    ImmutableStaticFiles(directory=str(DIST_DIR), check_dir=False),
+    name="static_dist",
+)
+# 업로드 이미지 — Range / 강한 ETag / immutable (media.py)
+#   트래픽이 많으면 프록시에서 이 두 경로만 media_server.py 프로세스로 보냄
+app.mount("/static/uploads", MediaFiles(UPLOAD_DIR), name="media_uploads")
+app.mount("/static/lifestyle", MediaFiles(LIFESTYLE_UPLOAD_DIR), name="media_lifestyle")
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 # ------------------------------------------------------------
@@ -56,7 +198,6 @@ app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 # ------------------------------------------------------------
 KAKAO_CLIENT_ID = os.getenv("KAKAO_CLIENT_ID")
 redirect_uri = "https://dongnelink.onrender.com/auth/kakao/callback"
-print(">>> KAKAO_CLIENT_ID:", KAKAO_CLIENT_ID)
 
 # ------------------------------------------------------------
 # 관리자 계정 (최초 1개는 코드로 관리)
@@ -71,8 +212,65 @@ USERS_LEGACY: list[dict] = []
 BUSINESSES: list[dict] = []
 REVIEWS: list[dict] = []
 NEWS_POSTS: list[dict] = []
+POSTS_BY_ID: dict[int, dict] = {}
+POSTS_BY_DONG: dict[tuple, list[dict]] = {}     # (sido, sigungu, dong) → 글 (등록 순)
+
+# 업소 인덱스 — apply_mutation 에서 index_business / unindex_business 로 갱신
+BUSINESS_BY_ID: dict[int, dict] = {}
+BUSINESS_INDEX = BusinessIndex()
+REVIEW_STATS: dict[int, list] = {}      # business id → [리뷰 수, 평점 합]
+BUSINESS_REV: dict[int, int] = {}       # business id → 변경될 때마다 +1 (API ETag)
+
+# 보조 인덱스 — 같이 index_business / unindex_business 에서 갱신 (dict = 등록 순서 유지)
+BUSINESSES_BY_OWNER: dict[str, dict[int, dict]] = {}    # 등록자 → {id: 업소}
+PENDING_BUSINESSES: dict[int, dict] = {}                # 승인 대기 큐 (먼저 들어온 순)
+_owner_of: dict[int, str] = {}
 
 _business_id_seq = 1
+_post_id_seq = 1
+
+# 저장소 영속화 (journal + snapshot) — DONGNE_STORE_DIR=off 면 메모리에만
+# 시/도 샤딩 (shards.py / router.py) — DONGNE_SHARD 가 없으면 이 프로세스가 전부 맡음
+SHARD = ShardConfig.from_env()
+PEERS = Peers(SHARD.peers, SHARD.token, timeout_s=float(os.getenv("DONGNE_SHARD_TIMEOUT_S", "5")))
+# 샤드마다 journal / bus 를 따로 (같은 호스트에서 띄워도 서로의 파일을 잡지 않게)
+STORE_BASE_DIR = DATA_DIR / "store" / f"shard-{SHARD.index}" if SHARD.enabled else DATA_DIR / "store"
+
+_store_dir = os.getenv("DONGNE_STORE_DIR", str(STORE_BASE_DIR))
+STORE = Journal(
+    None if _store_dir.lower() in ("", "off") else Path(_store_dir),
+    fsync_interval_ms=float(os.getenv("DONGNE_JOURNAL_FSYNC_MS", "20")),
+    snapshot_every=int(os.getenv("DONGNE_SNAPSHOT_EVERY", "10000")),
+    snapshot_interval_s=float(os.getenv("DONGNE_SNAPSHOT_INTERVAL_S", "600")),
+)
+
+# worker 간 변경 전파 — DONGNE_BUS=sqlite 면 같은 호스트의 worker 끼리 공유
+BUS = create_bus(
+    os.getenv("DONGNE_BUS", "local"),
+    Path(os.getenv("DONGNE_BUS_PATH", str(STORE_BASE_DIR / "bus.sqlite3"))),
+    poll_interval_ms=float(os.getenv("DONGNE_BUS_POLL_MS", "100")),
+)
+_bus_version = 0                         # bus watermark — 이 번호까지의 이벤트는 전부 반영됨
+_bus_applied: set[int] = set()           # watermark 보다 뒤인데 이미 반영한 이벤트 (자기 publish 등)
+_tombstones: dict[int, int] = {}         # 삭제된 업소 id → 삭제 이벤트 version
+
+# 동네생활 실시간 피드 (SSE) — 동네마다 구독자 fan-out
+FEED = FeedHub(
+    queue_size=int(os.getenv("DONGNE_FEED_QUEUE", "64")),
+    heartbeat_s=float(os.getenv("DONGNE_FEED_HEARTBEAT_S", "20")),
+    max_age_s=float(os.getenv("DONGNE_FEED_MAX_AGE_S", "300")),
+)
+
+# 조회수 / 인기 목록 — 메모리에서 세고 DONGNE_VIEW_FLUSH_S 마다 DB 에 모아서 반영
+COUNTERS = ViewCounters(
+    SessionLocal,
+    flush_interval_s=float(os.getenv("DONGNE_VIEW_FLUSH_S", "10")),
+)
+POPULAR_SIZE = 5
+
+# 주기 작업 (업로드 정리 / 인덱스 정리) — DONGNE_JOBS=off 면 안 돌림
+SCHEDULER = Scheduler()
+JOBS_ENABLED = os.getenv("DONGNE_JOBS", "on").lower() != "off"
 
 # ------------------------------------------------------------
 # Util
@@ -89,6 +287,15 @@ def get_db():
         db.close()
 
 
+# 읽기 전용 화면용 — READ_DATABASE_URL (replica) 세션, 방금 쓴 브라우저면 쓰기 DB
+def get_read_db(request: Request):
+    db = read_session(request.cookies.get(STICKY_COOKIE))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def get_current_user(request: Request) -> Optional[str]:
     return request.cookies.get("user")
 
@@ -114,31 +321,121 @@ def get_user_by_kakao_id(db: Session, kakao_id: str) -> Optional[User]:
     return db.query(User).filter(User.kakao_id == str(kakao_id)).first()
 
 
+KAKAO_UPSERT_RETRIES = 5
+
+
+def _like_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def upsert_kakao_user(db: Session, kakao_id: str, email: Optional[str]) -> User:
+    # 카카오 로그인 — kakao_id 로 찾거나 새로 만듦
+    #   조회 한 번: kakao_id 가 같은 행 + kakao_<id>, kakao_<id>_N 아이디를 함께 가져와
+    #   빈 아이디를 메모리에서 고름 (아이디마다 DB 를 찔러보지 않음)
+    #   동시에 첫 로그인한 요청과 unique 제약이 부딪히면 rollback 후 다시 (그 사이 생긴 행을 반환)
+    kakao_id = str(kakao_id)
+    base = f"kakao_{kakao_id}"
+    for _ in range(KAKAO_UPSERT_RETRIES):
+        rows = db.query(User).filter(
+            or_(
+                User.kakao_id == kakao_id,
+                User.username == base,
+                User.username.like(_like_escape(base) + "\\_%", escape="\\"),
+            )
+        ).all()
+        for u in rows:
+            if u.kakao_id == kakao_id:
+                return u
+
+        taken = {u.username for u in rows}
+        username, n = base, 1
+        while username in taken:
+            username = f"{base}_{n}"
+            n += 1
+
+        user = User(username=username, email=email, kakao_id=kakao_id, login_type="kakao")
+        db.add(user)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            # 같은 이메일의 다른 계정이 있으면 이메일 없이 가입 (아이디/kakao_id 충돌이면 다시 조회)
+            if email and db.query(User.id).filter(User.email == email).first():
+                email = None
+            continue
+        db.refresh(user)
+        return user
+    raise HTTPException(503, "잠시 후 다시 로그인해 주세요.")
+
+
+def save_upload(image: UploadFile, dest_dir: Path, url_prefix: str) -> str:
+    ext = image.filename.split(".")[-1] if "." in image.filename else "jpg"
+    filename = f"{uuid.uuid4()}.{ext}"
+    with timed("upload"):
+        with open(dest_dir / filename, "wb") as f:
+            shutil.copyfileobj(image.file, f)
+    return f"{url_prefix}/{filename}"
+
+
 # =============================================================
-#   행정동 JSON
+#   행정동 스냅샷 (python generate_locations_capital.py 로 컴파일)
 # =============================================================
-with open(DATA_DIR / "locations_capital.json", encoding="utf-8") as f:
-    raw_locations = json.load(f)
+LOCATIONS_SNAPSHOT = DATA_DIR / "locations.snapshot.json"
+LOCATIONS_SOURCE = DATA_DIR / "locations_capital.json"   # 스냅샷이 없거나 이 파일이 바뀌었을 때 사용
 
-location_tree: dict = defaultdict(lambda: defaultdict(list))
+# 화면에 먼저 보여줄 시/도 순서 (나머지는 가나다순)
+CAPITAL_SIDO = ["서울특별시", "인천광역시", "경기도"]
 
-for r in raw_locations:
-    location_tree[r["sido"]][r["sigungu"]].append(r["dong"])
+# 서비스 지역 제한 (예: DONGNE_SIDO="서울특별시,경기도") — 비우면 스냅샷 전체
+ENABLED_SIDO = [s.strip() for s in os.getenv("DONGNE_SIDO", "").split(",") if s.strip()]
 
-for s in location_tree:
-    for g in location_tree[s]:
-        location_tree[s][g].sort()
+_location_tree: Optional[LocationTree] = None
+_sido_list: Optional[list[str]] = None
 
-CAPITAL_SIDO = ["서울특별시", "인천광역시", "경기도"]
+
+def reset_location_cache():
+    global _location_tree, _sido_list
+    _location_tree = None
+    _sido_list = None
+
+
+def get_location_tree() -> LocationTree:
+    global _location_tree
+    if _location_tree is None:
+        _location_tree = load_location_tree(LOCATIONS_SNAPSHOT, LOCATIONS_SOURCE)
+    return _location_tree
+
+
+def get_sido_list() -> list[str]:
+    global _sido_list
+    if _sido_list is None:
+        tree = get_location_tree()
+        enabled = [s for s in tree.sido if not ENABLED_SIDO or s in ENABLED_SIDO]
+        first = [s for s in CAPITAL_SIDO if s in enabled]
+        _sido_list = first + [s for s in enabled if s not in first]
+    return _sido_list
 
 
 def validate_location(sido: str, sigungu: str, dong: str):
-    if sido not in location_tree:
+    location_tree = get_location_tree()
+    if sido not in get_sido_list():
         raise HTTPException(400, "잘못된 시/도")
-    if sigungu not in location_tree[sido]:
+    if sigungu not in location_tree.tree[sido]:
         raise HTTPException(400, "잘못된 시/군/구")
-    if dong not in location_tree[sido][sigungu]:
+    if dong not in location_tree.tree[sido][sigungu]:
         raise HTTPException(400, "잘못된 동")
+    # 샤드 모드 — 다른 샤드가 맡은 시/도 (router 를 거치지 않은 요청)
+    if not SHARD.owns(sido):
+        raise HTTPException(421, "이 지역은 다른 샤드에서 처리합니다.")
+
+
+# 대량 등록용 — 예외 대신 오류 문구 (없으면 None)
+def location_error(sido: str, sigungu: str, dong: str) -> Optional[str]:
+    try:
+        validate_location(sido, sigungu, dong)
+    except HTTPException as e:
+        return e.detail
+    return None
 
 
 # =============================================================
@@ -146,17 +443,190 @@ def validate_location(sido: str, sigungu: str, dong: str):
 # =============================================================
 @app.get("/api/locations/sido")
 def api_sido():
-    return CAPITAL_SIDO
+    return get_sido_list()
 
 
 @app.get("/api/locations/sigungu")
 def api_sigungu(sido: str):
-    return sorted(location_tree[sido].keys())
+    if sido not in get_sido_list():
+        return []
+    return get_location_tree().sigungu_list(sido)
 
 
 @app.get("/api/locations/dong")
 def api_dong(sido: str, sigungu: str):
-    return location_tree[sido][sigungu]
+    if sido not in get_sido_list():
+        return []
+    return get_location_tree().dong_list(sido, sigungu)
+
+
+# =============================================================
+# API v1 (모바일 앱) — JSON
+#   직렬화는 schemas.py 의 TypeAdapter (dict 그대로, 검증 없이)
+#   ETag 는 응답에 들어갈 항목의 리비전으로 직렬화 전에 계산
+#   → If-None-Match 가 같으면 본문을 만들지 않고 304
+#   리비전은 프로세스 안에서만 의미가 있으므로 ETag 에 API_EPOCH 를 붙임
+#   (재시작/다른 worker 면 ETag 가 달라져서 한 번 200 을 받을 뿐)
+# =============================================================
+API_EPOCH = f"{int(time.time()):x}{os.getpid():x}"
+API_PAGE_SIZE = 50
+API_MAX_PAGE = 500
+API_KINDS = ("food", "repair")
+
+
+def api_fields(fields: Optional[str], allowed) -> Optional[set[str]]:
+    try:
+        return schemas.parse_fields(fields, allowed)
+    except ValueError as e:
+        raise HTTPException(400, f"알 수 없는 필드: {e}")
+
+
+def etag_for(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{API_EPOCH}-{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def api_response(request: Request, etag: str, render) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(render(), media_type="application/json", headers=headers)
+
+
+def business_out(b: dict) -> dict:
+    stats = REVIEW_STATS.get(b["id"])
+    return {
+        **b,
+        "reviews": {
+            "count": stats[0] if stats else 0,
+            "rating_avg": round(stats[1] / stats[0], 2) if stats else None,
+        },
+    }
+
+
+@app.get("/api/v1/businesses")
+def api_businesses(
+    request: Request,
+    kind: str,
+    sido: str,
+    sigungu: str,
+    dong: str,
+    category: Optional[str] = None,
+    opt: list[str] = Query([]),
+    open_now: bool = False,
+    open_at: Optional[str] = None,
+    price_min: Optional[str] = None,
+    price_max: Optional[str] = None,
+    sort: Optional[str] = None,
+    limit: int = Query(API_PAGE_SIZE, ge=1, le=API_MAX_PAGE),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = None,
+):
+    if kind not in API_KINDS:
+        raise HTTPException(400, f"kind 는 {', '.join(API_KINDS)} 중 하나여야 합니다.")
+    validate_location(sido, sigungu, dong)
+    chosen = api_fields(fields, schemas.BUSINESS_FIELDS)
+    items = get_filtered_businesses(
+        kind, sido, sigungu, dong, category, parse_amenities(opt),
+        parse_open_filter(open_now, open_at), parse_price_filter(price_min),
+        parse_price_filter(price_max), parse_sort(sort), offset + limit,
+    )[offset:]
+
+    etag = etag_for(
+        "businesses", request.url.query, [(b["id"], BUSINESS_REV.get(b["id"])) for b in items]
+    )
+    include = None if chosen is None else {"items": {"__all__": chosen}, "count": True, "offset": True}
+    return api_response(request, etag, lambda: schemas.BUSINESS_PAGE.dump_json(
+        {"items": [business_out(b) for b in items], "count": len(items), "offset": offset},
+        include=include,
+    ))
+
+
+def get_public_business(bid: int) -> dict:
+    b = BUSINESS_BY_ID.get(bid)
+    if not b or not b.get("approved"):
+        raise HTTPException(404, "업체 없음")
+    return b
+
+
+@app.get("/api/v1/businesses/{bid}")
+def api_business(request: Request, bid: int, fields: Optional[str] = None):
+    b = get_public_business(bid)
+    chosen = api_fields(fields, schemas.BUSINESS_FIELDS)
+    COUNTERS.view("business", bid, business_topic(b))
+
+    etag = etag_for("business", bid, BUSINESS_REV.get(bid), fields)
+    return api_response(request, etag, lambda: schemas.BUSINESS.dump_json(business_out(b), include=chosen))
+
+
+@app.get("/api/v1/businesses/{bid}/reviews")
+def api_business_reviews(
+    request: Request,
+    bid: int,
+    limit: int = Query(API_PAGE_SIZE, ge=1, le=API_MAX_PAGE),
+    offset: int = Query(0, ge=0),
+):
+    get_public_business(bid)
+    # 리뷰는 추가만 되므로 (개수, 평점 합)이 같으면 내용도 같음
+    count, total_rating = REVIEW_STATS.get(bid, (0, 0))
+    etag = etag_for("reviews", bid, count, total_rating, limit, offset)
+
+    def render():
+        reviews = get_reviews(bid)[::-1]        # 최신순
+        page = reviews[offset:offset + limit]
+        return schemas.REVIEW_PAGE.dump_json(
+            {"items": page, "count": len(page), "offset": offset, "total": len(reviews)}
+        )
+
+    return api_response(request, etag, render)
+
+
+@app.get("/api/v1/posts")
+def api_posts(
+    request: Request,
+    sido: str,
+    sigungu: str,
+    dong: str,
+    limit: int = Query(API_PAGE_SIZE, ge=1, le=API_MAX_PAGE),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = None,
+):
+    validate_location(sido, sigungu, dong)
+    chosen = api_fields(fields, schemas.POST_FIELDS)
+    # 동네 글은 추가만 되므로 글 수가 같으면 내용도 같음
+    posts = POSTS_BY_DONG.get((sido, sigungu, dong), [])
+    total = len(posts)
+    etag = etag_for("posts", sido, sigungu, dong, total, limit, offset, fields)
+
+    def render():
+        end = max(total - offset, 0)
+        page = posts[max(end - limit, 0):end][::-1]     # 최신순
+        return schemas.POST_PAGE.dump_json(
+            {"items": page, "count": len(page), "offset": offset, "total": total},
+            include=schemas.page_include(chosen),
+        )
+
+    return api_response(request, etag, render)
+
+
+@app.get("/api/v1/posts/{pid}")
+def api_post(request: Request, pid: int, fields: Optional[str] = None):
+    post = POSTS_BY_ID.get(pid)
+    if not post:
+        raise HTTPException(404, "글 없음")
+    chosen = api_fields(fields, schemas.POST_FIELDS)
+    COUNTERS.view("post", pid, post_topic(post))
+
+    etag = etag_for("post", pid, fields)
+    return api_response(request, etag, lambda: schemas.POST.dump_json(post, include=chosen))
 
 
 # =============================================================
@@ -198,7 +668,7 @@ def select_location(
             "user": user,
             "category": category,
             "category_name": CATEGORY_META[category]["name"],
-            "sido_list": CAPITAL_SIDO,
+            "sido_list": get_sido_list(),
         },
     )
 
@@ -216,11 +686,8 @@ def lifestyle_page(
 ):
     validate_location(sido, sigungu, dong)
 
-    posts = [
-        p
-        for p in NEWS_POSTS
-        if p["sido"] == sido and p["sigungu"] == sigungu and p["dong"] == dong
-    ]
+    # 최신 글이 위로 (실시간으로 들어오는 글도 맨 위에 붙음)
+    posts = POSTS_BY_DONG.get((sido, sigungu, dong), [])[::-1]
 
     return templates.TemplateResponse(
         "lifestyle.html",
@@ -230,11 +697,44 @@ def lifestyle_page(
             "sido": sido,
             "sigungu": sigungu,
             "dong": dong,
-            "news_posts": posts,
+            "posts": posts,
+            "popular": popular_posts(sido, sigungu, dong),
         },
     )
 
 
+# 🔥 동네생활 글 상세 (조회수 집계)
+@app.get("/lifestyle/posts/{pid}", response_class=HTMLResponse)
+def lifestyle_post(request: Request, pid: int, user=Depends(get_current_user)):
+    post = POSTS_BY_ID.get(pid)
+    if not post:
+        return HTMLResponse("글 없음", 404)
+
+    views = COUNTERS.view("post", pid, post_topic(post))
+
+    return templates.TemplateResponse(
+        "lifestyle_post.html",
+        {"request": request, "user": user, "post": post, "view_count": views},
+    )
+
+
+# 🔥 동네생활 실시간 피드 (Server-Sent Events) — 새 글 / 이 동네 업소의 새 리뷰
+@app.get("/lifestyle/stream")
+async def lifestyle_stream(
+    request: Request,
+    sido: str,
+    sigungu: str,
+    dong: str,
+    last_event_id: Optional[str] = Header(None),
+):
+    validate_location(sido, sigungu, dong)
+    return StreamingResponse(
+        FEED.stream((sido, sigungu, dong), last_event_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # 🔥 동네생활 글쓰기 (GET)
 @app.get("/lifestyle/new", response_class=HTMLResponse)
 def lifestyle_new_page(
@@ -278,25 +778,22 @@ def lifestyle_new(
 
     image_url = None
     if image:
-        ext = image.filename.split(".")[-1] if "." in image.filename else "jpg"
-        filename = f"{uuid.uuid4()}.{ext}"
-        save_path = LIFESTYLE_UPLOAD_DIR / filename
-        with open(save_path, "wb") as f:
-            shutil.copyfileobj(image.file, f)
-        image_url = f"/static/lifestyle/{filename}"
-
-    NEWS_POSTS.append(
-        {
-            "id": len(NEWS_POSTS) + 1,
-            "title": title,
-            "content": content,
-            "user": user,
-            "sido": sido,
-            "sigungu": sigungu,
-            "dong": dong,
-            "image_url": image_url,
-        }
-    )
+        image_url = save_upload(image, LIFESTYLE_UPLOAD_DIR, "/static/lifestyle")
+
+    with STORE.lock:
+        mutate(
+            "post.add",
+            {
+                "id": allocate_id("post", _post_id_seq),
+                "title": title,
+                "content": content,
+                "user": user,
+                "sido": sido,
+                "sigungu": sigungu,
+                "dong": dong,
+                "image_url": image_url,
+            },
+        )
 
     return RedirectResponse(
         f"/lifestyle?sido={sido}&sigungu={sigungu}&dong={dong}",
@@ -332,10 +829,448 @@ def ensure_business_defaults(b: dict):
     b.setdefault("opt_group", False)
     b.setdefault("menus", [])
     b.setdefault("services", [])
+    b.setdefault("hours_week", None)
+    b.setdefault("price_min", None)
+    b.setdefault("price_max", None)
+    b.setdefault("premium", False)
+    b.setdefault("created_at", 0)
+
+
+# 등록/수정 시점에 한 번만 계산하는 파생 필드
+#   해석 규칙(hours.py / pricing.py)이 바뀌면 DERIVED_VERSION 을 올림
+#   → snapshot 의 값이 다르면 기동 시 전체를 다시 계산 (refresh_derived_fields)
+DERIVED_VERSION = 4     # 2: 휴무일 "요일" 의 "일" 을 일요일로 잘못 읽던 문제
+                        # 3: "1인 15,000원" 처럼 수량 숫자를 가격으로 읽던 문제
+                        # 4: "9시~24시" 를 24시간 영업으로 읽던 문제 / "새벽 2시" 등 해석
+_derived_version = 1
+
+
+def normalize_business(b: dict):
+    b["hours_week"] = compile_week(b)
+    b["price_min"], b["price_max"] = price_range(
+        list(b.get("menus") or []) + list(b.get("services") or [])
+    )
+
+
+def refresh_derived_fields() -> int:
+    global _derived_version
+    changed = []
+    for b in BUSINESSES:
+        before = (b.get("hours_week"), b.get("price_min"), b.get("price_max"))
+        normalize_business(b)
+        if (b["hours_week"], b["price_min"], b["price_max"]) != before:
+            changed.append(b)
+    index_businesses(changed)
+    _derived_version = DERIVED_VERSION
+    return len(changed)
+
+
+def track_business(b: dict):
+    bid, owner = b["id"], b["owner"]
+    old = _owner_of.get(bid)
+    if old is not None and old != owner:
+        _untrack_owner(bid, old)
+    BUSINESSES_BY_OWNER.setdefault(owner, {})[bid] = b
+    _owner_of[bid] = owner
+    if b.get("approved"):
+        PENDING_BUSINESSES.pop(bid, None)
+    else:
+        PENDING_BUSINESSES[bid] = b
+
+
+def _untrack_owner(bid: int, owner: str):
+    mine = BUSINESSES_BY_OWNER.get(owner)
+    if mine is not None:
+        mine.pop(bid, None)
+        if not mine:
+            del BUSINESSES_BY_OWNER[owner]
+
+
+def bump_revision(bid: int):
+    BUSINESS_REV[bid] = BUSINESS_REV.get(bid, 0) + 1
+
+
+def index_business(b: dict):
+    b["rank_score"] = ranking_score(b, REVIEW_STATS.get(b["id"]))
+    BUSINESS_BY_ID[b["id"]] = b
+    BUSINESS_INDEX.put(b)
+    track_business(b)
+    bump_revision(b["id"])
+
+
+# 대량 반영 (기동 / 대량 등록) — 정렬 리스트는 shard 마다 한 번만 정렬
+def index_businesses(bs: list[dict]):
+    for b in bs:
+        b["rank_score"] = ranking_score(b, REVIEW_STATS.get(b["id"]))
+        BUSINESS_BY_ID[b["id"]] = b
+        track_business(b)
+        bump_revision(b["id"])
+    BUSINESS_INDEX.put_many(bs)
+
+
+def unindex_business(bid: int):
+    BUSINESS_BY_ID.pop(bid, None)
+    REVIEW_STATS.pop(bid, None)
+    BUSINESS_INDEX.remove(bid)
+    BUSINESS_REV.pop(bid, None)
+    PENDING_BUSINESSES.pop(bid, None)
+    owner = _owner_of.pop(bid, None)
+    if owner is not None:
+        _untrack_owner(bid, owner)
+
+
+# 점수 입력(리뷰/결제/프리미엄)만 바뀐 경우 — 정렬 리스트 위치만 갱신
+def rescore_business(b: dict):
+    b["rank_score"] = ranking_score(b, REVIEW_STATS.get(b["id"]))
+    BUSINESS_INDEX.set_score(b["id"], b["rank_score"])
+    bump_revision(b["id"])
+
+
+def count_review(r: dict):
+    stats = REVIEW_STATS.setdefault(r["business_id"], [0, 0])
+    stats[0] += 1
+    stats[1] += r["rating"]
+
+
+def record_review(r: dict):
+    REVIEWS.append(r)
+    count_review(r)
+    b = BUSINESS_BY_ID.get(r["business_id"])
+    if b:
+        rescore_business(b)
+
+
+# =============================================================
+# 저장소 변경 — 모든 쓰기는 mutate(op, data) 한 곳으로
+#   bus 방송(version 발급) + 메모리 반영 + journal 기록을 STORE.lock 안에서 함께
+#   apply_mutation 은 journal replay / 다른 worker 의 이벤트 반영에도 그대로 사용됨
+#
+#   version (bus 이벤트 번호, local bus 면 None) 으로 업소 단위 last-writer-wins:
+#   이미 더 최신 version 이 반영된 업소(b["_v"])나 삭제된 업소에는 옛 이벤트를 무시
+#
+#   재기동 시 bus 이어받기 위치 = _bus_version (poll 로 순서대로 지나간 마지막 이벤트)
+#   그보다 뒤인데 먼저 반영한 이벤트(자기 publish)는 _bus_applied 에 두고 다시 받으면 건너뜀
+# =============================================================
+RANK_FIELDS = {"paid", "premium"}
+
+
+def _is_stale(bid: int, version: Optional[int]) -> bool:
+    if version is None:
+        return False
+    if _tombstones.get(bid, 0) > version:
+        return True
+    b = BUSINESS_BY_ID.get(bid)
+    return b is not None and b.get("_v", 0) > version
+
+
+def apply_mutation(op: str, data: dict, version: Optional[int] = None):
+    global _business_id_seq, _post_id_seq
+
+    # watermark 는 bus poll 로 받은 이벤트에서만 올림 (on_bus_event)
+    # 여기서는 "반영함" 표시만 — 자기 publish 는 더 낮은 번호의 남의 이벤트보다 먼저 올 수 있음
+    if version is not None and version > _bus_version:
+        _bus_applied.add(version)
+
+    if op == "business.put":
+        if _is_stale(data["id"], version):
+            return
+        b = BUSINESS_BY_ID.get(data["id"])
+        if b is None:
+            b = data
+            BUSINESSES.append(b)
+        elif b is not data:
+            b.update(data)
+        if version is not None:
+            b["_v"] = version
+        _business_id_seq = max(_business_id_seq, b["id"] + 1)
+        index_business(b)
+
+    elif op == "business.bulk_add":
+        # 대량 등록 배치 — 저장만 하고 인덱스는 마지막 business.bulk_index 에서 한 번에
+        for b in data["items"]:
+            if b["id"] in BUSINESS_BY_ID or _is_stale(b["id"], version):
+                continue
+            ensure_business_defaults(b)
+            if version is not None:
+                b["_v"] = version
+            BUSINESSES.append(b)
+            BUSINESS_BY_ID[b["id"]] = b
+            _business_id_seq = max(_business_id_seq, b["id"] + 1)
+
+    elif op == "business.bulk_index":
+        index_businesses([
+            BUSINESS_BY_ID[bid] for bid in data["ids"]
+            if bid in BUSINESS_BY_ID and bid not in BUSINESS_INDEX.located
+        ])
+
+    elif op == "business.update":
+        update_business(data["id"], data["fields"], version)
+
+    elif op == "business.update_many":
+        # 일괄 승인 등 — 같은 fields 를 여러 업소에 (journal 한 줄 / bus 이벤트 하나)
+        for bid in data["ids"]:
+            update_business(bid, data["fields"], version)
+
+    elif op in ("business.delete", "business.delete_many"):
+        ids = {
+            bid for bid in ([data["id"]] if op == "business.delete" else data["ids"])
+            if not _is_stale(bid, version)
+        }
+        if not ids:
+            return
+        if version is not None:
+            for bid in ids:
+                _tombstones[bid] = version
+        # 목록은 한 번만 다시 만듦 (여러 건이어도)
+        BUSINESSES[:] = [x for x in BUSINESSES if x["id"] not in ids]
+        REVIEWS[:] = [r for r in REVIEWS if r["business_id"] not in ids]
+        for bid in ids:
+            unindex_business(bid)
+            COUNTERS.forget("business", bid)
+
+    elif op == "review.add":
+        if version is not None and _tombstones.get(data["business_id"], 0) > version:
+            return
+        record_review(data)
+        b = BUSINESS_BY_ID.get(data["business_id"])
+        if b and b.get("approved"):
+            FEED.publish(
+                (b["sido"], b["sigungu"], b["dong"]),
+                "review",
+                {
+                    "business_id": b["id"],
+                    "business_name": b["name"],
+                    "username": data["username"],
+                    "rating": data["rating"],
+                    "comment": data["comment"],
+                },
+            )
+
+    elif op == "post.add":
+        NEWS_POSTS.append(data)
+        _post_id_seq = max(_post_id_seq, data["id"] + 1)
+        POSTS_BY_ID[data["id"]] = data
+        POSTS_BY_DONG.setdefault((data["sido"], data["sigungu"], data["dong"]), []).append(data)
+        FEED.publish(
+            (data["sido"], data["sigungu"], data["dong"]),
+            "post",
+            {k: data[k] for k in ("id", "title", "content", "user", "image_url")},
+        )
+
+    else:
+        raise ValueError(f"알 수 없는 변경: {op}")
+
+
+def update_business(bid: int, fields: dict, version: Optional[int]):
+    b = BUSINESS_BY_ID.get(bid)
+    if b is None or _is_stale(bid, version):
+        return
+    b.update(fields)
+    if version is not None:
+        b["_v"] = version
+    if RANK_FIELDS.issuperset(fields):
+        rescore_business(b)
+    else:
+        index_business(b)
+
+
+def mutate(op: str, data: dict):
+    with STORE.lock:
+        version = BUS.publish(op, data)
+        apply_mutation(op, data, version)
+        STORE.append(op, data, version)
+
+
+def allocate_id(name: str, floor: int, count: int = 1) -> int:
+    # worker 가 여럿이면 bus 에서 번호 발급 (로컬이면 floor 그대로)
+    # count 개를 연속으로 예약 → 첫 번호 (floor ~ floor+count-1)
+    # 샤드 모드면 bus 는 이 샤드의 slot 을 세고 id 는 줄무늬 (다음 id 는 + ID_STRIDE)
+    slot = SHARD.slot_floor(floor)
+    return SHARD.id_for_slot(BUS.next_id(name, slot, count) or slot)
+
+
+ID_STRIDE = SHARD.count
+
+
+# 다른 worker 가 보낸 이벤트 (bus 스레드에서 호출)
+CACHE_INVALIDATORS = {
+    "locations": reset_location_cache,
+}
+
+
+def on_bus_event(op: str, data: dict, version: int):
+    if op == "cache.invalidate":
+        CACHE_INVALIDATORS[data["name"]]()
+        with STORE.lock:
+            advance_bus_watermark(version)
+        return
+    with STORE.lock:
+        # 재기동 전에 이 worker 가 publish 해서 이미 snapshot/journal 에 있는 이벤트
+        if version not in _bus_applied:
+            apply_mutation(op, data, version)
+            STORE.append(op, data, version)
+        advance_bus_watermark(version)
+
+
+def on_own_bus_event(version: int):
+    with STORE.lock:
+        advance_bus_watermark(version)
+
+
+def advance_bus_watermark(version: int):
+    # poll 은 version 순서대로 전달 → version 을 받았으면 그 이하는 전부 지나감
+    global _bus_version
+    if version <= _bus_version:
+        return
+    _bus_version = version
+    if _bus_applied:
+        _bus_applied.difference_update([v for v in _bus_applied if v <= version])
+
+
+def invalidate_cache(name: str):
+    CACHE_INVALIDATORS[name]()
+    BUS.publish("cache.invalidate", {"name": name})
+
+
+def store_state() -> dict:
+    # STORE.lock 안에서 호출 — 직렬화는 lock 밖이므로 레코드마다 얕은 복사
+    #   (변경은 항상 최상위 필드를 통째로 바꿈 → 안쪽 리스트는 공유해도 됨)
+    return {
+        "business_id_seq": _business_id_seq,
+        "derived_version": _derived_version,
+        "bus_version": _bus_version,
+        "bus_applied": sorted(_bus_applied),
+        "tombstones": list(_tombstones.items()),
+        "businesses": [dict(b) for b in BUSINESSES],
+        "reviews": [dict(r) for r in REVIEWS],
+        "news_posts": [dict(p) for p in NEWS_POSTS],
+    }
+
+
+def load_store_state(state: dict):
+    global _business_id_seq, _post_id_seq, _bus_version, _derived_version
+
+    BUSINESSES[:] = state.get("businesses", [])
+    REVIEWS[:] = state.get("reviews", [])
+    NEWS_POSTS[:] = state.get("news_posts", [])
+    _business_id_seq = state.get("business_id_seq", 1)
+    _derived_version = state.get("derived_version", 1)
+    _bus_version = state.get("bus_version", 0)
+    _bus_applied.clear()
+    _bus_applied.update(state.get("bus_applied", []))
+    _tombstones.clear()
+    _tombstones.update(state.get("tombstones", []))
+
+    # 파생 구조(리뷰 통계 → 점수 → 인덱스)는 snapshot 에 넣지 않고 다시 만듦
+    BUSINESS_BY_ID.clear()
+    BUSINESS_INDEX.clear()
+    REVIEW_STATS.clear()
+    BUSINESSES_BY_OWNER.clear()
+    PENDING_BUSINESSES.clear()
+    BUSINESS_REV.clear()
+    _owner_of.clear()
+    POSTS_BY_ID.clear()
+    POSTS_BY_DONG.clear()
+    _post_id_seq = max((p["id"] for p in NEWS_POSTS), default=0) + 1
+    for p in NEWS_POSTS:
+        POSTS_BY_ID[p["id"]] = p
+        POSTS_BY_DONG.setdefault((p["sido"], p["sigungu"], p["dong"]), []).append(p)
+    for r in REVIEWS:
+        count_review(r)
+    for b in BUSINESSES:
+        ensure_business_defaults(b)
+    index_businesses(BUSINESSES)
+
+
+def check_shard_store():
+    # 샤드 모드 — store 디렉터리에 주인 샤드를 적어 두고, 다른 샤드가 같은 경로를 쓰면 기동 실패
+    #   (다른 샤드의 업소를 replay 하거나, journal lock 을 못 잡아 자기 변경을 잃는 일 방지)
+    if not (SHARD.enabled and STORE.enabled):
+        return
+    STORE.dir.mkdir(parents=True, exist_ok=True)
+    marker = STORE.dir / "shard.json"
+    mine = {"index": SHARD.index, "count": SHARD.count}
+    if marker.exists():
+        owner = json.loads(marker.read_text(encoding="utf-8"))
+        if owner != mine:
+            raise RuntimeError(
+                f"{STORE.dir} 는 샤드 {owner['index']}/{owner['count']} 의 store 입니다 "
+                "— 샤드마다 DONGNE_STORE_DIR / DONGNE_BUS_PATH 를 따로 주세요."
+            )
+    else:
+        marker.write_text(json.dumps(mine), encoding="utf-8")
+
+
+def open_store():
+    check_shard_store()
+    stats = STORE.open(store_state, load_store_state, apply_mutation)
+    # 다른 프로세스가 journal 을 쥐고 있는데 bus 가 local 이면 이 worker 의 쓰기는
+    # 어디에도 기록/전파되지 않음 (재시작하면 사라짐) → 조용히 잃지 말고 기동 실패
+    if STORE.enabled and not stats["owner"] and BUS.name == "local":
+        raise RuntimeError(
+            f"{STORE.dir} 를 다른 worker 가 쓰고 있습니다 — worker 가 여럿이면 DONGNE_BUS=sqlite 로 띄우세요."
+        )
+    # 대량 등록 도중 종료됐으면 (bulk_index 기록 전) 남은 업소를 여기서 인덱스
+    index_businesses([b for b in BUSINESSES if b["id"] not in BUSINESS_INDEX.located])
+    if _derived_version != DERIVED_VERSION:
+        logger.info("파생 필드 다시 계산 (v%d → v%d): 업소 %d건 변경",
+                    _derived_version, DERIVED_VERSION, refresh_derived_fields())
+    if STORE.enabled:
+        logger.info(
+            "store: snapshot seq=%d + replay %d건 → 업소 %d, 리뷰 %d, 글 %d",
+            stats["snapshot_seq"], stats["replayed"],
+            len(BUSINESSES), len(REVIEWS), len(NEWS_POSTS),
+        )
+    # journal 이후의 변경은 bus 에서 이어받음
+    BUS.start(on_bus_event, since=_bus_version, on_own=on_own_bus_event)
+
+
+# =============================================================
+# 조회수 / 인기 목록
+#   topic = 인기 목록 단위 — 업소는 (kind, 시도, 시군구, 동), 글은 ("post", ...)
+# =============================================================
+def business_topic(b: dict) -> tuple:
+    return (b["kind"], b["sido"], b["sigungu"], b["dong"])
+
+
+def post_topic(p: dict) -> tuple:
+    return ("post", p["sido"], p["sigungu"], p["dong"])
+
+
+def view_topic(kind: str, item_id: int) -> Optional[tuple]:
+    if kind == "business":
+        b = BUSINESS_BY_ID.get(item_id)
+        return business_topic(b) if b and b.get("approved") else None
+    p = POSTS_BY_ID.get(item_id)
+    return post_topic(p) if p else None
+
+
+def open_view_counters():
+    # 저장소 로드(open_store) 뒤에 — 인기 점수를 동네별로 다시 나누려면 업소/글 위치가 필요
+    COUNTERS.load(view_topic)
+    COUNTERS.start()
+
+
+def popular_businesses(kind, sido, sigungu, dong, n=POPULAR_SIZE) -> list[dict]:
+    topic = (kind, sido, sigungu, dong)
+    items = []
+    for bid in COUNTERS.top(topic):
+        b = BUSINESS_BY_ID.get(bid)
+        # 동네/종류를 옮긴 업소는 다음 조회 때 옮겨지므로 여기서 한 번 더 확인
+        if b and b.get("approved") and business_topic(b) == topic:
+            items.append(b)
+            if len(items) >= n:
+                break
+    return items
+
+
+def popular_posts(sido, sigungu, dong, n=POPULAR_SIZE) -> list[dict]:
+    ids = COUNTERS.top(("post", sido, sigungu, dong), n)
+    return [POSTS_BY_ID[pid] for pid in ids if pid in POSTS_BY_ID]
 
 
 def get_business(bid: int):
-    b = next((x for x in BUSINESSES if x["id"] == bid), None)
+    b = BUSINESS_BY_ID.get(bid)
     if b:
         ensure_business_defaults(b)
     return b
@@ -345,19 +1280,53 @@ def get_reviews(bid: int):
     return [r for r in REVIEWS if r["business_id"] == bid]
 
 
-def get_filtered_businesses(kind, sido, sigungu, dong, category=None):
-    items = [b for b in BUSINESSES if b["kind"] == kind and b.get("approved")]
+def parse_amenities(opt: list[str]) -> list[str]:
+    unknown = [o for o in opt if o not in AMENITIES]
+    if unknown:
+        raise HTTPException(400, f"알 수 없는 편의시설: {', '.join(unknown)}")
+    return list(dict.fromkeys(opt))
 
-    items = [
-        b
-        for b in items
-        if b["sido"] == sido and b["sigungu"] == sigungu and b["dong"] == dong
-    ]
 
-    if category:
-        items = [b for b in items if b["category"] == category]
+def parse_open_filter(open_now: bool, open_at: Optional[str]) -> Optional[int]:
+    if open_at:
+        minute = parse_clock(open_at)
+        if minute is None:
+            raise HTTPException(400, "open_at 은 HH:MM 형식이어야 합니다.")
+        return minute
+    if open_now:
+        return now_minute()
+    return None
 
-    return items
+
+def parse_price_filter(v: Optional[str]) -> Optional[int]:
+    # 빈 입력칸("")은 조건 없음
+    if v is None or not v.strip():
+        return None
+    try:
+        won = int(v.replace(",", "").strip())
+    except ValueError:
+        raise HTTPException(400, "가격은 숫자(원)로 입력해주세요.")
+    if won < 0:
+        raise HTTPException(400, "가격은 0 이상이어야 합니다.")
+    return won
+
+
+def parse_sort(sort: Optional[str]) -> str:
+    if sort and sort not in SORTS:
+        raise HTTPException(400, f"정렬은 {', '.join(SORTS)} 중 하나여야 합니다.")
+    return sort or DEFAULT_SORT
+
+
+def get_filtered_businesses(
+    kind, sido, sigungu, dong, category=None, amenities=(), open_minute=None,
+    price_min=None, price_max=None, sort=DEFAULT_SORT, limit=None,
+):
+    ids = BUSINESS_INDEX.query(
+        kind, sido, sigungu, dong, category, amenities,
+        open_at=open_minute, price_min=price_min, price_max=price_max,
+        sort=sort, limit=limit,
+    )
+    return [BUSINESS_BY_ID[bid] for bid in ids]
 
 
 # =============================================================
@@ -370,11 +1339,27 @@ def food_list(
     sigungu: str,
     dong: str,
     category: str = None,
+    opt: list[str] = Query([]),
+    open_now: bool = False,
+    open_at: Optional[str] = None,
+    price_min: Optional[str] = None,
+    price_max: Optional[str] = None,
+    sort: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
     user=Depends(get_current_user),
 ):
     validate_location(sido, sigungu, dong)
-    items = get_filtered_businesses("food", sido, sigungu, dong, category)
-    categories = sorted({b["category"] for b in BUSINESSES if b["kind"] == "food"})
+    amenities = parse_amenities(opt)
+    open_minute = parse_open_filter(open_now, open_at)
+    price_min = parse_price_filter(price_min)
+    price_max = parse_price_filter(price_max)
+    sort = parse_sort(sort)
+    items = get_filtered_businesses(
+        "food", sido, sigungu, dong, category, amenities, open_minute,
+        price_min, price_max, sort, limit,
+    )
+    categories = BUSINESS_INDEX.categories("food")
+    popular = popular_businesses("food", sido, sigungu, dong)
 
     return templates.TemplateResponse(
         "food_list.html",
@@ -382,7 +1367,16 @@ def food_list(
             "request": request,
             "user": user,
             "items": items,
+            "popular": popular,
             "categories": categories,
+            "category": category,
+            "amenities": amenities,
+            "amenity_labels": AMENITY_LABELS,
+            "open_now": open_now,
+            "open_at": open_at or "",
+            "price_min": price_min,
+            "price_max": price_max,
+            "sort": sort,
             "sido": sido,
             "sigungu": sigungu,
             "dong": dong,
@@ -397,11 +1391,27 @@ def repair_list(
     sigungu: str,
     dong: str,
     category: str = None,
+    opt: list[str] = Query([]),
+    open_now: bool = False,
+    open_at: Optional[str] = None,
+    price_min: Optional[str] = None,
+    price_max: Optional[str] = None,
+    sort: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
     user=Depends(get_current_user),
 ):
     validate_location(sido, sigungu, dong)
-    items = get_filtered_businesses("repair", sido, sigungu, dong, category)
-    categories = sorted({b["category"] for b in BUSINESSES if b["kind"] == "repair"})
+    amenities = parse_amenities(opt)
+    open_minute = parse_open_filter(open_now, open_at)
+    price_min = parse_price_filter(price_min)
+    price_max = parse_price_filter(price_max)
+    sort = parse_sort(sort)
+    items = get_filtered_businesses(
+        "repair", sido, sigungu, dong, category, amenities, open_minute,
+        price_min, price_max, sort, limit,
+    )
+    categories = BUSINESS_INDEX.categories("repair")
+    popular = popular_businesses("repair", sido, sigungu, dong)
 
     return templates.TemplateResponse(
         "repair_list.html",
@@ -409,7 +1419,16 @@ def repair_list(
             "request": request,
             "user": user,
             "items": items,
+            "popular": popular,
             "categories": categories,
+            "category": category,
+            "amenities": amenities,
+            "amenity_labels": AMENITY_LABELS,
+            "open_now": open_now,
+            "open_at": open_at or "",
+            "price_min": price_min,
+            "price_max": price_max,
+            "sort": sort,
             "sido": sido,
             "sigungu": sigungu,
             "dong": dong,
@@ -427,7 +1446,7 @@ def business_register_page(request: Request, user=Depends(get_current_user)):
 
     return templates.TemplateResponse(
         "business_form.html",
-        {"request": request, "user": user, "sido_list": CAPITAL_SIDO},
+        {"request": request, "user": user, "sido_list": get_sido_list()},
     )
 @app.post("/business/new")
 def business_new(
@@ -479,8 +1498,6 @@ def business_new(
     image: UploadFile = File(None),
     user=Depends(get_current_user),
 ):
-    global _business_id_seq
-
     if not user:
         return RedirectResponse("/auth/login", 302)
 
@@ -488,12 +1505,7 @@ def business_new(
 
     image_url = None
     if image:
-        ext = image.filename.split(".")[-1] if "." in image.filename else "jpg"
-        filename = f"{uuid.uuid4()}.{ext}"
-        save_path = UPLOAD_DIR / filename
-        with open(save_path, "wb") as f:
-            shutil.copyfileobj(image.file, f)
-        image_url = f"/static/uploads/{filename}"
+        image_url = save_upload(image, UPLOAD_DIR, "/static/uploads")
 
     def as_bool(v: Optional[str]) -> bool:
         return v is not None
@@ -522,48 +1534,50 @@ def business_new(
                 }
             )
 
-    BUSINESSES.append(
-        {
-            "id": _business_id_seq,
-            "kind": kind,
-            "sido": sido,
-            "sigungu": sigungu,
-            "dong": dong,
-            "category": category,
-            "name": name,
-            "description": description,
-            "image_url": image_url,
-            "owner": user,
-            "approved": True if is_admin(request) else False,
-            "paid": False,
-            "phone": phone,
-            "homepage": homepage,
-            "blog": blog,
-            "instagram": instagram,
-            "address_road": address_road,
-            "address_detail": address_detail,
-            "lat": lat,
-            "lng": lng,
-            "hours_mon": hours_mon,
-            "hours_tue": hours_tue,
-            "hours_wed": hours_wed,
-            "hours_thu": hours_thu,
-            "hours_fri": hours_fri,
-            "hours_sat": hours_sat,
-            "hours_sun": hours_sun,
-            "off_day": off_day,
-            "opt_delivery": as_bool(opt_delivery),
-            "opt_reservation": as_bool(opt_reservation),
-            "opt_parking": as_bool(opt_parking),
-            "opt_pet": as_bool(opt_pet),
-            "opt_wifi": as_bool(opt_wifi),
-            "opt_group": as_bool(opt_group),
-            "menus": menus,
-            "services": services,
-        }
-    )
-
-    _business_id_seq += 1
+    b = {
+        "id": None,
+        "kind": kind,
+        "sido": sido,
+        "sigungu": sigungu,
+        "dong": dong,
+        "category": category,
+        "name": name,
+        "description": description,
+        "image_url": image_url,
+        "owner": user,
+        "approved": True if is_admin(request) else False,
+        "paid": False,
+        "premium": False,
+        "created_at": time.time(),
+        "phone": phone,
+        "homepage": homepage,
+        "blog": blog,
+        "instagram": instagram,
+        "address_road": address_road,
+        "address_detail": address_detail,
+        "lat": lat,
+        "lng": lng,
+        "hours_mon": hours_mon,
+        "hours_tue": hours_tue,
+        "hours_wed": hours_wed,
+        "hours_thu": hours_thu,
+        "hours_fri": hours_fri,
+        "hours_sat": hours_sat,
+        "hours_sun": hours_sun,
+        "off_day": off_day,
+        "opt_delivery": as_bool(opt_delivery),
+        "opt_reservation": as_bool(opt_reservation),
+        "opt_parking": as_bool(opt_parking),
+        "opt_pet": as_bool(opt_pet),
+        "opt_wifi": as_bool(opt_wifi),
+        "opt_group": as_bool(opt_group),
+        "menus": menus,
+        "services": services,
+    }
+    normalize_business(b)
+    with STORE.lock:
+        b["id"] = allocate_id("business", _business_id_seq)
+        mutate("business.put", b)
 
     return RedirectResponse(
         f"/{kind}?sido={sido}&sigungu={sigungu}&dong={dong}", 302
@@ -583,6 +1597,12 @@ def business_detail(
     if not b:
         return HTMLResponse("업체 없음", 404)
 
+    # 승인 전 업소(주인/관리자만 보는 화면)는 인기 점수에 넣지 않음
+    if b.get("approved"):
+        views = COUNTERS.view("business", bid, business_topic(b))
+    else:
+        views = COUNTERS.count("business", bid)
+
     reviews = get_reviews(bid)
     avg_rating = (
         sum(r["rating"] for r in reviews) / len(reviews) if reviews else None
@@ -597,6 +1617,7 @@ def business_detail(
             "reviews": reviews,
             "avg_rating": avg_rating,
             "review_count": len(reviews),
+            "view_count": views,
         },
     )
 
@@ -607,7 +1628,7 @@ def business_detail(
 @app.post("/business/{bid}/review")
 def add_review(
     bid: int,
-    rating: int = Form(...),
+    rating: int = Form(..., ge=1, le=5),
     comment: str = Form(...),
     user=Depends(get_current_user),
 ):
@@ -617,13 +1638,14 @@ def add_review(
     if not get_business(bid):
         return HTMLResponse("업체 없음", 404)
 
-    REVIEWS.append(
+    mutate(
+        "review.add",
         {
             "business_id": bid,
             "username": user,
             "rating": rating,
             "comment": comment,
-        }
+        },
     )
 
     return RedirectResponse(f"/business/{bid}", 302)
@@ -637,7 +1659,7 @@ def my_businesses(request: Request, user=Depends(get_current_user)):
     if not user:
         return RedirectResponse("/auth/login", 302)
 
-    mine = [b for b in BUSINESSES if b["owner"] == user]
+    mine = gather_businesses(owner=user)
 
     return templates.TemplateResponse(
         "my_businesses.html",
@@ -667,7 +1689,7 @@ def edit_page(
 
     return templates.TemplateResponse(
         "business_edit.html",
-        {"request": request, "user": user, "business": b, "sido_list": CAPITAL_SIDO},
+        {"request": request, "user": user, "business": b, "sido_list": get_sido_list()},
     )
 
 
@@ -730,13 +1752,9 @@ def edit_business(
 
     validate_location(sido, sigungu, dong)
 
+    updated = dict(b)
     if image:
-        ext = image.filename.split(".")[-1] if "." in image.filename else "jpg"
-        filename = f"{uuid.uuid4()}.{ext}"
-        save_path = UPLOAD_DIR / filename
-        with open(save_path, "wb") as f:
-            shutil.copyfileobj(image.file, f)
-        b["image_url"] = f"/static/uploads/{filename}"
+        updated["image_url"] = save_upload(image, UPLOAD_DIR, "/static/uploads")
 
     def as_bool(v: Optional[str]) -> bool:
         return v is not None
@@ -765,7 +1783,7 @@ def edit_business(
                 }
             )
 
-    b.update(
+    updated.update(
         {
             "kind": kind,
             "sido": sido,
@@ -800,6 +1818,8 @@ def edit_business(
             "services": services,
         }
     )
+    normalize_business(updated)
+    mutate("business.put", updated)
 
     return RedirectResponse(f"/business/{bid}", 302)
 
@@ -819,38 +1839,135 @@ def delete_business(
     if not can_edit(request, b):
         return "권한 없음"
 
-    global BUSINESSES, REVIEWS
-    BUSINESSES = [x for x in BUSINESSES if x["id"] != bid]
-    REVIEWS = [r for r in REVIEWS if r["business_id"] != bid]
+    mutate("business.delete", {"id": bid})
 
     return RedirectResponse("/", 302)
 
 
+# =============================================================
+# 샤드 — 전체 화면용 모아오기 (scatter-gather)
+#   /internal/shard/* : 이 샤드가 가진 것만 JSON 으로 (다른 샤드가 호출, router 는 밖으로 안 보냄)
+#   gather_*          : 이 샤드 것 + DONGNE_SHARD_PEERS 샤드 것 (PEERS 가 없으면 이 샤드 것만)
+#   /admin, /my/businesses, 승인 대기, 내보내기, 업로드 정리가 사용
+# =============================================================
+def local_businesses(owner: Optional[str] = None, pending: bool = False, **filters) -> list[dict]:
+    if owner is not None:
+        items = list(BUSINESSES_BY_OWNER.get(owner, {}).values())
+    elif pending:
+        items = list(PENDING_BUSINESSES.values())
+    else:
+        items = list(BUSINESSES)
+    filters = {k: v for k, v in filters.items() if v}
+    if filters:
+        items = [b for b in items if all(b.get(k) == v for k, v in filters.items())]
+    return items
+
+
+def gather(path: str, local: list, params: Optional[dict] = None) -> list:
+    if not PEERS.urls:
+        return local
+    try:
+        parts = PEERS.gather(path, params)
+    except ShardUnavailable as e:
+        logger.warning("샤드 모아오기 실패: %s", e)
+        raise HTTPException(503, "일부 지역 서버가 응답하지 않습니다. 잠시 후 다시 시도해 주세요.")
+    merged = list(local)
+    for part in parts:
+        merged.extend(part)
+    return merged
+
+
+def gather_businesses(owner: Optional[str] = None, pending: bool = False, **filters) -> list[dict]:
+    local = local_businesses(owner, pending, **filters)
+    if not PEERS.urls:
+        return local
+    merged = gather("/businesses", local, {"owner": owner, "pending": pending or None, **filters})
+    # 합친 뒤에도 등록 순 (샤드 하나일 때의 목록/승인 대기 큐와 같은 순서)
+    merged.sort(key=lambda b: (b.get("created_at") or 0, b["id"]))
+    return merged
+
+
+def shard_token_required(x_dongne_shard_token: Optional[str] = Header(None)):
+    if not SHARD.enabled:
+        raise HTTPException(404)
+    if SHARD.token and x_dongne_shard_token != SHARD.token:
+        raise HTTPException(403, "샤드 토큰이 필요합니다.")
+
+
+@app.get("/internal/shard")
+def shard_info(_=Depends(shard_token_required)):
+    return {**SHARD.describe(), "businesses": len(BUSINESSES), "posts": len(NEWS_POSTS)}
+
+
+@app.get("/internal/shard/businesses")
+def shard_businesses(
+    owner: Optional[str] = None,
+    pending: bool = False,
+    kind: Optional[str] = None,
+    sido: Optional[str] = None,
+    sigungu: Optional[str] = None,
+    dong: Optional[str] = None,
+    _=Depends(shard_token_required),
+):
+    return JSONResponse(local_businesses(owner, pending, kind=kind, sido=sido, sigungu=sigungu, dong=dong))
+
+
+@app.get("/internal/shard/reviews")
+def shard_reviews(_=Depends(shard_token_required)):
+    return JSONResponse(list(REVIEWS))
+
+
+@app.get("/internal/shard/posts")
+def shard_posts(_=Depends(shard_token_required)):
+    return JSONResponse(list(NEWS_POSTS))
+
+
+@app.get("/internal/shard/uploads")
+def shard_uploads(_=Depends(shard_token_required)):
+    return JSONResponse(sorted(referenced_uploads()))
+
+
 # =============================================================
 # ADMIN — 승인 시스템
 # =============================================================
 @app.get("/admin/businesses/pending", response_class=HTMLResponse)
 def pending_list(request: Request, admin=Depends(admin_required)):
-    items = [b for b in BUSINESSES if not b.get("approved")]
+    items = gather_businesses(pending=True)
     return templates.TemplateResponse(
         "admin_pending.html",
         {"request": request, "user": admin, "businesses": items},
     )
 
 
+# 일괄 승인 / 반려 — 체크한 업소 전부를 변경 한 건으로
+@app.post("/admin/businesses/approve")
+def approve_businesses(ids: list[int] = Form([]), admin=Depends(admin_required)):
+    ids = [bid for bid in ids if bid in PENDING_BUSINESSES]
+    if ids:
+        mutate("business.update_many", {"ids": ids, "fields": {"approved": True}})
+    return RedirectResponse("/admin/businesses/pending", 302)
+
+
+@app.post("/admin/businesses/reject")
+def reject_businesses(ids: list[int] = Form([]), admin=Depends(admin_required)):
+    ids = [bid for bid in ids if bid in PENDING_BUSINESSES]
+    if ids:
+        mutate("business.delete_many", {"ids": ids})
+    return RedirectResponse("/admin/businesses/pending", 302)
+
+
 @app.post("/admin/businesses/{bid}/approve")
 def approve_business(bid: int, admin=Depends(admin_required)):
     b = get_business(bid)
     if b:
-        b["approved"] = True
+        mutate("business.update", {"id": bid, "fields": {"approved": True}})
     return RedirectResponse("/admin/businesses/pending", 302)
 
 
 @app.post("/admin/businesses/{bid}/reject")
 def reject_business(bid: int, admin=Depends(admin_required)):
-    global BUSINESSES, REVIEWS
-    BUSINESSES = [b for b in BUSINESSES if b["id"] != bid]
-    REVIEWS = [r for r in REVIEWS if r["business_id"] != bid]
+    if get_business(bid):
+        mutate("business.delete", {"id": bid})
     return RedirectResponse("/admin/businesses/pending", 302)
 
 
@@ -873,7 +1990,17 @@ def pay_entry(
     if not (b["owner"] == user or is_admin(request)):
         return "권한 없음"
 
-    b["paid"] = True
+    mutate("business.update", {"id": bid, "fields": {"paid": True}})
+    return RedirectResponse(f"/business/{bid}", 302)
+
+
+# 상단 노출(프리미엄) 설정/해제
+@app.post("/admin/businesses/{bid}/premium")
+def set_premium(bid: int, premium: bool = Form(...), admin=Depends(admin_required)):
+    b = get_business(bid)
+    if not b:
+        return HTMLResponse("업체 없음", 404)
+    mutate("business.update", {"id": bid, "fields": {"premium": premium}})
     return RedirectResponse(f"/business/{bid}", 302)
 
 
@@ -1027,26 +2154,8 @@ async def kakao_callback(
     email = account.get("email")
     nickname = profile.get("nickname") or "카카오사용자"
 
-    user = get_user_by_kakao_id(db, kakao_id)
-
-    if not user:
-        base_username = f"kakao_{kakao_id}"
-        username = base_username
-
-        n = 1
-        while get_user_by_username(db, username):
-            username = f"{base_username}_{n}"
-            n += 1
-
-        user = User(
-            username=username,
-            email=email,
-            kakao_id=kakao_id,
-            login_type="kakao",
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    # DB 작업은 threadpool 에서 (이벤트 루프를 막지 않게)
+    user = await run_in_threadpool(upsert_kakao_user, db, kakao_id, email)
 
     res = RedirectResponse("/", 302)
     res.set_cookie("user", user.username)
@@ -1061,7 +2170,7 @@ async def kakao_callback(
 def admin_home(
     request: Request,
     admin=Depends(admin_required),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     users = db.query(User).order_by(User.id.desc()).all()
     return templates.TemplateResponse(
@@ -1070,23 +2179,306 @@ def admin_home(
             "request": request,
             "user": admin,
             "users": users,
-            "businesses": BUSINESSES,
-            "news_posts": NEWS_POSTS,
-            "reviews": REVIEWS,
+            "businesses": gather_businesses(),
+            "news_posts": gather("/posts", NEWS_POSTS),
+            "reviews": gather("/reviews", REVIEWS),
         },
     )
 
 
+
+# 인메모리 캐시 비우기 (모든 worker) — 예: 행정동 스냅샷 파일 교체 후 "locations"
+@app.post("/admin/cache/{name}/invalidate")
+def admin_invalidate_cache(name: str, admin=Depends(admin_required)):
+    if name not in CACHE_INVALIDATORS:
+        raise HTTPException(404, f"알 수 없는 캐시: {name}")
+    invalidate_cache(name)
+    return JSONResponse({"invalidated": name, "bus": BUS.name})
+
+
+# =============================================================
+# 주기 작업
+#   upload_gc     : 어떤 업소/글도 가리키지 않는 업로드 파일 삭제
+#                   (업소 삭제/반려, 수정 시 이미지 교체로 남은 파일)
+#                   업로드 → 등록 사이, 다른 worker 의 등록이 아직 안 온 경우를 위해
+#                   UPLOAD_GC_GRACE_S 보다 최근 파일은 건드리지 않음
+#                   UPLOAD_GC_BATCH 개씩 지우고 쉬어 가며 (디스크를 몰아 쓰지 않게)
+#   index_compact : 삭제로 빈 slot 이 많아진 인덱스 shard 를 다시 만듦
+#                   shard 하나씩 STORE.lock 을 잡음 (읽기는 lock 없이 계속)
+# =============================================================
+UPLOAD_GC_GRACE_S = float(os.getenv("DONGNE_UPLOAD_GC_GRACE_S", "3600"))
+UPLOAD_GC_BATCH = 100
+UPLOAD_GC_PAUSE_S = 0.2
+
+
+def referenced_uploads() -> set[str]:
+    with STORE.lock:
+        urls = {b.get("image_url") for b in BUSINESSES}
+        urls.update(p.get("image_url") for p in NEWS_POSTS)
+    urls.discard(None)
+    return urls
+
+
+def _delete_uploads(batch: list[tuple[str, int]], stats: dict):
+    for path, size in batch:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue        # 다른 worker 가 먼저 지움
+        except OSError:
+            stats["errors"] += 1
+            continue
+        stats["deleted"] += 1
+        stats["bytes"] += size
+        UPLOAD_GC_BYTES.inc(amount=size)
+
+
+def collect_orphan_uploads() -> dict:
+    referenced = referenced_uploads()
+    # 샤드 모드 — 업로드 디렉터리는 샤드끼리 공유하므로 모든 샤드의 참조를 알아야 지울 수 있음
+    #   다른 샤드 주소(PEERS)를 아는 샤드만 정리 / 하나라도 응답이 없으면 이번 주기는 실패
+    if SHARD.enabled:
+        if not PEERS.urls:
+            return {"skipped": "다른 샤드 목록(DONGNE_SHARD_PEERS)이 있는 샤드에서만 정리"}
+        for part in PEERS.gather("/uploads"):
+            referenced.update(part)
+    cutoff = time.time() - UPLOAD_GC_GRACE_S
+    stats = {"scanned": 0, "recent": 0, "deleted": 0, "bytes": 0, "errors": 0}
+    batch: list[tuple[str, int]] = []
+
+    for directory, url_prefix in ((UPLOAD_DIR, "/static/uploads"), (LIFESTYLE_UPLOAD_DIR, "/static/lifestyle")):
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stats["scanned"] += 1
+                if f"{url_prefix}/{entry.name}" in referenced:
+                    continue
+                st = entry.stat(follow_symlinks=False)
+                if st.st_mtime > cutoff:
+                    stats["recent"] += 1
+                    continue
+                batch.append((entry.path, st.st_size))
+                if len(batch) >= UPLOAD_GC_BATCH:
+                    _delete_uploads(batch, stats)
+                    batch.clear()
+                    if SCHEDULER.stopping.wait(UPLOAD_GC_PAUSE_S):
+                        return stats
+    _delete_uploads(batch, stats)
+    return stats
+
+
+def compact_business_index() -> dict:
+    with STORE.lock:
+        keys = BUSINESS_INDEX.sparse_shards()
+    freed = 0
+    for key in keys:
+        with STORE.lock:
+            freed += BUSINESS_INDEX.compact_shard(key, BUSINESS_BY_ID.__getitem__)
+    return {"shards": len(keys), "freed_slots": freed}
+
+
+SCHEDULER.add(
+    "upload_gc", collect_orphan_uploads,
+    interval_s=float(os.getenv("DONGNE_UPLOAD_GC_INTERVAL_S", "3600")), initial_delay_s=300,
+)
+SCHEDULER.add(
+    "index_compact", compact_business_index,
+    interval_s=float(os.getenv("DONGNE_INDEX_COMPACT_INTERVAL_S", "600")), initial_delay_s=120,
+)
+
+
+@app.get("/admin/jobs", response_class=HTMLResponse)
+def admin_jobs(request: Request, admin=Depends(admin_required)):
+    def clock(ts: Optional[float]) -> str:
+        return time.strftime("%m-%d %H:%M:%S", time.localtime(ts)) if ts else "-"
+
+    jobs = SCHEDULER.status()
+    for job in jobs:
+        job["last_started"] = clock(job["last_started"])
+        job["next_run"] = clock(job["next_run"])
+    return templates.TemplateResponse(
+        "admin_jobs.html",
+        {"request": request, "user": admin, "jobs": jobs, "enabled": JOBS_ENABLED},
+    )
+
+
+@app.post("/admin/jobs/{name}/run")
+def admin_run_job(name: str, admin=Depends(admin_required)):
+    if name not in SCHEDULER.jobs:
+        raise HTTPException(404, f"알 수 없는 작업: {name}")
+    SCHEDULER.run_now(name)
+    return RedirectResponse("/admin/jobs", 302)
+
+
+# =============================================================
+# ADMIN 업소 대량 등록 / 내보내기 (CSV / JSONL)
+#   import : 한 줄씩 읽어 검증 → IMPORT_BATCH 건마다 mutate 한 번
+#            (배치 = lock 한 번 + journal 한 줄 + bus 이벤트 하나)
+#            인덱스는 전부 끝난 뒤 business.bulk_index 로 한 번에
+#   export : 업소를 조금씩 직렬화해서 흘려보냄 (파일 전체를 만들지 않음)
+# =============================================================
+IMPORT_BATCH = 500
+IMPORT_MAX_ERRORS = 100     # 응답에 담을 오류 줄 수 (개수는 전부 셈)
+
+
+@app.post("/admin/businesses/import")
+def import_businesses(
+    file: UploadFile = File(...),
+    format: Optional[str] = Form(None),
+    dry_run: bool = Form(False),
+    admin=Depends(admin_required),
+):
+    try:
+        fmt = bulk_io.detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    # 샤드 모드 — router 는 행을 샤드별로 나눠 보냄. 직접 받은 파일에 다른 샤드 지역이 섞여 있으면
+    #   그 행만 오류로 세고 나머지를 등록하는 대신 처음부터 전체 거절
+    if SHARD.enabled:
+        sido_list = get_sido_list()
+        foreign = sorted({
+            row["sido"].strip() for _, row, _ in bulk_io.iter_rows(file.file, fmt)
+            if row and isinstance(row.get("sido"), str)
+            and row["sido"].strip() in sido_list and not SHARD.owns(row["sido"].strip())
+        })
+        file.file.seek(0)
+        if foreign:
+            raise HTTPException(
+                421, f"다른 샤드 지역이 포함돼 있습니다 ({', '.join(foreign)}) — router 를 거쳐 등록해 주세요."
+            )
+
+    t0 = time.perf_counter()
+    now = time.time()
+    rows = 0
+    errors: list[dict] = []
+    error_count = 0
+    batch: list[dict] = []
+    imported: list[int] = []
+
+    def flush():
+        if not batch:
+            return
+        with STORE.lock:
+            first = allocate_id("business", _business_id_seq, len(batch))
+            for i, b in enumerate(batch):
+                b["id"] = first + i * ID_STRIDE
+            mutate("business.bulk_add", {"items": batch})
+        imported.extend(b["id"] for b in batch)
+        batch.clear()
+
+    for line_no, row, error in bulk_io.iter_rows(file.file, fmt):
+        rows += 1
+        if error is None:
+            try:
+                b = bulk_io.business_from_row(row, location_error, admin)
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            error_count += 1
+            if len(errors) < IMPORT_MAX_ERRORS:
+                errors.append({"line": line_no, "error": error})
+            continue
+        if dry_run:
+            continue
+
+        b["created_at"] = now
+        normalize_business(b)
+        batch.append(b)
+        if len(batch) >= IMPORT_BATCH:
+            flush()
+    flush()
+
+    if imported:
+        mutate("business.bulk_index", {"ids": imported})
+
+    return JSONResponse({
+        "format": fmt,
+        "dry_run": dry_run,
+        "rows": rows,
+        "imported": len(imported),
+        "error_count": error_count,
+        "errors": errors,
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+    })
+
+
+@app.get("/admin/businesses/export")
+def export_businesses(
+    format: str = "csv",
+    kind: Optional[str] = None,
+    sido: Optional[str] = None,
+    sigungu: Optional[str] = None,
+    dong: Optional[str] = None,
+    x_dongne_shard_local: Optional[str] = Header(None),
+    admin=Depends(admin_required),
+):
+    if format not in bulk_io.FORMATS:
+        raise HTTPException(400, f"지원하는 형식은 {', '.join(bulk_io.FORMATS)} 입니다.")
+    # 목록은 참조만 복사 (업소 dict 자체는 복사하지 않음) — 내보내는 중 등록/삭제와 무관하게
+    # 샤드 모드면 다른 샤드 업소까지 모아서
+    #   router 가 모든 샤드에서 모으는 중이면 (LOCAL_HEADER) 이 샤드 것만
+    #   모을 방법(PEERS)도 router 도 없이 다른 샤드 지역까지 요청하면 일부만 내보내지 않고 거절
+    filters = dict(kind=kind, sido=sido, sigungu=sigungu, dong=dong)
+    if x_dongne_shard_local:
+        selected = local_businesses(**filters)
+    elif SHARD.count > 1 and not PEERS.urls and not (sido and SHARD.owns(sido)):
+        raise HTTPException(
+            421, "다른 샤드의 업소도 포함됩니다 — router 를 거치거나 sido 를 지정해 주세요."
+        )
+    else:
+        selected = gather_businesses(**filters)
+    filename = f"businesses-{time.strftime('%Y%m%d-%H%M%S')}.{format}"
+    return StreamingResponse(
+        bulk_io.export_rows(selected, format),
+        media_type="text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 # =============================================================
-# manifest.json / service-worker.js
+# manifest.json / service-worker.js / precache manifest
 # =============================================================
 @app.get("/manifest.json")
 def manifest():
     return FileResponse(STATIC_DIR / "manifest.json")
 
 
-@app.get("/static/service-worker.js")
+# 루트 경로에서 서빙해야 SW scope 가 사이트 전체("/")가 됨
+@app.get("/service-worker.js")
 def sw():
-    return FileResponse(STATIC_DIR / "service-worker.js")
+    return FileResponse(
+        STATIC_DIR / "service-worker.js",
+        media_type="application/javascript",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+# SW install 시 미리 캐싱할 목록 (해시 이름 정적 파일만 — 사용자별 HTML 제외)
+@app.get("/precache-manifest.json")
+def precache_manifest():
+    return JSONResponse(
+        {"version": ASSETS.version, "urls": ASSETS.urls()},
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+# =============================================================
+# 메트릭 (Prometheus text format)
+# =============================================================
+METRICS_TOKEN = os.getenv("DONGNE_METRICS_TOKEN") or None
+
+
+def metrics_access(request: Request):
+    # 수집기는 토큰, 사람은 관리자 로그인
+    if not scrape_authorized(request.headers.get("authorization"), METRICS_TOKEN):
+        admin_required(request)
 
 
+@app.get("/metrics")
+def metrics(_=Depends(metrics_access)):
+    return PlainTextResponse(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,215 @@
+# media.py
+# ------------------------------------------------------------
+# 업로드 이미지 서빙 (/static/uploads, /static/lifestyle)
+#
+#   업로드 파일은 uuid 이름이라 한 번 쓰이면 내용이 바뀌지 않음
+#   → 강한(strong) ETag = inode-크기-mtime_ns, Cache-Control: immutable
+#
+#   - 조건부 GET : If-None-Match (있으면 If-Modified-Since 는 무시) → 304
+#   - Range      : 한 구간만 206 (여러 구간 요청은 전체 200 으로 — RFC 상 허용)
+#                  If-Range 가 현재 ETag/Last-Modified 와 다르면 전체 200
+#                  범위 밖이면 416 + Content-Range: bytes */크기
+#   - 본문 전송  : 서버가 ASGI 확장을 지원하면 커널에 맡김 (복사 없음)
+#                    http.response.pathsend / http.response.zerocopysend
+#                  아니면 CHUNK_SIZE 씩 스레드에서 읽어서 보냄
+#                  (uvicorn 은 두 확장 모두 없음 → 큰 원본 트래픽이 많으면
+#                   media_server.py 를 따로 띄워 loop.sendfile 로 서빙)
+#
+#   HTTP 판단(evaluate)은 ASGI 앱(MediaFiles)과 media_server.py 가 함께 씀
+# ------------------------------------------------------------
+import asyncio
+import mimetypes
+import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Mapping, Optional
+
+from assets import IMMUTABLE_CACHE_CONTROL
+
+CHUNK_SIZE = 256 * 1024
+CACHE_CONTROL = IMMUTABLE_CACHE_CONTROL
+
+
+class Plan:
+    # 응답 계획 — status, 헤더, 보낼 구간 [start, end) (본문 없으면 start == end)
+    __slots__ = ("status", "headers", "start", "end")
+
+    def __init__(self, status: int, headers: list[tuple[str, str]], start: int = 0, end: int = 0):
+        self.status = status
+        self.headers = headers
+        self.start = start
+        self.end = end
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+def resolve(directory: Path, name: str) -> Optional[tuple[Path, os.stat_result]]:
+    # 업로드 디렉터리는 평평함 — 하위 경로 / 숨김 파일 / .. 은 없음
+    name = name.lstrip("/")
+    if not name or "/" in name or "\\" in name or name.startswith("."):
+        return None
+    path = directory / name
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return path, st
+
+
+def strong_etag(st: os.stat_result) -> str:
+    return f'"{st.st_ino:x}-{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def _not_modified(headers: Mapping[str, str], etag: str, mtime: int) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return mtime <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    # "bytes=a-b" / "bytes=a-" / "bytes=-n" → [start, end)
+    # 해석 불가 / 여러 구간 → None (전체 전송), 범위 밖 → ValueError
+    units, _, spec = header.partition("=")
+    if units.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (s.strip() for s in spec.strip().partition("-"))
+    if not sep or not (first or last):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if not first:
+        n = int(last)                           # 끝에서 n 바이트 (0 이면 빈 구간 → 416)
+        start, end = (max(size - n, 0) if n else size), size
+    else:
+        start = int(first)
+        end = int(last) + 1 if last else size
+    if start >= size or end <= start:
+        raise ValueError("범위 밖")
+    return start, min(end, size)
+
+
+def evaluate(method: str, headers: Mapping[str, str], path: Path, st: os.stat_result) -> Plan:
+    # headers : 소문자 이름 → 값
+    etag = strong_etag(st)
+    last_modified = formatdate(st.st_mtime, usegmt=True)
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    common = [
+        ("etag", etag),
+        ("last-modified", last_modified),
+        ("cache-control", CACHE_CONTROL),
+        ("accept-ranges", "bytes"),
+    ]
+
+    if _not_modified(headers, etag, int(st.st_mtime)):
+        return Plan(304, common)
+
+    size = st.st_size
+    span = None
+    range_header = headers.get("range")
+    if method == "GET" and range_header:
+        if_range = headers.get("if-range")
+        if if_range is None or if_range.strip() in (etag, last_modified):
+            try:
+                span = parse_range(range_header, size)
+            except ValueError:
+                return Plan(416, common + [("content-range", f"bytes */{size}"), ("content-length", "0")])
+
+    body = [("content-type", media_type)]
+    if span is None:
+        plan = Plan(200, common + body + [("content-length", str(size))], 0, size)
+    else:
+        start, end = span
+        plan = Plan(
+            206,
+            common + body + [
+                ("content-range", f"bytes {start}-{end - 1}/{size}"),
+                ("content-length", str(end - start)),
+            ],
+            start, end,
+        )
+    if method == "HEAD":
+        plan.start = plan.end = 0
+    return plan
+
+
+class MediaFiles:
+    # ASGI 앱 — app.mount("/static/uploads", MediaFiles(UPLOAD_DIR)) (/static 보다 먼저)
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "http"
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await _send_empty(send, 405, [("allow", "GET, HEAD")])
+            return
+
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        found = resolve(self.directory, path)
+        if found is None:
+            await _send_empty(send, 404, [])
+            return
+        full_path, st = found
+
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", ())}
+        plan = evaluate(method, headers, full_path, st)
+        await send({
+            "type": "http.response.start",
+            "status": plan.status,
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in plan.headers],
+        })
+        if not plan.length:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if "http.response.pathsend" in extensions and plan.status == 200:
+            await send({"type": "http.response.pathsend", "path": str(full_path)})
+            return
+
+        fd = os.open(full_path, os.O_RDONLY)
+        try:
+            if "http.response.zerocopysend" in extensions:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": fd,
+                    "offset": plan.start,
+                    "count": plan.length,
+                })
+                return
+            offset, end = plan.start, plan.end
+            while offset < end:
+                chunk = await asyncio.to_thread(os.pread, fd, min(CHUNK_SIZE, end - offset), offset)
+                if not chunk:
+                    break       # 보내는 도중 파일이 줄어듦
+                offset += len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": offset < end})
+            if offset < end:
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            os.close(fd)
+
+
+async def _send_empty(send, status: int, headers: list[tuple[str, str]]):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(k.encode(), v.encode()) for k, v in headers] + [(b"content-length", b"0")],
+    })
+    await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,125 @@
+# media_server.py
+# ------------------------------------------------------------
+# 업로드 이미지 전용 서버 (선택) — 앱과 다른 프로세스 / 이벤트 루프
+#
+#   uvicorn 은 ASGI pathsend / zerocopysend 확장이 없어서 앱 안(media.py)에서는
+#   파일을 읽어 복사해 보냄 → 이미지 트래픽이 많으면 이 서버를 따로 띄우고
+#   프록시(nginx 등)에서 /static/uploads, /static/lifestyle 만 이쪽으로 보냄
+#
+#   - GET / HEAD, HTTP/1.1 keep-alive
+#   - 응답 판단(ETag / 304 / Range / 416)은 media.evaluate 그대로
+#   - 본문은 loop.sendfile → os.sendfile (커널에서 바로 소켓으로, 복사 없음)
+#
+#   사용법: python media_server.py --host 127.0.0.1 --port 8001
+# ------------------------------------------------------------
+import argparse
+import asyncio
+import logging
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from media import evaluate, resolve
+
+logger = logging.getLogger("dongnelink.media")
+
+BASE_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BASE_DIR / "static"
+
+# URL 접두사 → 디렉터리 (main.py 의 MediaFiles 마운트와 같음)
+ROOTS = {
+    "/static/uploads/": STATIC_DIR / "uploads",
+    "/static/lifestyle/": STATIC_DIR / "lifestyle",
+}
+
+MAX_HEADER_BYTES = 16 * 1024
+KEEPALIVE_S = 15.0
+
+
+def _head(status: int, headers: list[tuple[str, str]], keep_alive: bool) -> bytes:
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines += [f"{k}: {v}" for k, v in headers]
+    lines.append(f"connection: {'keep-alive' if keep_alive else 'close'}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def _empty(status: int, keep_alive: bool, extra: list[tuple[str, str]] = ()) -> bytes:
+    return _head(status, list(extra) + [("content-length", "0")], keep_alive)
+
+
+def _lookup(target: str):
+    path = unquote(urlsplit(target).path)
+    for prefix, directory in ROOTS.items():
+        if path.startswith(prefix):
+            return resolve(directory, path[len(prefix):])
+    return None
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_S)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+                break
+
+            lines = raw.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(_empty(400, False))
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            # 본문 있는 요청은 받지 않음 (GET/HEAD 전용)
+            if headers.get("content-length", "0") != "0" or "transfer-encoding" in headers:
+                writer.write(_empty(400, False))
+                break
+
+            if method not in ("GET", "HEAD"):
+                writer.write(_empty(405, keep_alive, [("allow", "GET, HEAD")]))
+            else:
+                found = _lookup(target)
+                if found is None:
+                    writer.write(_empty(404, keep_alive))
+                else:
+                    full_path, st = found
+                    plan = evaluate(method, headers, full_path, st)
+                    writer.write(_head(plan.status, plan.headers, keep_alive))
+                    if plan.length:
+                        await writer.drain()
+                        with open(full_path, "rb") as f:
+                            await loop.sendfile(writer.transport, f, plan.start, plan.length)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    except Exception:
+        logger.exception("미디어 요청 처리 실패")
+    finally:
+        writer.close()
+
+
+async def serve(host: str, port: int):
+    server = await asyncio.start_server(handle, host, port, limit=MAX_HEADER_BYTES)
+    logger.info("미디어 서버 시작: %s:%s", host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="업로드 이미지 전용 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
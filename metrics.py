@@ -0,0 +1,452 @@
+# metrics.py
+# ------------------------------------------------------------
+# 요청 계측 / Prometheus 텍스트 메트릭 / 느린 요청 프로파일러
+#
+#   - MetricsMiddleware : 라우트별 지연시간 히스토그램, 요청 수, in-flight
+#   - TimedJinja2Templates : 템플릿 렌더링 시간
+#   - instrument_engine : SQLAlchemy 쿼리 시간 (engine 이벤트)
+#   - 요청 1건의 시간을 db / template / upload / 나머지(필터링 등) 로 분해
+#   - SlowRequestProfiler (opt-in) : 임계값을 넘은 요청 동안의 스택 샘플 로그
+#   - journal 기록 수 / fsync / snapshot 시간 (journal.py)
+#   - worker 간 변경 이벤트 수 / 반영 지연 (invalidation.py)
+#   - 실시간 피드 구독자 / 이벤트 / 끊긴 느린 구독자 (feed.py)
+#   - 조회 수 / 조회수 flush 시간 (counters.py)
+#   - 요청 제한으로 거절한 요청 수 (ratelimit.py)
+#   - 주기 작업 실행 수 / 시간, 업로드 정리로 회수한 용량 (scheduler.py)
+#   - 샤드 모음(scatter-gather) 시간 / 실패, router 가 샤드로 보낸 요청 수 (shards.py, router.py)
+#
+#   /metrics, /router/metrics 는 공개하지 않음 — 수집기는 DONGNE_METRICS_TOKEN 을
+#   "Authorization: Bearer <토큰>" 으로 보냄 (main 은 관리자 로그인도 허용)
+# ------------------------------------------------------------
+import bisect
+import hmac
+import logging
+import sys
+import threading
+import time
+from collections import Counter as _Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.templating import Jinja2Templates
+from sqlalchemy import event
+
+logger = logging.getLogger("dongnelink.metrics")
+
+# 초 단위 버킷
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+# ------------------------------------------------------------
+# 메트릭 타입
+# ------------------------------------------------------------
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        lines = self.header()
+        for labels, v in items:
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {v}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # labels → [bucket counts..., +Inf count, sum]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[i] += 1
+            row[-1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(labels, list(row)) for labels, row in self._values.items()]
+        lines = self.header()
+        for labels, row in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                le = _labels(self.label_names, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += row[len(self.buckets)]
+            le = _labels(self.label_names, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {row[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labels=()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name, help, labels=()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def scrape_authorized(authorization: Optional[str], token: Optional[str]) -> bool:
+    # 토큰이 없으면 항상 거절
+    if not token or not authorization:
+        return False
+    scheme, _, value = authorization.partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(value.strip().encode(), token.encode())
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "dongnelink_http_requests_total", "HTTP 요청 수", ("method", "route", "status")
+)
+HTTP_DURATION = REGISTRY.histogram(
+    "dongnelink_http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route")
+)
+HTTP_PHASE = REGISTRY.histogram(
+    "dongnelink_http_request_phase_seconds",
+    "요청 1건 안에서 단계별 소요 시간 (db/template/upload/other)",
+    ("route", "phase"),
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "dongnelink_http_requests_in_flight", "처리 중인 HTTP 요청 수", ("method",)
+)
+TEMPLATE_RENDER = REGISTRY.histogram(
+    "dongnelink_template_render_seconds", "Jinja 템플릿 렌더링 시간", ("template",)
+)
+DB_QUERY = REGISTRY.histogram(
+    "dongnelink_db_query_seconds", "SQLAlchemy 쿼리 실행 시간", ("operation",)
+)
+SLOW_REQUESTS = REGISTRY.counter(
+    "dongnelink_slow_requests_total", "임계값을 넘은 요청 수", ("route",)
+)
+JOURNAL_APPENDS = REGISTRY.counter(
+    "dongnelink_journal_appends_total", "journal 에 기록된 변경 수", ("op",)
+)
+JOURNAL_FSYNC = REGISTRY.histogram(
+    "dongnelink_journal_fsync_seconds", "journal fsync 1회 시간 (여러 기록을 묶어서)"
+)
+SNAPSHOT_WRITE = REGISTRY.histogram(
+    "dongnelink_snapshot_write_seconds", "snapshot 작성 시간"
+)
+BUS_EVENTS = REGISTRY.counter(
+    "dongnelink_bus_events_total", "worker 간 변경 이벤트 수 (out=보냄, in=받아서 반영)",
+    ("direction", "op"),
+)
+BUS_LAG = REGISTRY.histogram(
+    "dongnelink_bus_lag_seconds", "다른 worker 의 변경이 이 worker 에 반영되기까지 걸린 시간"
+)
+FEED_SUBSCRIBERS = REGISTRY.gauge(
+    "dongnelink_feed_subscribers", "동네생활 실시간 피드(SSE) 구독자 수"
+)
+FEED_EVENTS = REGISTRY.counter(
+    "dongnelink_feed_events_total", "실시간 피드로 보낸 이벤트 수", ("kind",)
+)
+FEED_DROPPED = REGISTRY.counter(
+    "dongnelink_feed_dropped_total", "큐가 가득 차서 끊은 느린 구독자 수"
+)
+COUNTER_VIEWS = REGISTRY.counter(
+    "dongnelink_views_total", "업소/글 조회 수", ("kind",)
+)
+COUNTER_FLUSH = REGISTRY.histogram(
+    "dongnelink_view_counter_flush_seconds", "조회수 DB 반영(flush) 1회 시간"
+)
+RATE_LIMITED = REGISTRY.counter(
+    "dongnelink_rate_limited_total", "요청 제한으로 거절한 요청 수 (rate=429, busy=503)",
+    ("policy", "reason"),
+)
+JOB_RUNS = REGISTRY.counter(
+    "dongnelink_job_runs_total", "주기 작업 실행 수", ("job", "result")
+)
+JOB_DURATION = REGISTRY.histogram(
+    "dongnelink_job_duration_seconds", "주기 작업 1회 실행 시간", ("job",)
+)
+UPLOAD_GC_BYTES = REGISTRY.counter(
+    "dongnelink_upload_gc_reclaimed_bytes_total", "참조 없는 업로드 파일을 지워 회수한 용량"
+)
+SHARD_GATHER = REGISTRY.histogram(
+    "dongnelink_shard_gather_seconds", "다른 샤드에서 모아오기(scatter-gather) 1회 시간", ("path",)
+)
+SHARD_GATHER_ERRORS = REGISTRY.counter(
+    "dongnelink_shard_gather_errors_total", "모아오기 중 응답하지 않은 샤드", ("peer",)
+)
+SHARD_ROUTED = REGISTRY.counter(
+    "dongnelink_shard_routed_total", "router 가 샤드로 보낸 요청 수 (by=sido/id/home/broadcast)",
+    ("shard", "by"),
+)
+
+PHASES = ("db", "template", "upload")
+
+
+# ------------------------------------------------------------
+# 요청 단위 누적 (contextvar — threadpool 로 넘어가도 유지됨)
+# ------------------------------------------------------------
+class RequestTimings:
+    __slots__ = ("db", "template", "upload")
+
+    def __init__(self):
+        self.db = 0.0
+        self.template = 0.0
+        self.upload = 0.0
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("dongnelink_request_timings", default=None)
+
+
+def _add_phase(phase: str, seconds: float):
+    timings = _current.get()
+    if timings is not None:
+        setattr(timings, phase, getattr(timings, phase) + seconds)
+
+
+@contextmanager
+def timed(phase: str):
+    # 예: with timed("upload"): shutil.copyfileobj(...)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _add_phase(phase, time.perf_counter() - t0)
+
+
+class TimedJinja2Templates(Jinja2Templates):
+    def TemplateResponse(self, *args, **kwargs):
+        name = kwargs.get("name") or next((a for a in args if isinstance(a, str)), "?")
+        t0 = time.perf_counter()
+        try:
+            return super().TemplateResponse(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - t0
+            TEMPLATE_RENDER.observe(elapsed, name)
+            _add_phase("template", elapsed)
+
+
+def instrument_engine(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("dongnelink_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("dongnelink_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else "?"
+        DB_QUERY.observe(elapsed, operation)
+        _add_phase("db", elapsed)
+
+
+# ------------------------------------------------------------
+# 느린 요청 샘플링 프로파일러 (opt-in)
+# ------------------------------------------------------------
+# 대기 중인 스레드(스레드풀 idle, 이벤트 루프 select 등)는 샘플에서 제외
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("_thread.py", "_worker"),
+}
+
+
+class SlowRequestProfiler:
+    def __init__(self, threshold_ms: float, interval_ms: float = 5.0, max_samples: int = 20000):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self._samples: deque = deque(maxlen=max_samples)   # (시각, 스택 문자열)
+        self._active = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="dongnelink-profiler", daemon=True
+            )
+            self._thread.start()
+
+    def request_started(self):
+        with self._lock:
+            self._active += 1
+            self._ensure_thread()
+        self._wakeup.set()
+
+    def request_finished(self):
+        with self._lock:
+            self._active -= 1
+            if self._active == 0:
+                self._wakeup.clear()
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            self._wakeup.wait()
+            now = time.perf_counter()
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = self._collapse(frame)
+                if stack:
+                    self._samples.append((now, stack))
+            time.sleep(self.interval)
+
+    @staticmethod
+    def _collapse(frame) -> Optional[str]:
+        code = frame.f_code
+        leaf = (code.co_filename.rsplit("/", 1)[-1], code.co_name)
+        if leaf in _IDLE_LEAVES:
+            return None
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        return ";".join(reversed(parts))
+
+    def report(self, route: str, method: str, started: float, duration: float, top: int = 10):
+        window = [s for t, s in list(self._samples) if t >= started]
+        counts = _Counter(window)
+        lines = [
+            f"느린 요청 {method} {route} {duration * 1000:.1f}ms "
+            f"(샘플 {len(window)}개, 간격 {self.interval * 1000:.0f}ms)"
+        ]
+        for stack, n in counts.most_common(top):
+            lines.append(f"  {n:5d}  {stack}")
+        logger.warning("\n".join(lines))
+
+
+# ------------------------------------------------------------
+# ASGI 미들웨어
+# ------------------------------------------------------------
+def route_label(scope, root_path: str) -> str:
+    route = scope.get("route")
+    if route is not None and hasattr(route, "path"):
+        return route.path
+    # Mount (예: /static) → 마운트 경로 기준으로 묶음
+    mounted = scope.get("root_path", "")
+    if mounted and mounted != root_path:
+        return mounted[len(root_path):] + "/*"
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    def __init__(self, app, profiler: Optional[SlowRequestProfiler] = None):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        root_path = scope.get("root_path", "")
+        status = 500
+        timings = RequestTimings()
+        token = _current.set(timings)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method)
+        if self.profiler:
+            self.profiler.request_started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            _current.reset(token)
+            HTTP_IN_FLIGHT.dec(method)
+            if self.profiler:
+                self.profiler.request_finished()
+
+            route = route_label(scope, root_path)
+            HTTP_REQUESTS.inc(method, route, str(status))
+            HTTP_DURATION.observe(duration, method, route)
+
+            other = duration
+            for phase in PHASES:
+                spent = getattr(timings, phase)
+                if spent:
+                    HTTP_PHASE.observe(spent, route, phase)
+                    other -= spent
+            HTTP_PHASE.observe(max(other, 0.0), route, "other")
+
+            if self.profiler and duration >= self.profiler.threshold:
+                SLOW_REQUESTS.inc(route)
+                self.profiler.report(route, method, started, duration)
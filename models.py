@@ -34,3 +34,12 @@ class Provider(Base):
     phone = Column(String, nullable=True)                # 연락처
     address = Column(String, nullable=True)              # 주소
     is_premium = Column(Boolean, default=False)          # 상단 노출 여부
+
+class ViewCount(Base):
+    __tablename__ = "view_counts"
+
+    # 조회수는 메모리에서 세고 주기적으로 모아서 반영 (counters.py)
+    kind = Column(String, primary_key=True)              # "business" / "post"
+    item_id = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)   # 누적 조회수
+    trend = Column(Float, nullable=True)                 # 시간 감쇠 인기 점수 (log, 고정 기준점)
@@ -0,0 +1,111 @@
+# pricing.py
+# ------------------------------------------------------------
+# 가격 문자열 정규화
+#
+#   메뉴/서비스 가격은 자유 입력 문자열 ("15,000원", "2만원~", "3만~5만원")
+#   → 등록/수정 시점에 원 단위 (최저, 최고) 로 한 번만 변환
+#   최고가 없음(None) = 상한 없음 ("2만원~", "5만원 이상")
+# ------------------------------------------------------------
+import re
+from typing import Optional
+
+FREE_WORDS = ("무료", "free", "공짜")
+
+# 1.5만 / 2만 3천 / 15,000 / 5천
+_AMOUNT = r"(?:\d+(?:\.\d+)?\s*만(?:\s*\d+\s*천)?|\d+(?:\.\d+)?\s*천|\d[\d,]*)"
+_AMOUNT_RE = re.compile(_AMOUNT)
+_RANGE_RE = re.compile(r"(" + _AMOUNT + r")\s*원?\s*(?:~|-|–)\s*(" + _AMOUNT + r")")
+# 수량/시간/면적이 붙은 숫자는 가격이 아님 → 해석 전에 지움
+#   "1인 15,000원" / "2~3인분 30,000원" / "30분 2만원" / "10개 5천원"
+_QUANTITY_RE = re.compile(
+    r"(?<![\d,.])\d+(?:\.\d+)?(?:\s*(?:~|-|–)\s*\d+(?:\.\d+)?)?\s*"
+    r"(?:인분|인|개|명|회|시간|분|장|병|잔|마리|판|세트|팩|평|박|일|kg|g|ml|cm)"
+)
+
+
+def _to_won(token: str) -> Optional[int]:
+    t = token.replace(",", "").replace(" ", "")
+    try:
+        if "만" in t:
+            man, _, rest = t.partition("만")
+            won = float(man) * 10000
+            if rest:
+                won += float(rest.rstrip("천")) * 1000
+            return int(round(won))
+        if t.endswith("천"):
+            return int(round(float(t[:-1]) * 1000))
+        return int(t)
+    except ValueError:
+        return None
+
+
+def parse_price(text: Optional[str]) -> Optional[tuple[int, Optional[int]]]:
+    if not text:
+        return None
+    t = text.strip().lower()
+    if not t:
+        return None
+    if any(w in t for w in FREE_WORDS):
+        return (0, 0)
+    t = _QUANTITY_RE.sub(" ", t)
+
+    m = _RANGE_RE.search(t)
+    if m:
+        low, high = _to_won(m.group(1)), _to_won(m.group(2))
+        if low is None or high is None:
+            return None
+        return (min(low, high), max(low, high))
+
+    m = _AMOUNT_RE.search(t)
+    if not m:
+        return None            # "시가", "문의" 등
+    won = _to_won(m.group(0))
+    if won is None:
+        return None
+
+    rest = t[m.end():]
+    before = t[:m.start()]
+    if "~" in rest or "이상" in rest or "부터" in rest:
+        return (won, None)
+    if "~" in before or "이하" in rest or "까지" in rest:
+        return (0, won)
+    return (won, won)
+
+
+def price_range(items) -> tuple[Optional[int], Optional[int]]:
+    # 메뉴/서비스 목록 전체의 (최저가, 최고가) — 가격 정보가 없으면 (None, None)
+    lows, highs = [], []
+    open_ended = False
+    for item in items:
+        parsed = parse_price(item.get("price"))
+        if parsed is None:
+            continue
+        lows.append(parsed[0])
+        if parsed[1] is None:
+            open_ended = True
+        else:
+            highs.append(parsed[1])
+
+    if not lows:
+        return None, None
+    return min(lows), (None if open_ended or not highs else max(highs))
+
+
+if __name__ == "__main__":
+    # python pricing.py — 가격 해석 확인
+    for text, expected in [
+        ("15,000원", (15000, 15000)),
+        ("1인 15,000원", (15000, 15000)),
+        ("2인분 30,000원", (30000, 30000)),
+        ("2~3인분 30,000원", (30000, 30000)),
+        ("30분 2만원", (20000, 20000)),
+        ("10개 5천원", (5000, 5000)),
+        ("3만~5만원", (30000, 50000)),
+        ("2만원~", (20000, None)),
+        ("1.5만", (15000, 15000)),
+        ("무료", (0, 0)),
+        ("시가", None),
+    ]:
+        got = parse_price(text)
+        assert got == expected, (text, got, expected)
+    print("ok")
@@ -0,0 +1,43 @@
+# ranking.py
+# ------------------------------------------------------------
+# 목록 기본 정렬(추천순) 점수
+#
+#   점수 = 프리미엄 + 입점비 결제 + 리뷰 품질 + 최신성
+#     - 리뷰 품질 : 베이지안 평균 평점 (리뷰가 적으면 사전값 쪽으로) + 리뷰 수(log)
+#     - 최신성    : 등록 시각 / 1주 — 시간이 지나도 다시 계산할 필요 없는
+#                  "고정 기준점" 방식 (새 업소일수록 점수가 높게 시작)
+#
+#   점수는 입력(리뷰/결제/프리미엄/수정)이 바뀔 때만 다시 계산해
+#   b["rank_score"] 에 저장하고, 인덱스의 정렬 리스트에 반영함
+# ------------------------------------------------------------
+import math
+from typing import Optional
+
+PREMIUM_BOOST = 1_000_000.0     # 프리미엄은 항상 상단
+PAID_BOOST = 20.0
+
+RATING_PRIOR = 3.5
+PRIOR_WEIGHT = 5                # 리뷰 5개 분량의 사전값
+RATING_WEIGHT = 10.0            # 평점 1점 = 10주 최신성
+VOLUME_WEIGHT = 4.0
+
+RECENCY_SCALE = 7 * 24 * 3600   # 1주 = 1점
+
+
+def bayesian_rating(count: int, total: float) -> float:
+    return (RATING_PRIOR * PRIOR_WEIGHT + total) / (PRIOR_WEIGHT + count)
+
+
+def ranking_score(b: dict, review_stats: Optional[list] = None) -> float:
+    count, total = review_stats or (0, 0)
+
+    score = 0.0
+    if b.get("premium"):
+        score += PREMIUM_BOOST
+    if b.get("paid"):
+        score += PAID_BOOST
+
+    score += RATING_WEIGHT * (bayesian_rating(count, total) - RATING_PRIOR)
+    score += VOLUME_WEIGHT * math.log1p(count)
+    score += (b.get("created_at") or 0) / RECENCY_SCALE
+    return score
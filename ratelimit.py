@@ -0,0 +1,175 @@
+# ratelimit.py
+# ------------------------------------------------------------
+# 쓰기/인증 라우트 요청 제한 (프로세스 안, 외부 저장소 없음)
+#
+#   - 토큰 버킷 : 정책마다 (분당 rate, burst) — 키 = 클라이언트 IP, 로그인했으면 user 쿠키도
+#       IP 버킷과 user 버킷을 둘 다 통과해야 함 (쿠키만 바꿔 가며 보내도 IP 에서 막힘)
+#       버킷은 LRU 로 max_keys 개까지만 (오래 안 온 키부터 버림 → 메모리 상한)
+#       가득 찬 버킷과 버린 버킷은 같은 상태라 버려도 결과가 달라지지 않음
+#   - 동시 실행 제한 (load shedding) : 정책 그룹마다 처리 중인 요청 수 상한
+#       넘치면 threadpool 에 들어가기 전에 바로 503 → 업로드/비밀번호 해시가
+#       threadpool 을 다 차지해서 읽기 페이지가 밀리는 일을 막음
+#   - 429 (너무 자주) / 503 (지금 바쁨) 둘 다 Retry-After 헤더
+#
+#   ASGI 미들웨어라 라우팅 전에 판단 — 경로 패턴은 "/business/{bid}/review" 형식
+#   이벤트 루프 스레드에서만 실행되므로 lock 없음
+# ------------------------------------------------------------
+import math
+import re
+import time
+from collections import OrderedDict
+from http.cookies import CookieError, SimpleCookie
+from typing import Optional
+
+from metrics import RATE_LIMITED
+
+
+class Policy:
+    __slots__ = ("name", "rate", "burst", "concurrency")
+
+    def __init__(self, name: str, per_minute: float, burst: int, concurrency: int):
+        self.name = name
+        self.rate = per_minute / 60         # 초당 토큰
+        self.burst = burst
+        self.concurrency = concurrency
+
+
+class TokenBuckets:
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self.buckets: OrderedDict = OrderedDict()     # key → [tokens, 마지막 시각]
+
+    def take(self, key, rate: float, burst: int, now: Optional[float] = None) -> float:
+        # 통과하면 0, 아니면 다음 토큰까지 남은 초
+        now = time.monotonic() if now is None else now
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = [float(burst), now]
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / rate
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+
+def _compile(path: str) -> re.Pattern:
+    parts = re.split(r"(\{[^}/]+\})", path)
+    return re.compile(
+        "^" + "".join("[^/]+" if p.startswith("{") else re.escape(p) for p in parts) + "$"
+    )
+
+
+def _cookie(scope, name: str) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == b"cookie":
+            try:
+                jar = SimpleCookie(value.decode("latin-1"))
+            except CookieError:
+                return None
+            morsel = jar.get(name)
+            return morsel.value if morsel else None
+    return None
+
+
+class RateLimitMiddleware:
+    def __init__(
+        self,
+        app,
+        routes: dict[tuple[str, str], str],
+        policies: dict[str, Policy],
+        max_keys: int = 100_000,
+        trusted_hops: int = 0,
+    ):
+        # routes : (method, 경로 패턴) → 정책 이름
+        self.app = app
+        self.policies = policies
+        self.exact: dict[tuple[str, str], Policy] = {}
+        self.patterns: list[tuple[str, re.Pattern, Policy]] = []
+        for (method, path), name in routes.items():
+            if "{" in path:
+                self.patterns.append((method, _compile(path), policies[name]))
+            else:
+                self.exact[(method, path)] = policies[name]
+        self.buckets = TokenBuckets(max_keys)
+        self.in_flight: dict[str, int] = {name: 0 for name in policies}
+        self.trusted_hops = trusted_hops
+
+    def policy_for(self, method: str, path: str) -> Optional[Policy]:
+        policy = self.exact.get((method, path))
+        if policy is not None:
+            return policy
+        for m, pattern, policy in self.patterns:
+            if m == method and pattern.match(path):
+                return policy
+        return None
+
+    def client_ip(self, scope) -> str:
+        # X-Forwarded-For 의 왼쪽 값들은 클라이언트가 마음대로 넣을 수 있음
+        # → 믿을 수 있는 프록시(trusted_hops 개)가 오른쪽에 붙인 값만 사용
+        #   프록시 1개 (router) : 맨 오른쪽 / 2개 (nginx → router) : 오른쪽에서 두 번째
+        if self.trusted_hops:
+            entries = [
+                e.strip()
+                for key, value in scope.get("headers", ())
+                if key == b"x-forwarded-for"
+                for e in value.decode("latin-1").split(",")
+                if e.strip()
+            ]
+            if entries:
+                return entries[-min(self.trusted_hops, len(entries))]
+        client = scope.get("client")
+        return client[0] if client else "-"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        policy = self.policy_for(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        keys = [(policy.name, "ip", self.client_ip(scope))]
+        user = _cookie(scope, "user")
+        if user:
+            keys.append((policy.name, "user", user))
+        wait = 0.0
+        for key in keys:
+            wait = max(wait, self.buckets.take(key, policy.rate, policy.burst))
+        if wait:
+            RATE_LIMITED.inc(policy.name, "rate")
+            await _reject(send, 429, "요청이 너무 잦습니다. 잠시 후 다시 시도해 주세요.", wait)
+            return
+
+        if self.in_flight[policy.name] >= policy.concurrency:
+            RATE_LIMITED.inc(policy.name, "busy")
+            await _reject(send, 503, "지금 요청이 많습니다. 잠시 후 다시 시도해 주세요.", 1)
+            return
+
+        self.in_flight[policy.name] += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight[policy.name] -= 1
+
+
+async def _reject(send, status: int, message: str, retry_after: float):
+    body = message.encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
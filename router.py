@@ -0,0 +1,575 @@
+# router.py
+# ------------------------------------------------------------
+# 샤드 앞단 router (얇은 프록시) — 요청을 시/도 담당 샤드(main.py worker)로
+#
+#   DONGNE_SHARDS : 샤드 목록 (";" 구분, 순서 = 샤드 번호) — 항목은 "시도,시도=주소"
+#     예) "서울특별시=http://127.0.0.1:8101;인천광역시,경기도=http://127.0.0.1:8102"
+#     샤드 i 는 DONGNE_SHARD="i/n", DONGNE_SHARD_SIDO 를 같게 주고 띄움 (기동 시 확인)
+#   첫 샤드 = home : 전체 화면(/admin, /my/businesses, 승인 대기, 내보내기)·로그인·정적 파일
+#     home 샤드에는 DONGNE_SHARD_PEERS 로 나머지 샤드 주소를 줘서 모아오게 함 (shards.py)
+#   업로드 디렉터리(static/uploads, static/lifestyle)는 샤드끼리 공유해야 함 (같은 호스트/볼륨)
+#   journal / bus 는 샤드마다 따로 — 기본값이 data/store/shard-{번호}/ (bus.sqlite3 포함)
+#     DONGNE_STORE_DIR / DONGNE_BUS_PATH 를 직접 줄 때도 샤드끼리 같은 경로를 쓰면 안 됨
+#     (같은 샤드의 worker 끼리만 같은 store / bus 를 공유)
+#   샤드의 요청 제한이 클라이언트 IP 를 보도록 샤드에는 DONGNE_TRUST_FORWARDED=1
+#     (router 가 X-Forwarded-For 맨 오른쪽에 붙인 값을 씀 — router 앞에 nginx 등이 더 있으면 2)
+#
+#   나누는 기준
+#     - sido 쿼리 파라미터 : /food, /repair, /lifestyle*, /api/v1/businesses, /api/v1/posts (없으면 home)
+#     - 폼 필드 sido      : POST /business/new, /lifestyle/new (본문을 받아 읽고 그대로 전달)
+#     - id 줄무늬         : /business/{bid}/..., /admin/businesses/{bid}/..., /api/v1/.../{id},
+#                            /lifestyle/posts/{pid}  (id % 샤드 수)
+#     - 모든 샤드         : 일괄 승인/반려 (샤드마다 자기 업소만 처리), 캐시 비우기
+#     - 대량 등록         : 업로드 파일을 router 가 읽어 행마다 sido 샤드로 나눠 보냄 (JSONL 로 변환)
+#                           → 샤드별 결과를 합쳐 응답 (오류 줄 번호는 원래 파일 기준)
+#                           실패한 샤드가 있으면 502 + 샤드별 결과 (부분 성공을 성공으로 보이지 않게)
+#     - 내보내기          : sido 가 있으면 그 샤드, 없으면 모든 샤드에 "자기 것만" 요청해서 이어붙임
+#                           (CSV 헤더는 첫 샤드 것만) — 샤드가 하나라도 실패하면 응답 전에 502
+#     - /internal/*       : 밖에서는 404
+#     - /router/metrics   : router 자신의 메트릭 — DONGNE_METRICS_TOKEN 이 있어야 (없으면 404)
+#   응답은 받는 대로 흘려보냄 (SSE /lifestyle/stream, 내보내기 스트리밍 그대로)
+#
+#   사용법: DONGNE_SHARDS=... uvicorn router:app --port 8000
+# ------------------------------------------------------------
+import asyncio
+import json
+import logging
+import os
+import re
+from typing import Optional
+from urllib.parse import parse_qs, quote
+
+import httpx
+from starlette.requests import Request
+
+import bulk_io
+from metrics import METRICS_CONTENT_TYPE, REGISTRY, SHARD_ROUTED, scrape_authorized
+from shards import INTERNAL_PREFIX, LOCAL_HEADER, TOKEN_HEADER, parse_list, shard_of
+
+logger = logging.getLogger("dongnelink.router")
+
+MAX_FORM_BYTES = 20 * 1024 * 1024      # 본문을 읽어야 하는 폼 (이미지 포함)
+MAX_IMPORT_BYTES = 200 * 1024 * 1024   # 대량 등록 파일 (샤드별로 나누려면 전부 읽어야 함)
+IMPORT_MAX_ERRORS = 100                # main.IMPORT_MAX_ERRORS 와 같게
+
+IMPORT_ROUTE = ("POST", "/admin/businesses/import")
+EXPORT_ROUTE = ("GET", "/admin/businesses/export")
+
+ID_ROUTES = [re.compile(p) for p in (
+    r"^/business/(\d+)(?:/|$)",
+    r"^/admin/businesses/(\d+)/",
+    r"^/api/v1/businesses/(\d+)(?:/|$)",
+    r"^/api/v1/posts/(\d+)$",
+    r"^/lifestyle/posts/(\d+)$",
+)]
+SIDO_QUERY_ROUTES = {
+    "/food", "/repair", "/lifestyle", "/lifestyle/stream", "/lifestyle/new",
+    "/api/v1/businesses", "/api/v1/posts",
+}
+SIDO_FORM_ROUTES = {("POST", "/business/new"), ("POST", "/lifestyle/new")}
+BROADCAST_ROUTES = [
+    ("POST", re.compile(r"^/admin/businesses/(approve|reject)$")),
+    ("POST", re.compile(r"^/admin/cache/[^/]+/invalidate$")),
+]
+
+HOP_HEADERS = {
+    b"connection", b"keep-alive", b"proxy-authenticate", b"proxy-authorization",
+    b"te", b"trailer", b"transfer-encoding", b"upgrade", b"host",
+}
+
+
+def parse_shards(value: str) -> list[tuple[frozenset, str]]:
+    shards = []
+    for entry in (e.strip() for e in value.split(";")):
+        if not entry:
+            continue
+        sido, sep, url = entry.rpartition("=")
+        if not sep or not url.strip():
+            raise ValueError(f"잘못된 샤드 항목: {entry}")
+        shards.append((frozenset(parse_list(sido)), url.strip().rstrip("/")))
+    if not shards:
+        raise ValueError("DONGNE_SHARDS 가 비어 있습니다.")
+    return shards
+
+
+class ShardRouter:
+    def __init__(
+        self,
+        shards: list[tuple[frozenset, str]],
+        token: Optional[str] = None,
+        read_timeout_s: float = 60.0,
+        metrics_token: Optional[str] = None,
+    ):
+        self.shards = shards
+        self.by_sido: dict[str, int] = {}
+        for i, (sido, _) in enumerate(shards):
+            for s in sido:
+                if s in self.by_sido:
+                    raise ValueError(f"시/도가 두 샤드에 있음: {s}")
+                self.by_sido[s] = i
+        self.token = token
+        self.metrics_token = metrics_token or None
+        # SSE 는 하트비트(20초)로 읽기가 이어지므로 read 타임아웃은 그보다 길게
+        self.timeout = httpx.Timeout(10.0, read=read_timeout_s)
+        self.client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_env(cls) -> "ShardRouter":
+        return cls(
+            parse_shards(os.getenv("DONGNE_SHARDS", "")),
+            os.getenv("DONGNE_SHARD_TOKEN"),
+            float(os.getenv("DONGNE_ROUTER_READ_TIMEOUT_S", "60")),
+            os.getenv("DONGNE_METRICS_TOKEN"),
+        )
+
+    # ------------------------------------------------------------
+    # 기동 — 샤드 설정이 router 와 맞는지 확인 (응답 없는 샤드는 경고만)
+    # ------------------------------------------------------------
+    async def startup(self):
+        self.client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=False)
+        headers = {TOKEN_HEADER: self.token} if self.token else {}
+        for i, (sido, url) in enumerate(self.shards):
+            try:
+                r = await self.client.get(url + INTERNAL_PREFIX, headers=headers)
+                r.raise_for_status()
+                info = r.json()
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("샤드 %d (%s) 확인 실패: %s", i, url, e)
+                continue
+            if (info["index"], info["count"], frozenset(info["sido"])) != (i, len(self.shards), sido):
+                raise RuntimeError(f"샤드 {i} ({url}) 설정이 다름: {info}")
+
+    async def shutdown(self):
+        if self.client is not None:
+            await self.client.aclose()
+
+    # ------------------------------------------------------------
+    # 어느 샤드로 — (샤드 번호 목록, 기준)
+    # ------------------------------------------------------------
+    def by_id(self, id_: int) -> int:
+        return shard_of(id_, len(self.shards))
+
+    def for_sido(self, sido: Optional[str]) -> tuple[list[int], str]:
+        if sido and sido in self.by_sido:
+            return [self.by_sido[sido]], "sido"
+        return [0], "home"      # sido 없음 / 모르는 시도 → home 이 400 등으로 답함
+
+    def route(self, method: str, path: str, query: bytes) -> tuple[list[int], str]:
+        for m, pattern in BROADCAST_ROUTES:
+            if m == method and pattern.match(path):
+                return list(range(len(self.shards))), "broadcast"
+        for pattern in ID_ROUTES:
+            match = pattern.match(path)
+            if match:
+                return [self.by_id(int(match.group(1)))], "id"
+        if path in SIDO_QUERY_ROUTES:
+            sido = parse_qs(query.decode("utf-8", "replace")).get("sido", [None])[0]
+            return self.for_sido(sido)
+        return [0], "home"
+
+    # ------------------------------------------------------------
+    # ASGI
+    # ------------------------------------------------------------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            await send({"type": "websocket.close", "code": 1000})
+            return
+
+        method, path = scope["method"], scope["path"]
+        if path.startswith("/internal/"):
+            await _text(send, 404, "Not Found")
+            return
+        if path == "/router/metrics":
+            if not self.metrics_token:
+                await _text(send, 404, "Not Found")
+            elif not scrape_authorized(_header(scope, b"authorization"), self.metrics_token):
+                await _text(send, 403, "Forbidden")
+            else:
+                await _text(send, 200, REGISTRY.render(), METRICS_CONTENT_TYPE)
+            return
+
+        if (method, path) == IMPORT_ROUTE:
+            await self._import(scope, receive, send)
+            return
+        if (method, path) == EXPORT_ROUTE:
+            await self._export(scope, receive, send)
+            return
+
+        body: Optional[bytes] = None
+        if (method, path) in SIDO_FORM_ROUTES:
+            body = await _read_body(receive, MAX_FORM_BYTES)
+            if body is None:
+                await _text(send, 413, "요청 본문이 너무 큽니다.")
+                return
+            targets, by = self.for_sido(await _form_sido(scope, body))
+        else:
+            targets, by = self.route(method, path, scope.get("query_string", b""))
+
+        for i in targets:
+            SHARD_ROUTED.inc(str(i), by)
+
+        if len(targets) > 1:
+            if body is None:
+                body = await _read_body(receive, MAX_FORM_BYTES)
+                if body is None:
+                    await _text(send, 413, "요청 본문이 너무 큽니다.")
+                    return
+            await self._broadcast(scope, body, targets, send)
+            return
+        await self._proxy(scope, receive, send, targets[0], body)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _request(
+        self, scope, shard: int, content, content_type: Optional[str] = None, extra: tuple = ()
+    ) -> httpx.Request:
+        # content_type : 본문을 새로 만들었을 때 (원래 content-type / content-length 대신)
+        raw_path = scope.get("raw_path") or quote(scope["path"]).encode()
+        url = self.shards[shard][1] + raw_path.decode("latin-1")
+        query = scope.get("query_string", b"")
+        if query:
+            url += "?" + query.decode("latin-1")
+
+        headers = [(k, v) for k, v in scope["headers"] if k not in HOP_HEADERS]
+        if content_type is not None:
+            headers = [(k, v) for k, v in headers if k not in (b"content-type", b"content-length")]
+            headers.append((b"content-type", content_type.encode("latin-1")))
+        headers.extend(extra)
+        client = scope.get("client")
+        forwarded = [v.decode("latin-1") for k, v in scope["headers"] if k == b"x-forwarded-for"]
+        if client:
+            forwarded.append(client[0])
+        if forwarded:
+            headers = [(k, v) for k, v in headers if k != b"x-forwarded-for"]
+            headers.append((b"x-forwarded-for", ", ".join(forwarded).encode("latin-1")))
+        for k, v in scope["headers"]:
+            if k == b"host":
+                headers.append((b"x-forwarded-host", v))
+        headers.append((b"x-forwarded-proto", scope.get("scheme", "http").encode()))
+        return self.client.build_request(scope["method"], url, headers=headers, content=content)
+
+    async def _proxy(self, scope, receive, send, shard: int, body: Optional[bytes]):
+        if body is None:
+            content = _stream_body(receive) if _has_body(scope) else None
+        else:
+            content = body
+        try:
+            response = await self.client.send(self._request(scope, shard, content), stream=True)
+        except httpx.HTTPError as e:
+            logger.warning("샤드 %d 요청 실패: %s", shard, e)
+            await _text(send, 502, "지역 서버에 연결할 수 없습니다. 잠시 후 다시 시도해 주세요.")
+            return
+
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": _response_headers(response),
+            })
+            # 응답을 흘려보내는 동안 클라이언트가 끊으면 (SSE 창 닫기 등) 샤드 쪽 스트림도 닫음
+            pump = asyncio.create_task(_pump(response, send))
+            gone = asyncio.create_task(_wait_disconnect(receive))
+            done, _ = await asyncio.wait({pump, gone}, return_when=asyncio.FIRST_COMPLETED)
+            if pump not in done:
+                pump.cancel()
+            gone.cancel()
+            await asyncio.gather(pump, gone, return_exceptions=True)
+            if pump in done and pump.exception() is not None:
+                logger.warning("샤드 %d 응답 전달 중단: %s", shard, pump.exception())
+        finally:
+            await response.aclose()
+
+    async def _broadcast(self, scope, body: bytes, targets: list[int], send):
+        # 모든 샤드에 같은 요청 → 실패한 샤드가 있으면 그 응답, 아니면 home 의 응답
+        async def one(i):
+            return await self.client.send(self._request(scope, i, body))
+
+        results = await asyncio.gather(*(one(i) for i in targets), return_exceptions=True)
+        chosen = None
+        for i, r in zip(targets, results):
+            if isinstance(r, Exception):
+                logger.warning("샤드 %d 요청 실패: %s", i, r)
+                await _text(send, 502, "일부 지역 서버에 연결할 수 없습니다. 잠시 후 다시 시도해 주세요.")
+                return
+            if chosen is None or (r.status_code >= 400 > chosen.status_code):
+                chosen = r
+        await send({
+            "type": "http.response.start",
+            "status": chosen.status_code,
+            "headers": _response_headers(chosen),
+        })
+        await send({"type": "http.response.body", "body": chosen.content})
+
+
+    # ------------------------------------------------------------
+    # 대량 등록 — 행을 sido 샤드별로 나눠 보내고 결과를 합침
+    # ------------------------------------------------------------
+    async def _import(self, scope, receive, send):
+        body = await _read_body(receive, MAX_IMPORT_BYTES)
+        if body is None:
+            await _text(send, 413, "요청 본문이 너무 큽니다.")
+            return
+
+        async def replay():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        try:
+            form = await Request(scope, replay).form()
+        except Exception:
+            form = None
+        upload = form.get("file") if form is not None else None
+        try:
+            fmt = bulk_io.detect_format(getattr(upload, "filename", None), form.get("format") if form else None)
+        except ValueError:
+            fmt = None
+        if upload is None or isinstance(upload, str) or fmt is None:
+            # 잘못된 요청 — home 이 검증 오류로 답함
+            if form is not None:
+                await form.close()
+            SHARD_ROUTED.inc("0", "home")
+            await self._proxy(scope, receive, send, 0, body)
+            return
+
+        try:
+            parts, line_map, rows, errors = await asyncio.to_thread(self._split_rows, upload.file, fmt)
+            dry_run = form.get("dry_run")
+        finally:
+            await form.close()
+
+        def one(i: int):
+            request = httpx.Request(
+                "POST", "http://shard",
+                data={"format": "jsonl", **({"dry_run": dry_run} if isinstance(dry_run, str) else {})},
+                files={"file": ("import.jsonl", b"".join(parts[i]), "application/x-ndjson")},
+            )
+            content = request.read()
+            return self.client.send(
+                self._request(scope, i, content, content_type=request.headers["content-type"])
+            )
+
+        targets = sorted(parts)
+        for i in targets:
+            SHARD_ROUTED.inc(str(i), "split")
+        results = await asyncio.gather(*(one(i) for i in targets), return_exceptions=True)
+
+        merged = {
+            "format": fmt,
+            "dry_run": None,
+            "rows": rows,
+            "imported": 0,
+            "error_count": len(errors),
+            "errors": list(errors),
+            "elapsed_ms": 0.0,
+            "shards": [],
+        }
+        failed = False
+        for i, r in zip(targets, results):
+            entry = {"shard": i, "rows": len(line_map[i])}
+            try:
+                if isinstance(r, Exception):
+                    raise r
+                doc = r.json()
+                if r.status_code >= 400:
+                    raise ValueError(doc.get("detail") or r.status_code)
+            except (httpx.HTTPError, ValueError, AttributeError) as e:
+                logger.warning("샤드 %d 대량 등록 실패: %s", i, e)
+                failed = True
+                entry["error"] = str(e)
+                merged["shards"].append(entry)
+                continue
+            entry["imported"] = doc["imported"]
+            merged["shards"].append(entry)
+            merged["dry_run"] = doc["dry_run"]
+            merged["imported"] += doc["imported"]
+            merged["error_count"] += doc["error_count"]
+            merged["elapsed_ms"] = max(merged["elapsed_ms"], doc["elapsed_ms"])
+            # 샤드가 받은 JSONL 의 줄 번호 → 원래 파일의 줄 번호
+            for e in doc["errors"]:
+                merged["errors"].append({**e, "line": line_map[i][e["line"] - 1]})
+        merged["errors"] = sorted(merged["errors"], key=lambda e: e["line"])[:IMPORT_MAX_ERRORS]
+        if merged["dry_run"] is None:      # 보낸 샤드가 없음 (빈 파일 / 전부 router 오류)
+            merged["dry_run"] = isinstance(dry_run, str) and dry_run.strip().lower() in bulk_io.TRUE_WORDS
+
+        await _text(
+            send, 502 if failed else 200,
+            json.dumps(merged, ensure_ascii=False), "application/json",
+        )
+
+    def _split_rows(self, raw, fmt: str):
+        # → (샤드별 JSONL 줄 목록, 샤드별 원래 줄 번호, 전체 행 수, router 에서 난 오류)
+        #   sido 가 없거나 모르는 값이면 home 으로 (home 이 검증 오류로 셈)
+        parts: dict[int, list[bytes]] = {}
+        line_map: dict[int, list[int]] = {}
+        rows = 0
+        errors = []
+        for line_no, row, error in bulk_io.iter_rows(raw, fmt):
+            rows += 1
+            if error is not None:
+                errors.append({"line": line_no, "error": error})
+                continue
+            row = {k: v for k, v in row.items() if k is not None}     # CSV 의 남는 칸
+            sido = row.get("sido")
+            shard = self.by_sido.get(sido.strip() if isinstance(sido, str) else None, 0)
+            parts.setdefault(shard, []).append(
+                json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            )
+            line_map.setdefault(shard, []).append(line_no)
+        return parts, line_map, rows, errors
+
+    # ------------------------------------------------------------
+    # 내보내기 — sido 가 없으면 모든 샤드에서 자기 것만 받아 이어붙임
+    # ------------------------------------------------------------
+    async def _export(self, scope, receive, send):
+        params = parse_qs(scope.get("query_string", b"").decode("utf-8", "replace"))
+        sido = params.get("sido", [None])[0]
+        if sido:
+            targets, by = self.for_sido(sido)
+            SHARD_ROUTED.inc(str(targets[0]), by)
+            await self._proxy(scope, receive, send, targets[0], None)
+            return
+
+        targets = list(range(len(self.shards)))
+        for i in targets:
+            SHARD_ROUTED.inc(str(i), "gather")
+        local = ((LOCAL_HEADER.encode(), b"1"),)
+        results = await asyncio.gather(
+            *(self.client.send(self._request(scope, i, None, extra=local), stream=True) for i in targets),
+            return_exceptions=True,
+        )
+        try:
+            # 전부 응답 헤더까지 받은 뒤에만 시작 — 일부 샤드만 담긴 파일을 내려주지 않게
+            for i, r in zip(targets, results):
+                if isinstance(r, Exception):
+                    logger.warning("샤드 %d 내보내기 실패: %s", i, r)
+                    await _text(send, 502, "일부 지역 서버에 연결할 수 없습니다. 잠시 후 다시 시도해 주세요.")
+                    return
+                if r.status_code != 200:
+                    await r.aread()
+                    await send({
+                        "type": "http.response.start",
+                        "status": r.status_code,
+                        "headers": _response_headers(r),
+                    })
+                    await send({"type": "http.response.body", "body": r.content})
+                    return
+
+            first = results[0]
+            csv = first.headers.get("content-type", "").startswith("text/csv")
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (k, v) for k, v in _response_headers(first)
+                    if k not in (b"content-length", b"content-encoding")
+                ],
+            })
+            for n, r in enumerate(results):
+                skip_header = csv and n > 0      # BOM + 헤더 줄은 첫 샤드 것만
+                async for chunk in r.aiter_bytes():
+                    if skip_header:
+                        cut = chunk.find(b"\n")
+                        if cut < 0:
+                            continue
+                        chunk, skip_header = chunk[cut + 1:], False
+                    if chunk:
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            for r in results:
+                if not isinstance(r, Exception):
+                    await r.aclose()
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _has_body(scope) -> bool:
+    for k, v in scope["headers"]:
+        if k == b"transfer-encoding" or (k == b"content-length" and v != b"0"):
+            return True
+    return False
+
+
+def _response_headers(response: httpx.Response) -> list[tuple[bytes, bytes]]:
+    return [(k.lower(), v) for k, v in response.headers.raw if k.lower() not in HOP_HEADERS]
+
+
+async def _stream_body(receive):
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        chunk = message.get("body", b"")
+        if chunk:
+            yield chunk
+        if not message.get("more_body", False):
+            return
+
+
+async def _read_body(receive, limit: int) -> Optional[bytes]:
+    chunks, size = [], 0
+    async for chunk in _stream_body(receive):
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def _form_sido(scope, body: bytes) -> Optional[str]:
+    async def replay():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    try:
+        form = await Request(scope, replay).form()
+    except Exception:
+        return None     # 잘못된 폼 → home 이 검증 오류로 답함
+    try:
+        sido = form.get("sido")
+        return sido if isinstance(sido, str) else None
+    finally:
+        await form.close()
+
+
+async def _pump(response: httpx.Response, send):
+    async for chunk in response.aiter_raw():
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _wait_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _text(send, status: int, text: str, media_type: str = "text/plain; charset=utf-8"):
+    body = text.encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", media_type.encode()), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+app = ShardRouter.from_env()
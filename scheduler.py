@@ -0,0 +1,122 @@
+# scheduler.py
+# ------------------------------------------------------------
+# 프로세스 안 주기 작업 (asyncio)
+#
+#   - 작업 1개 = asyncio task 하나 : interval 마다 깨어나서 작업 함수를 스레드에서 실행
+#       (asyncio.to_thread — 이벤트 루프/요청 처리를 막지 않음)
+#   - 같은 작업은 겹쳐 돌지 않음 (이전 실행이 끝나야 다음 대기 시작)
+#   - run_now(name) : 관리자 화면의 "지금 실행" — 대기 중인 task 를 바로 깨움
+#   - 작업 함수는 dict 를 돌려주면 마지막 결과로 보관 (/admin/jobs 에 표시)
+#   - 실패는 로그 + 상태에 기록하고 다음 주기에 다시
+#   - 종료 시 stopping 이 켜짐 — 오래 걸리는 작업 함수는 중간중간 확인하고 멈춤
+# ------------------------------------------------------------
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from metrics import JOB_DURATION, JOB_RUNS
+
+logger = logging.getLogger("dongnelink.scheduler")
+
+
+class Job:
+    def __init__(self, name: str, fn: Callable[[], Optional[dict]], interval_s: float, initial_delay_s: float):
+        self.name = name
+        self.fn = fn
+        self.interval = interval_s
+        self.initial_delay = initial_delay_s
+        self.runs = 0
+        self.failures = 0
+        self.running = False
+        self.last_started: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_result: Optional[dict] = None
+        self.last_error: Optional[str] = None
+        self.next_run: Optional[float] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "interval_s": self.interval,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_started": self.last_started,
+            "last_duration_ms": None if self.last_duration is None else round(self.last_duration * 1000, 1),
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+            "next_run": self.next_run,
+        }
+
+
+class Scheduler:
+    def __init__(self):
+        self.jobs: dict[str, Job] = {}
+        self.stopping = threading.Event()
+
+    def add(self, name: str, fn: Callable[[], Optional[dict]], interval_s: float, initial_delay_s: float = 60.0):
+        self.jobs[name] = Job(name, fn, interval_s, initial_delay_s)
+
+    def start(self):
+        self.stopping.clear()
+        for job in self.jobs.values():
+            if job.interval > 0:
+                job._wake = asyncio.Event()
+                job._task = asyncio.create_task(self._loop(job), name=f"job:{job.name}")
+
+    async def close(self):
+        self.stopping.set()
+        tasks = [job._task for job in self.jobs.values() if job._task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job._task = None
+
+    def run_now(self, name: str) -> bool:
+        job = self.jobs[name]
+        if job._wake is None:
+            return False
+        job._wake.set()
+        return True
+
+    def status(self) -> list[dict]:
+        return [job.status() for job in self.jobs.values()]
+
+    async def _loop(self, job: Job):
+        delay = job.initial_delay
+        while True:
+            job.next_run = time.time() + delay
+            try:
+                await asyncio.wait_for(job._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            job._wake.clear()
+            job.next_run = None
+            await self._run(job)
+            delay = job.interval
+
+    async def _run(self, job: Job):
+        job.running = True
+        job.last_started = time.time()
+        t0 = time.perf_counter()
+        try:
+            result = await asyncio.to_thread(job.fn)
+        except Exception as e:
+            job.failures += 1
+            job.last_error = f"{type(e).__name__}: {e}"
+            JOB_RUNS.inc(job.name, "error")
+            logger.exception("작업 실패: %s", job.name)
+        else:
+            job.last_result = result
+            job.last_error = None
+            JOB_RUNS.inc(job.name, "ok")
+        finally:
+            job.running = False
+            job.runs += 1
+            job.last_duration = time.perf_counter() - t0
+            JOB_DURATION.observe(job.last_duration, job.name)
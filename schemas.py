@@ -0,0 +1,137 @@
+# schemas.py
+# ------------------------------------------------------------
+# /api/v1 응답 형태 (모바일 앱용 JSON)
+#
+#   - 인메모리 저장소의 dict 를 그대로 직렬화 — 검증/모델 객체 생성 없이
+#     TypedDict 스키마로 TypeAdapter 를 import 시점에 한 번 만들어 둠
+#     (직렬화는 pydantic-core 가 처리, 스키마에 없는 내부 필드는 빠짐)
+#   - fields= 로 고른 필드만 (include) — 고를 수 있는 이름은 *_FIELDS
+# ------------------------------------------------------------
+from typing import Iterable, Optional
+
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+
+class MenuOut(TypedDict, total=False):
+    name: str
+    price: str
+
+
+class ServiceOut(TypedDict, total=False):
+    name: str
+    desc: str
+    price: str
+
+
+class ReviewSummaryOut(TypedDict):
+    count: int
+    rating_avg: Optional[float]
+
+
+class BusinessOut(TypedDict, total=False):
+    id: int
+    kind: str
+    sido: str
+    sigungu: str
+    dong: str
+    category: str
+    name: str
+    description: Optional[str]
+    image_url: Optional[str]
+    phone: Optional[str]
+    homepage: Optional[str]
+    blog: Optional[str]
+    instagram: Optional[str]
+    address_road: Optional[str]
+    address_detail: Optional[str]
+    lat: Optional[str]
+    lng: Optional[str]
+    hours_mon: Optional[str]
+    hours_tue: Optional[str]
+    hours_wed: Optional[str]
+    hours_thu: Optional[str]
+    hours_fri: Optional[str]
+    hours_sat: Optional[str]
+    hours_sun: Optional[str]
+    off_day: Optional[str]
+    opt_delivery: bool
+    opt_reservation: bool
+    opt_parking: bool
+    opt_pet: bool
+    opt_wifi: bool
+    opt_group: bool
+    menus: list[MenuOut]
+    services: list[ServiceOut]
+    price_min: Optional[int]
+    price_max: Optional[int]
+    premium: bool
+    created_at: float
+    reviews: ReviewSummaryOut
+
+
+class ReviewOut(TypedDict, total=False):
+    business_id: int
+    username: str
+    rating: int
+    comment: str
+
+
+class PostOut(TypedDict, total=False):
+    id: int
+    title: str
+    content: str
+    user: str
+    sido: str
+    sigungu: str
+    dong: str
+    image_url: Optional[str]
+
+
+class BusinessPage(TypedDict):
+    items: list[BusinessOut]
+    count: int
+    offset: int
+
+
+class ReviewPage(TypedDict):
+    items: list[ReviewOut]
+    count: int
+    offset: int
+    total: int
+
+
+class PostPage(TypedDict):
+    items: list[PostOut]
+    count: int
+    offset: int
+    total: int
+
+
+BUSINESS_FIELDS = frozenset(BusinessOut.__annotations__)
+POST_FIELDS = frozenset(PostOut.__annotations__)
+
+BUSINESS = TypeAdapter(BusinessOut)
+BUSINESS_PAGE = TypeAdapter(BusinessPage)
+REVIEW_PAGE = TypeAdapter(ReviewPage)
+POST = TypeAdapter(PostOut)
+POST_PAGE = TypeAdapter(PostPage)
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[set[str]]:
+    # "name,phone,menus" → {"id", "name", "phone", "menus"} / 없으면 None (전체)
+    # 모르는 이름이면 ValueError
+    if not fields:
+        return None
+    chosen = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = chosen.difference(allowed)
+    if unknown:
+        raise ValueError(", ".join(sorted(unknown)))
+    chosen.add("id")
+    return chosen
+
+
+def page_include(chosen: Optional[set[str]]) -> Optional[dict]:
+    if chosen is None:
+        return None
+    return {"items": {"__all__": chosen}, "count": True, "offset": True, "total": True}
@@ -0,0 +1,141 @@
+# shards.py
+# ------------------------------------------------------------
+# 시/도 단위 샤딩 — 설정 / 업소·글 id 줄무늬 / 다른 샤드에서 모아오기
+#
+#   worker 프로세스(샤드) 하나가 일부 시/도의 업소·글·인덱스만 가짐
+#   (journal / bus / 인덱스 모두 샤드마다 따로 → 메모리·CPU 를 샤드 수만큼 나눔)
+#   앞단의 router.py 가 sido 파라미터 / id 로 요청을 나눠 보냄
+#
+#   샤드 설정 (환경 변수)
+#     DONGNE_SHARD       : "번호/개수" (예: "0/3") — 없으면 샤딩 안 함
+#     DONGNE_SHARD_SIDO  : 이 샤드가 맡는 시/도 (쉼표 구분)
+#     DONGNE_SHARD_PEERS : 다른 샤드 주소 (쉼표 구분) — 전체 화면(/admin 등)을
+#                          맡는 샤드(router 의 첫 샤드)에만 주면 됨
+#     DONGNE_SHARD_TOKEN : 샤드끼리 /internal/shard/* 호출할 때 쓰는 공유 토큰
+#
+#   LOCAL_HEADER : router 가 모든 샤드에서 모아올 때 (내보내기) 붙임 → 샤드는 PEERS 로 다시 모으지 않고 자기 것만
+#
+#   id 줄무늬 : 샤드 i (개수 n) 가 발급하는 id 는 모두 id % n == i
+#     → id 만 보고 어느 샤드 것인지 앎 (/business/{bid} 라우팅, 조회수 DB 키 충돌 없음)
+#     bus 의 번호 발급기는 "slot" (id // n) 을 세고 id = slot * n + i
+# ------------------------------------------------------------
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import httpx
+
+from metrics import SHARD_GATHER, SHARD_GATHER_ERRORS
+
+logger = logging.getLogger("dongnelink.shards")
+
+TOKEN_HEADER = "x-dongne-shard-token"
+LOCAL_HEADER = "x-dongne-shard-local"
+INTERNAL_PREFIX = "/internal/shard"
+
+
+class ShardUnavailable(Exception):
+    pass
+
+
+def parse_list(value: Optional[str]) -> list[str]:
+    return [s.strip() for s in (value or "").split(",") if s.strip()]
+
+
+def shard_of(id_: int, count: int) -> int:
+    return id_ % count
+
+
+class ShardConfig:
+    def __init__(
+        self,
+        index: int = 0,
+        count: int = 1,
+        sido: tuple[str, ...] = (),
+        peers: tuple[str, ...] = (),
+        token: Optional[str] = None,
+    ):
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"잘못된 샤드 번호: {index}/{count}")
+        self.index = index
+        self.count = count
+        self.sido = frozenset(sido)
+        self.peers = [p.rstrip("/") for p in peers]
+        self.token = token or None
+
+    @classmethod
+    def from_env(cls) -> "ShardConfig":
+        spec = os.getenv("DONGNE_SHARD", "").strip()
+        index, count = 0, 1
+        if spec:
+            left, _, right = spec.partition("/")
+            index, count = int(left), int(right)
+        return cls(
+            index, count,
+            tuple(parse_list(os.getenv("DONGNE_SHARD_SIDO"))),
+            tuple(parse_list(os.getenv("DONGNE_SHARD_PEERS"))),
+            os.getenv("DONGNE_SHARD_TOKEN"),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.count > 1 or bool(self.sido)
+
+    def owns(self, sido: str) -> bool:
+        return not self.sido or sido in self.sido
+
+    def owns_id(self, id_: int) -> bool:
+        return shard_of(id_, self.count) == self.index
+
+    # floor 이상인 이 샤드의 첫 slot
+    def slot_floor(self, floor: int) -> int:
+        return max(0, -(-(floor - self.index) // self.count))
+
+    def id_for_slot(self, slot: int) -> int:
+        return slot * self.count + self.index
+
+    def describe(self) -> dict:
+        return {"index": self.index, "count": self.count, "sido": sorted(self.sido)}
+
+
+class Peers:
+    # 다른 샤드의 /internal/shard/* 를 동시에 호출 (요청 처리 스레드에서 — 동기)
+    #   하나라도 실패하면 ShardUnavailable (일부만 모은 전체 화면은 보여주지 않음)
+    def __init__(self, urls: list[str], token: Optional[str], timeout_s: float = 5.0):
+        self.urls = urls
+        self.headers = {TOKEN_HEADER: token} if token else {}
+        self.timeout_s = timeout_s
+        self._client: Optional[httpx.Client] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _fetch(self, url: str, path: str, params: dict):
+        try:
+            r = self._client.get(url + INTERNAL_PREFIX + path, params=params)
+            r.raise_for_status()
+            return r.json()
+        except (httpx.HTTPError, ValueError) as e:
+            SHARD_GATHER_ERRORS.inc(url)
+            raise ShardUnavailable(f"{url}: {e}") from e
+
+    def gather(self, path: str, params: Optional[dict] = None) -> list:
+        if not self.urls:
+            return []
+        if self._client is None:
+            self._client = httpx.Client(timeout=self.timeout_s, headers=self.headers)
+            self._pool = ThreadPoolExecutor(max_workers=len(self.urls), thread_name_prefix="shard-gather")
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        t0 = time.perf_counter()
+        try:
+            futures = [self._pool.submit(self._fetch, url, path, params) for url in self.urls]
+            return [f.result() for f in futures]
+        finally:
+            SHARD_GATHER.observe(time.perf_counter() - t0, path)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        if self._client is not None:
+            self._client.close()
+        self._client = self._pool = None
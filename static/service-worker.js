@@ -1,37 +1,73 @@
 /* ============================================================
-   동네링크 — 즉시 업데이트 PWA Service Worker (FINAL)
-   - 최신 파일 즉시 적용 (skipWaiting + clients.claim)
-   - 필수 파일 최소 캐싱
-   - online-first 방식 (fetch → 실패하면 cache)
+   동네링크 — PWA Service Worker
+   - 경로별 캐시 전략
+       · /static/dist/ 해시 이름 : cache-first (name.<hash>.ext → 내용 불변)
+         (manifest.json 등 이름이 그대로인 파일은 SW 가 관여하지 않음)
+       · /api/locations/*      : stale-while-revalidate
+       · /food /repair /lifestyle 목록 : stale-while-revalidate
+       · 로그인/폼/관리자/POST    : network-only (캐시 안 함)
+       · 그 외 페이지            : network-first → 오프라인이면 캐시
+   - 사용자별 화면은 캐시하지 않음
+       · 로그인 상태의 HTML 은 서버가 Cache-Control: private, no-store → 캐시 X
+       · /auth/* 요청(로그인/카카오/로그아웃)이 지나가면 런타임 캐시를 비움
+         → 캐시에는 비로그인 화면만 남고, 로그인 직후 이전 화면이 보이지 않음
+   - 서버가 만든 /precache-manifest.json 으로 설치 시 미리 캐싱
+   - 런타임 캐시는 개수 제한 (오래된 항목부터 삭제)
    ============================================================ */
 
-const CACHE_NAME = "dongnelink-v1";   // ⭐ 버전 바꾸면 즉시 업데이트됨 (v2, v3 ...)
+// 등록 URL 의 ?v= (정적 파일 빌드 버전) — 바뀌면 SW 가 새로 설치됨
+const VERSION = new URL(self.location).searchParams.get("v") || "dev";
 
-// ⭐ 실제 존재하는 파일만 캐싱함 (오류 방지)
-const urlsToCache = [
-  "/",                
-  "/manifest.json",
-  "/static/style.css",
+const PRECACHE = `dongnelink-precache-${VERSION}`;
+const STATIC_CACHE = "dongnelink-static";
+const RUNTIME_CACHE = "dongnelink-runtime-v2";  // v2: 로그인 화면이 캐시돼 있던 이전 캐시 폐기
+
+const CACHE_LIMITS = {
+  [STATIC_CACHE]: 120,
+  [RUNTIME_CACHE]: 60,
+};
+
+const PRECACHE_MANIFEST_URL = "/precache-manifest.json";
+
+// 캐시하면 안 되는 경로 (로그인 상태 / 폼 / 관리자)
+const NETWORK_ONLY_PREFIXES = [
+  "/auth/",
+  "/admin",
+  "/my/",
+  "/business/register",
+  "/lifestyle/new",
+  "/lifestyle/stream",
+  "/metrics",
 ];
 
+const SWR_PATHS = ["/food", "/repair", "/lifestyle"];
+
+// build_assets.py 의 해시 이름 (assets.HASHED_NAME_RE 와 같음)
+const HASHED_NAME = /\.[0-9a-f]{10}\.[^./]+$/;
+
 /* -----------------------------
-   INSTALL — 새로운 SW 즉시 적용
+   INSTALL — precache manifest 캐싱
 ------------------------------ */
 self.addEventListener("install", event => {
   self.skipWaiting();  // 새 버전 즉시 적용
   event.waitUntil(
-    caches.open(CACHE_NAME).then(cache => cache.addAll(urlsToCache))
+    fetch(PRECACHE_MANIFEST_URL, { cache: "no-store" })
+      .then(res => res.json())
+      .then(manifest =>
+        caches.open(PRECACHE).then(cache => cache.addAll(manifest.urls))
+      )
   );
 });
 
 /* -----------------------------
-   ACTIVATE — 오래된 캐시 삭제
+   ACTIVATE — 이전 버전 precache 삭제
 ------------------------------ */
 self.addEventListener("activate", event => {
+  const keep = [PRECACHE, STATIC_CACHE, RUNTIME_CACHE];
   event.waitUntil(
     caches.keys().then(keys =>
       Promise.all(
-        keys.filter(key => key !== CACHE_NAME)
+        keys.filter(key => !keep.includes(key))
             .map(key => caches.delete(key))
       )
     )
@@ -40,21 +76,111 @@ self.addEventListener("activate", event => {
 });
 
 /* -----------------------------
-   FETCH — 최신 서버 파일 우선
+   캐시 헬퍼
+------------------------------ */
+function isNoStore(response) {
+  return /no-store/i.test(response.headers.get("Cache-Control") || "");
+}
+
+function isCacheable(response) {
+  return response && response.ok && response.type === "basic" && !isNoStore(response);
+}
+
+// 오래 전에 넣은 항목부터 삭제 (cache.keys() 는 삽입 순서)
+async function trimCache(name) {
+  const limit = CACHE_LIMITS[name];
+  if (!limit) return;
+  const cache = await caches.open(name);
+  const keys = await cache.keys();
+  for (let i = 0; i < keys.length - limit; i++) {
+    await cache.delete(keys[i]);
+  }
+}
+
+async function putInCache(name, request, response) {
+  const cache = await caches.open(name);
+  await cache.put(request, response);
+  await trimCache(name);
+}
+
+async function cacheFirst(event, name) {
+  const cached = await caches.match(event.request);
+  if (cached) return cached;
+
+  const response = await fetch(event.request);
+  if (isCacheable(response)) {
+    event.waitUntil(putInCache(name, event.request, response.clone()));
+  }
+  return response;
+}
+
+async function staleWhileRevalidate(event, name) {
+  const cached = await caches.match(event.request);
+
+  const network = fetch(event.request).then(response => {
+    if (isCacheable(response)) {
+      return putInCache(name, event.request, response.clone()).then(() => response);
+    }
+    if (response && isNoStore(response)) {
+      // 이제 사용자별 응답 → 이전에 캐시한 비로그인 화면도 버림
+      return caches.open(name).then(cache => cache.delete(event.request)).then(() => response);
+    }
+    return response;
+  });
+
+  if (cached) {
+    event.waitUntil(network.catch(() => {}));
+    return cached;
+  }
+  return network;
+}
+
+async function networkFirst(event, name) {
+  try {
+    const response = await fetch(event.request);
+    if (isCacheable(response)) {
+      event.waitUntil(putInCache(name, event.request, response.clone()));
+    }
+    return response;
+  } catch (err) {
+    const cached = await caches.match(event.request);
+    if (cached) return cached;
+    throw err;
+  }
+}
+
+/* -----------------------------
+   FETCH — 경로별 전략
 ------------------------------ */
 self.addEventListener("fetch", event => {
-  event.respondWith(
-    fetch(event.request)                 // 항상 최신 서버 먼저
-      .then(response => {
-        const clone = response.clone();
-        caches.open(CACHE_NAME).then(cache => {
-          cache.put(event.request, clone);  // 최신 버전 캐싱
-        });
-        return response;
-      })
-      .catch(() => {
-        // 오프라인일 때만 캐시 사용
-        return caches.match(event.request);
-      })
-  );
+  const request = event.request;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) return;
+
+  const path = url.pathname;
+
+  // 로그인 / 로그아웃 / 계정 전환 (POST 포함) → 페이지 캐시 비우기
+  if (path.startsWith("/auth/")) {
+    event.waitUntil(caches.delete(RUNTIME_CACHE));
+    return;
+  }
+
+  if (request.method !== "GET") return;  // POST 등은 SW 가 관여하지 않음
+
+  if (NETWORK_ONLY_PREFIXES.some(prefix => path.startsWith(prefix))) return;
+  if (path.endsWith("/edit")) return;
+
+  if (path.startsWith("/static/dist/")) {
+    if (HASHED_NAME.test(path)) event.respondWith(cacheFirst(event, STATIC_CACHE));
+    return;
+  }
+
+  if (path.startsWith("/api/locations/") || SWR_PATHS.includes(path)) {
+    event.respondWith(staleWhileRevalidate(event, RUNTIME_CACHE));
+    return;
+  }
+
+  if (request.mode === "navigate") {
+    event.respondWith(networkFirst(event, RUNTIME_CACHE));
+  }
 });